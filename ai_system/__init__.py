@@ -11,6 +11,17 @@ from .memory_logger import MemoryLogger
 from .memory_alert_manager import MemoryAlertManager, AlertConfig, AlertAction
 from .gc_monitor import GarbageCollectionMonitor, GCStats
 from .memory_manager import MemoryManager
+from .time_series import TimeSeriesBuffer
+from .memory_pressure_policy import MemoryPressurePolicy, DegradationAction
+from .metrics import MetricsRegistry, MetricsServer, get_registry
+from .frame_decoder import FrameDecoder
+from .model_registry import ModelRegistry, ModelVariant
+from .detection_batch import DetectionBatch
+from .shm_ring import SharedFrameRing
+from .grpc_options import ServerTransportOptions, resolve_server_options
+from .cpu_executor import CpuExecutor
+from .frame_pipeline import FramePipeline
+from .roi_tracker import RoiTracker, RoiWindow
 
 __all__ = [
     'ThreadPool',
@@ -30,5 +41,22 @@ __all__ = [
     'AlertAction',
     'GarbageCollectionMonitor',
     'GCStats',
-    'MemoryManager'
+    'MemoryManager',
+    'TimeSeriesBuffer',
+    'MemoryPressurePolicy',
+    'DegradationAction',
+    'MetricsRegistry',
+    'MetricsServer',
+    'get_registry',
+    'FrameDecoder',
+    'ModelRegistry',
+    'ModelVariant',
+    'DetectionBatch',
+    'SharedFrameRing',
+    'ServerTransportOptions',
+    'resolve_server_options',
+    'CpuExecutor',
+    'FramePipeline',
+    'RoiTracker',
+    'RoiWindow'
 ]
\ No newline at end of file
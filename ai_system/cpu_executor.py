@@ -0,0 +1,237 @@
+import itertools
+import logging
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Any, Dict, List, Optional, Sequence, Union
+
+
+def parse_cores(spec: Union[str, Sequence[int], None]) -> List[int]:
+    """
+    Parse a core list like "0-3,6" or [0, 1, 2].
+    
+    Args:
+        spec: Comma separated cores/ranges, a list of ints, or None/"" for none
+    
+    Returns:
+        Sorted list of core ids
+    """
+    if not spec:
+        return []
+    if isinstance(spec, str):
+        cores = set()
+        for part in spec.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            start, _, end = part.partition('-')
+            cores.update(range(int(start), int(end or start) + 1))
+        return sorted(cores)
+    return sorted({int(core) for core in spec})
+
+
+def available_cores() -> List[int]:
+    """Cores this process may run on (all cores where sched_getaffinity is unsupported)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def split_cores(executor_cores: Union[str, Sequence[int], None],
+                inference_cores: Union[str, Sequence[int], None]) -> List[int]:
+    """
+    Cores for the image executor.
+    
+    Args:
+        executor_cores: Explicit executor cores (empty = every available core not used for inference)
+        inference_cores: Cores reserved for ONNX Runtime intra-op threads
+    
+    Returns:
+        Executor cores (never empty: falls back to all available cores)
+    """
+    allowed = available_cores()
+    explicit = parse_cores(executor_cores)
+    if explicit:
+        cores = [core for core in explicit if core in allowed]
+    else:
+        reserved = set(parse_cores(inference_cores))
+        cores = [core for core in allowed if core not in reserved]
+    return cores or allowed
+
+
+class _Worker:
+    __slots__ = ('index', 'core', 'tasks', 'thread', 'executed', 'stolen')
+    
+    def __init__(self, index: int, core: Optional[int]):
+        self.index = index
+        self.core = core
+        self.tasks = deque()
+        self.thread: Optional[threading.Thread] = None
+        self.executed = 0
+        self.stolen = 0
+
+
+class CpuExecutor:
+    """
+    Executor khusus pekerjaan gambar (decode, preprocess) dengan worker per core.
+    
+    One worker thread per executor core, pinned to it with
+    os.sched_setaffinity so its caches stay warm and it does not migrate
+    onto the cores given to ONNX Runtime. Every worker has its own deque:
+    submit() from outside spreads tasks round robin (from inside a worker
+    it keeps them local), a worker takes its own tasks oldest first and
+    steals the newest task of another worker when it runs dry.
+    
+    A semaphore counts queued tasks, so an idle worker sleeps until there
+    is work and every wake-up finds a task somewhere.
+    """
+    
+    def __init__(self,
+                 cores: Sequence[int],
+                 pin: bool = True,
+                 name: str = "cpu"):
+        """
+        Args:
+            cores: Core ids, one worker per core
+            pin: Pin each worker to its core (Linux only)
+            name: Thread name prefix
+        """
+        if not cores:
+            raise ValueError("CpuExecutor needs at least one core")
+        
+        self._logger = logging.getLogger(__name__)
+        self._name = name
+        self._pin = pin and hasattr(os, 'sched_setaffinity')
+        self._workers = [_Worker(i, core) for i, core in enumerate(cores)]
+        self._available = threading.Semaphore(0)
+        self._round_robin = itertools.count()
+        self._local = threading.local()
+        # Guards _shutdown against submit(): no task is queued after the stop permits
+        self._lock = threading.Lock()
+        self._shutdown = False
+        
+        for worker in self._workers:
+            worker.thread = threading.Thread(
+                target=self._worker_loop, args=(worker,), name=f"{name}-core{worker.core}", daemon=True
+            )
+            worker.thread.start()
+        
+        self._logger.info(
+            f"CpuExecutor '{name}': {len(self._workers)} workers on cores {list(cores)}"
+            f"{' (pinned)' if self._pin else ''}"
+        )
+    
+    @property
+    def cores(self) -> List[int]:
+        return [worker.core for worker in self._workers]
+    
+    def _worker_loop(self, worker: _Worker) -> None:
+        self._local.worker = worker
+        if self._pin:
+            try:
+                # pid 0 = the calling thread on Linux
+                os.sched_setaffinity(0, {worker.core})
+            except OSError as e:
+                self._logger.warning(f"Could not pin {threading.current_thread().name} to core {worker.core}: {e}")
+        
+        others = [w for w in self._workers if w is not worker]
+        while True:
+            self._available.acquire()
+            if self._shutdown and not any(w.tasks for w in self._workers):
+                return
+            
+            # A task exists for every acquired permit; it may be in another worker's deque
+            task = None
+            while task is None:
+                try:
+                    task = worker.tasks.popleft()
+                except IndexError:
+                    for victim in random.sample(others, len(others)) if others else ():
+                        try:
+                            task = victim.tasks.pop()
+                            worker.stolen += 1
+                            break
+                        except IndexError:
+                            continue
+                    if task is None and self._shutdown and not any(w.tasks for w in self._workers):
+                        return
+            
+            future, fn, args, kwargs = task
+            worker.executed += 1
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Run fn(*args, **kwargs) on an executor core.
+        
+        Returns:
+            Future of the result
+        
+        Raises:
+            RuntimeError: Executor is shut down
+        """
+        future = Future()
+        worker = getattr(self._local, 'worker', None)
+        if worker is None:
+            worker = self._workers[next(self._round_robin) % len(self._workers)]
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("CpuExecutor is shutdown")
+            worker.tasks.append((future, fn, args, kwargs))
+            self._available.release()
+        return future
+    
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run fn on an executor core and wait for the result.
+        
+        Called from an executor worker it runs inline (waiting would
+        deadlock a worker on its own queue).
+        """
+        if getattr(self._local, 'worker', None) is not None:
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dictionary with per-worker core, queued, executed and stolen counts
+        """
+        workers = [
+            {'core': w.core, 'queued': len(w.tasks), 'executed': w.executed, 'stolen': w.stolen}
+            for w in self._workers
+        ]
+        return {
+            'name': self._name,
+            'pinned': self._pin,
+            'queued': sum(w['queued'] for w in workers),
+            'executed': sum(w['executed'] for w in workers),
+            'stolen': sum(w['stolen'] for w in workers),
+            'workers': workers
+        }
+    
+    def shutdown(self, wait: bool = True, timeout: float = 5.0) -> None:
+        """
+        Stop the workers after the queued tasks have run.
+        
+        Args:
+            wait: Join the worker threads
+            timeout: Max seconds to wait per worker
+        """
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            for _ in self._workers:
+                self._available.release()
+        if wait:
+            for worker in self._workers:
+                worker.thread.join(timeout=timeout)
+        self._logger.info(f"CpuExecutor '{self._name}' shut down")
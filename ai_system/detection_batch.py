@@ -0,0 +1,146 @@
+import numpy as np
+from typing import Dict, Any, List, Sequence, Tuple
+
+
+class DetectionBatch:
+    """
+    Hasil deteksi satu frame dalam bentuk kolom numpy (tanpa dict per deteksi).
+    
+    Boxes are normalized to the original frame (0-1) as
+    [x_min, y_min, x_max, y_max], after letterbox removal and the optional
+    clockwise rotation. Serializers read the columns directly; per-detection
+    Python objects are only built when a caller asks for them (to_dicts).
+    """
+    
+    __slots__ = ('boxes', 'confidences', 'class_ids', 'class_names')
+    
+    def __init__(self,
+                 boxes: np.ndarray,
+                 confidences: np.ndarray,
+                 class_ids: np.ndarray,
+                 class_names: Sequence[str] = ()):
+        """
+        Args:
+            boxes: (N, 4) float32 [x_min, y_min, x_max, y_max], normalized
+            confidences: (N,) float32
+            class_ids: (N,) int32 model class ids
+            class_names: Class name table of the model (indexed by class id)
+        """
+        self.boxes = boxes
+        self.confidences = confidences
+        self.class_ids = class_ids
+        self.class_names = class_names
+    
+    @classmethod
+    def empty(cls, class_names: Sequence[str] = ()) -> 'DetectionBatch':
+        return cls(
+            np.zeros((0, 4), dtype=np.float32),
+            np.zeros(0, dtype=np.float32),
+            np.zeros(0, dtype=np.int32),
+            class_names
+        )
+    
+    @classmethod
+    def from_xywh(cls,
+                  x: np.ndarray,
+                  y: np.ndarray,
+                  w: np.ndarray,
+                  h: np.ndarray,
+                  confidences: np.ndarray,
+                  class_ids: np.ndarray,
+                  class_names: Sequence[str] = ()) -> 'DetectionBatch':
+        """
+        Build a batch from normalized x/y/width/height columns.
+        
+        Returns:
+            DetectionBatch with corner boxes
+        """
+        boxes = np.empty((len(x), 4), dtype=np.float32)
+        boxes[:, 0] = x
+        boxes[:, 1] = y
+        boxes[:, 2] = x + w
+        boxes[:, 3] = y + h
+        return cls(
+            boxes,
+            confidences.astype(np.float32, copy=False),
+            class_ids.astype(np.int32, copy=False),
+            class_names
+        )
+    
+    def __len__(self) -> int:
+        return len(self.confidences)
+    
+    def _name(self, class_id: int) -> str:
+        return self.class_names[class_id] if 0 <= class_id < len(self.class_names) else str(class_id)
+    
+    def class_table(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Distinct classes of this batch.
+        
+        Returns:
+            Tuple (names of the distinct classes, (N,) int32 index of each detection into names)
+        """
+        unique_ids, index = np.unique(self.class_ids, return_inverse=True)
+        return [self._name(i) for i in unique_ids.tolist()], index.astype(np.int32, copy=False)
+    
+    def names(self) -> List[str]:
+        """Class name of every detection."""
+        table, index = self.class_table()
+        return [table[i] for i in index.tolist()]
+    
+    def first_per_class(self) -> List[int]:
+        """Index of the first detection of each distinct class (e.g. for throttled logging)."""
+        _, first = np.unique(self.class_ids, return_index=True)
+        return first.tolist()
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Per-detection dicts for JSON and older callers.
+        
+        Returns:
+            [{"class_name", "confidence", "bbox": {"x_min", "y_min", "width", "height"}}, ...]
+        """
+        return [
+            {
+                "class_name": name,
+                "confidence": confidence,
+                "bbox": {"x_min": x1, "y_min": y1, "width": x2 - x1, "height": y2 - y1}
+            }
+            for name, confidence, (x1, y1, x2, y2)
+            in zip(self.names(), self.confidences.tolist(), self.boxes.tolist())
+        ]
+    
+    def to_proto(self, ai_results: Any) -> None:
+        """
+        Append one Detection message per detection to an AIResults message.
+        
+        Args:
+            ai_results: AIResults protobuf message (filled in place)
+        """
+        if not len(self):
+            return
+        detections = ai_results.detections
+        for name, confidence, (x1, y1, x2, y2) in zip(self.names(), self.confidences.tolist(), self.boxes.tolist()):
+            detection = detections.add()
+            detection.class_name = name
+            detection.confidence = confidence
+            bbox = detection.bbox
+            bbox.x_min = x1
+            bbox.y_min = y1
+            bbox.x_max = x2
+            bbox.y_max = y2
+    
+    def to_columns(self, columns: Any) -> None:
+        """
+        Fill a DetectionColumns message (packed arrays).
+        
+        Args:
+            columns: DetectionColumns protobuf message (filled in place)
+        """
+        if not len(self):
+            return
+        table, index = self.class_table()
+        columns.boxes.extend(self.boxes.ravel().tolist())
+        columns.confidences.extend(self.confidences.tolist())
+        columns.class_index.extend(index.tolist())
+        columns.class_names.extend(table)
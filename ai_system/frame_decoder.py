@@ -0,0 +1,545 @@
+import logging
+import threading
+import time
+import numpy as np
+import cv2
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+from .config_manager import ConfigurationManager
+from .metrics import get_registry
+
+# TurboJPEG support (optional, falls back to OpenCV if not available)
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    TURBOJPEG_AVAILABLE = True
+    _turbojpeg_instance: Optional[TurboJPEG] = None
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+    _turbojpeg_instance = None
+
+# Decoder signature: (frame_data, width, height, channels) -> BGR frame
+Decoder = Callable[[bytes, int, int, int], np.ndarray]
+
+# Resolutions tried when a raw YUV420 payload arrives without dimensions
+COMMON_RESOLUTIONS = [
+    (640, 360), (1280, 720), (1920, 1080),
+    (320, 240), (800, 600), (1024, 768)
+]
+
+# Format names of 4:2:0 payloads that can be converted straight to model input
+YUV420_LAYOUTS = {'yuv420': 'i420', 'i420': 'i420', 'nv12': 'nv12', 'nv21': 'nv21'}
+
+# BT.601 limited-range YUV -> RGB (same coefficients as cv2.COLOR_YUV2RGB_*)
+_Y_SCALE = 1.164
+_V_TO_R = 1.596
+_U_TO_G = 0.391
+_V_TO_G = 0.813
+_U_TO_B = 2.018
+
+
+def yuv420_to_chw(frame_data: bytes,
+                  width: int,
+                  height: int,
+                  layout: str,
+                  target_size: Tuple[int, int],
+                  scale: float = 1.0 / 255.0,
+                  crop: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+    """
+    Convert a 4:2:0 frame directly to an RGB CHW float model input.
+    
+    The Y plane and the (quarter size) chroma planes are resized to
+    target_size separately and only then converted to RGB, so the colour
+    conversion runs at model resolution instead of camera resolution and no
+    full-size BGR frame is ever allocated.
+    
+    Args:
+        frame_data: Contiguous planes without row padding (width * height * 1.5 bytes)
+        width: Frame width (even)
+        height: Frame height (even)
+        layout: 'i420' (Y, U, V planes), 'nv12' (Y, interleaved UV) or 'nv21' (Y, interleaved VU)
+        target_size: Model input size (width, height)
+        scale: Factor applied to 0-255 values (1/255 to normalize, 1.0 to keep the range)
+        crop: Only convert this region (x0, y0, x1, y1), even pixel bounds (None = whole frame)
+    
+    Returns:
+        float32 array of shape (1, 3, target_height, target_width)
+    """
+    if width <= 0 or height <= 0 or width % 2 or height % 2:
+        raise ValueError(f"{layout.upper()} requires positive even dimensions, got {width}x{height}")
+    y_size = width * height
+    expected_size = y_size * 3 // 2
+    if len(frame_data) != expected_size:
+        raise ValueError(
+            f"{layout.upper()} size mismatch: expected {expected_size} bytes, got {len(frame_data)}"
+        )
+    
+    buffer = np.frombuffer(frame_data, dtype=np.uint8)
+    target_w, target_h = target_size
+    chroma_w, chroma_h = width // 2, height // 2
+    
+    
+    # Plane views of the crop region (no copy); chroma planes are half size
+    x0, y0, x1, y1 = crop if crop is not None else (0, 0, width, height)
+    if x0 % 2 or y0 % 2 or x1 % 2 or y1 % 2 or not (0 <= x0 < x1 <= width and 0 <= y0 < y1 <= height):
+        raise ValueError(f"Invalid {layout.upper()} crop {crop} for {width}x{height}")
+    luma_rows = slice(y0, y1), slice(x0, x1)
+    chroma_rows = slice(y0 // 2, y1 // 2), slice(x0 // 2, x1 // 2)
+    
+    y = cv2.resize(buffer[:y_size].reshape(height, width)[luma_rows], (target_w, target_h))
+    if layout == 'i420':
+        chroma_size = chroma_w * chroma_h
+        u_plane = buffer[y_size:y_size + chroma_size].reshape(chroma_h, chroma_w)[chroma_rows]
+        v_plane = buffer[y_size + chroma_size:].reshape(chroma_h, chroma_w)[chroma_rows]
+        u = cv2.resize(u_plane, (target_w, target_h))
+        v = cv2.resize(v_plane, (target_w, target_h))
+    elif layout in ('nv12', 'nv21'):
+        uv = cv2.resize(buffer[y_size:].reshape(chroma_h, chroma_w, 2)[chroma_rows], (target_w, target_h))
+        u, v = (uv[..., 0], uv[..., 1]) if layout == 'nv12' else (uv[..., 1], uv[..., 0])
+    else:
+        raise ValueError(f"Unknown YUV420 layout: {layout}")
+    
+    luma = y.astype(np.float32)
+    luma -= 16.0
+    luma *= _Y_SCALE * scale
+    u = u.astype(np.float32)
+    u -= 128.0
+    u *= scale
+    v = v.astype(np.float32)
+    v -= 128.0
+    v *= scale
+    
+    tensor = np.empty((1, 3, target_h, target_w), dtype=np.float32)
+    np.multiply(v, _V_TO_R, out=tensor[0, 0])
+    tensor[0, 0] += luma
+    np.multiply(u, -_U_TO_G, out=tensor[0, 1])
+    tensor[0, 1] -= _V_TO_G * v
+    tensor[0, 1] += luma
+    np.multiply(u, _U_TO_B, out=tensor[0, 2])
+    tensor[0, 2] += luma
+    np.clip(tensor, 0.0, 255.0 * scale, out=tensor)
+    return tensor
+
+
+def get_turbojpeg() -> Optional['TurboJPEG']:
+    """
+    Get or create TurboJPEG instance (singleton pattern).
+    Supports portable loading from local 'libs' directory.
+    """
+    global _turbojpeg_instance
+    if TURBOJPEG_AVAILABLE and _turbojpeg_instance is None:
+        try:
+            # 1. Try to find DLL in local 'libs' folder (Portable Mode)
+            # This allows copying the project to another machine without installing libjpeg-turbo
+            base_path = Path(__file__).parent.parent  # Serv_ScaI root
+            local_dll_paths = [
+                base_path / "tool" / "libjpeg-turbo64" / "bin" / "turbojpeg.dll",       # Windows
+                base_path / "tool" / "libjpeg-turbo64" / "lib" / "libturbojpeg.so",     # Linux (Portable)
+                base_path / "tool" / "libjpeg-turbo64" / "lib64" / "libturbojpeg.so",   # Linux (Portable 64-bit)
+                base_path / "tool" / "libjpeg-turbo64" / "lib" / "libturbojpeg.dylib",  # macOS
+            ]
+            
+            dll_path = None
+            for path in local_dll_paths:
+                if path.exists():
+                    dll_path = str(path)
+                    logging.info(f"Checking local TurboJPEG: Found at {dll_path}")
+                    break
+            
+            if dll_path:
+                # Portable mode: Load specific DLL
+                logging.info(f"Initializing TurboJPEG in PORTABLE mode from: {dll_path}")
+                _turbojpeg_instance = TurboJPEG(lib_path=dll_path)
+            else:
+                # System mode: Let PyTurboJPEG find it automatically
+                logging.info("Initializing TurboJPEG in SYSTEM mode (global install)")
+                _turbojpeg_instance = TurboJPEG()
+        
+        except Exception as e:
+            logging.warning(f"Failed to initialize TurboJPEG: {e}")
+            logging.warning("System will fallback to OpenCV for decoding.")
+    
+    return _turbojpeg_instance
+
+
+class FrameDecoder:
+    """
+    Decoder frame dengan content sniffing dan dispatch table.
+    
+    The decoder is chosen in O(1): from the request's ``format`` field when
+    it names a registered decoder, otherwise from the payload's magic bytes
+    (JPEG SOI, PNG signature, RIFF/WEBP), otherwise from the payload size
+    (YUV420 or raw pixels for the given dimensions). No decoder is tried
+    speculatively, so non-JPEG payloads never pay for failed decodes.
+    
+    Decoders are pluggable via register_decoder() and each one keeps its
+    own call count, error count and timing statistics.
+    """
+    
+    def __init__(self, config_manager: ConfigurationManager):
+        """
+        Initialize FrameDecoder.
+        
+        Args:
+            config_manager: ConfigurationManager instance
+        """
+        self._logger = logging.getLogger(__name__)
+        self._config_manager = config_manager
+        
+        self._use_turbojpeg = config_manager.get('decoder.use_turbojpeg', True)
+        self._fallback_to_opencv = config_manager.get('decoder.fallback_to_opencv', True)
+        self._yuv_direct = config_manager.get('decoder.yuv_direct_to_model', True)
+        self._decode_scale = 1  # JPEG decode downscale denominator (1, 2, 4 or 8)
+        
+        self._decoders: Dict[str, Decoder] = {}
+        self._aliases: Dict[str, str] = {}
+        # First two bytes -> [(decoder name, ((offset, magic), ...)), ...]
+        self._signatures: Dict[bytes, List[Tuple[str, Tuple[Tuple[int, bytes], ...]]]] = {}
+        self._yuv_sizes = {int(w * h * 1.5): (w, h) for w, h in COMMON_RESOLUTIONS}
+        
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._selection_stats = {'explicit': 0, 'sniffed': 0, 'by_size': 0}
+        
+        registry = get_registry()
+        self._path_counter = registry.counter('ai_decode_total', 'Frames decoded by decode path', ['path'])
+        self._duration = registry.histogram(
+            'ai_decoder_duration_seconds', 'Decode latency per decoder', ['decoder']
+        )
+        self._paths = {}
+        self._timers = {}
+        
+        self._register_default_decoders()
+        
+        config_manager.add_config_change_callback(self._on_config_changed)
+    
+    def _register_default_decoders(self) -> None:
+        self.register_decoder('jpeg', self._decode_jpeg, aliases=('jpg',),
+                              signatures=[((0, b'\xff\xd8\xff'),)])
+        self.register_decoder('png', self._decode_imdecode,
+                              signatures=[((0, b'\x89PNG\r\n\x1a\n'),)])
+        self.register_decoder('webp', self._decode_imdecode,
+                              signatures=[((0, b'RIFF'), (8, b'WEBP'))])
+        self.register_decoder('yuv420', self._decode_i420, aliases=('i420',))
+        self.register_decoder('nv12', self._decode_nv12)
+        self.register_decoder('nv21', self._decode_nv21)
+        self.register_decoder('rgb', self._decode_rgb, aliases=('rgba', 'grayscale'))
+        self.register_decoder('bgr', self._decode_bgr, aliases=('raw',))
+    
+    def register_decoder(self,
+                         name: str,
+                         decoder: Decoder,
+                         aliases: Tuple[str, ...] = (),
+                         signatures: Optional[List[Tuple[Tuple[int, bytes], ...]]] = None) -> None:
+        """
+        Register (or replace) a decoder.
+        
+        Args:
+            name: Format name clients put in FrameRequest.format
+            decoder: Callable (frame_data, width, height, channels) -> BGR frame
+            aliases: Other format names mapped to this decoder
+            signatures: Magic byte checks for sniffing; each signature is a
+                tuple of (offset, bytes) that must all match, and the first
+                check must be at offset 0 with at least two bytes
+        """
+        name = name.lower()
+        self._decoders[name] = decoder
+        for alias in aliases:
+            self._aliases[alias.lower()] = name
+        for checks in signatures or []:
+            offset, magic = checks[0]
+            if offset != 0 or len(magic) < 2:
+                raise ValueError("The first signature check must match at least 2 bytes at offset 0")
+            self._signatures.setdefault(magic[:2], []).append((name, tuple(checks)))
+        with self._stats_lock:
+            self._stats.setdefault(name, {'count': 0, 'errors': 0, 'total_time': 0.0, 'max_time': 0.0})
+        self._timers[name] = self._duration.labels(name)
+        self._logger.debug(f"Decoder registered: {name} (aliases: {aliases})")
+    
+    def _on_config_changed(self, old_config: Dict[str, Any], new_config: Dict[str, Any]) -> None:
+        """
+        Callback for configuration changes.
+        
+        Args:
+            old_config: Old configuration
+            new_config: New configuration
+        """
+        old_decoder = old_config.get('decoder', {})
+        new_decoder = new_config.get('decoder', {})
+        
+        if old_decoder.get('use_turbojpeg') != new_decoder.get('use_turbojpeg'):
+            self._use_turbojpeg = new_decoder.get('use_turbojpeg', True)
+            self._logger.info(f"Updated TurboJPEG setting: {self._use_turbojpeg}")
+        
+        if old_decoder.get('fallback_to_opencv') != new_decoder.get('fallback_to_opencv'):
+            self._fallback_to_opencv = new_decoder.get('fallback_to_opencv', True)
+            self._logger.info(f"Updated fallback_to_opencv setting: {self._fallback_to_opencv}")
+        
+        if old_decoder.get('yuv_direct_to_model') != new_decoder.get('yuv_direct_to_model'):
+            self._yuv_direct = new_decoder.get('yuv_direct_to_model', True)
+            self._logger.info(f"Updated yuv_direct_to_model setting: {self._yuv_direct}")
+    
+    @property
+    def turbojpeg_enabled(self) -> bool:
+        return self._use_turbojpeg and TURBOJPEG_AVAILABLE
+    
+    @property
+    def decode_scale(self) -> int:
+        return self._decode_scale
+    
+    def set_decode_scale(self, scale: int) -> None:
+        """
+        Set the JPEG decode downscale denominator.
+        
+        Args:
+            scale: 1 (full size), 2, 4 or 8
+        """
+        if scale not in (1, 2, 4, 8):
+            raise ValueError(f"decode scale must be 1, 2, 4 or 8, got {scale}")
+        self._decode_scale = scale
+        self._logger.info(f"Decode scale set to 1/{scale}")
+    
+    def direct_yuv_layout(self, format: str) -> Optional[str]:
+        """
+        Get the YUV420 layout for formats that can skip BGR decoding.
+        
+        Args:
+            format: Format name from the request
+        
+        Returns:
+            'i420', 'nv12' or 'nv21', or None if the format must go through decode()
+        """
+        if not self._yuv_direct or not format:
+            return None
+        return YUV420_LAYOUTS.get(format.lower())
+    
+    def sniff(self, frame_data: bytes) -> Optional[str]:
+        """
+        Identify the payload format from its magic bytes.
+        
+        Args:
+            frame_data: Frame bytes
+        
+        Returns:
+            Decoder name, or None if no signature matches
+        """
+        for name, checks in self._signatures.get(bytes(frame_data[:2]), ()):
+            if all(frame_data[offset:offset + len(magic)] == magic for offset, magic in checks):
+                return name
+        return None
+    
+    def _select(self, frame_data: bytes, width: int, height: int,
+                channels: int, format: str) -> Tuple[str, int, int]:
+        """Choose the decoder name (and dimensions) for a payload."""
+        if format:
+            format_lower = format.lower()
+            name = self._aliases.get(format_lower, format_lower)
+            if name in self._decoders:
+                self._selection_stats['explicit'] += 1
+                return name, width, height
+            if format_lower != 'auto':
+                self._logger.warning(f"[DECODE] Unknown format '{format}', falling back to auto-detection")
+        
+        name = self.sniff(frame_data)
+        if name is not None:
+            self._selection_stats['sniffed'] += 1
+            return name, width, height
+        
+        data_len = len(frame_data)
+        if width > 0 and height > 0:
+            if data_len == int(width * height * 1.5):
+                self._selection_stats['by_size'] += 1
+                return 'yuv420', width, height
+            if data_len == width * height * channels:
+                self._selection_stats['by_size'] += 1
+                return 'bgr', width, height
+        elif data_len in self._yuv_sizes:
+            w, h = self._yuv_sizes[data_len]
+            self._logger.debug(f"[DECODE] YUV420 auto-detected by size: {w}x{h}")
+            self._selection_stats['by_size'] += 1
+            return 'yuv420', w, h
+        
+        raise ValueError(
+            f"Failed to decode frame: format={format or 'auto'}, {data_len} bytes, "
+            f"dims={width}x{height}x{channels}. Not JPEG/PNG/WebP, not YUV420, not raw RGB."
+        )
+    
+    def decode(self, frame_data: bytes, width: int, height: int,
+               channels: int, format: str = 'auto') -> np.ndarray:
+        """
+        Decode a frame to a BGR numpy array.
+        
+        Args:
+            frame_data: Frame data as bytes
+            width: Frame width (0 if unknown)
+            height: Frame height (0 if unknown)
+            channels: Number of channels
+            format: Format name from the request ('' or 'auto' to sniff)
+        
+        Returns:
+            Frame as numpy array (BGR format for OpenCV)
+        
+        Note:
+            With a decode scale > 1 compressed frames are returned at reduced
+            size instead of being resized to width x height.
+        """
+        name, width, height = self._select(frame_data, width, height, channels, format)
+        decoder = self._decoders[name]
+        
+        start = time.perf_counter()
+        try:
+            frame = decoder(frame_data, width, height, channels)
+        except Exception:
+            with self._stats_lock:
+                self._stats[name]['errors'] += 1
+            raise
+        duration = time.perf_counter() - start
+        
+        self._timers[name].observe(duration)
+        with self._stats_lock:
+            stats = self._stats[name]
+            stats['count'] += 1
+            stats['total_time'] += duration
+            if duration > stats['max_time']:
+                stats['max_time'] = duration
+        
+        self._logger.debug(f"[DECODE] {name}: {frame.shape[1]}x{frame.shape[0]} in {duration * 1000:.2f}ms")
+        return frame
+    
+    def _count_path(self, path: str) -> None:
+        counter = self._paths.get(path)
+        if counter is None:
+            counter = self._paths[path] = self._path_counter.labels(path)
+        counter.inc()
+    
+    def _imdecode_flags(self) -> int:
+        """OpenCV imdecode flags matching the current decode scale."""
+        return {
+            1: cv2.IMREAD_COLOR,
+            2: cv2.IMREAD_REDUCED_COLOR_2,
+            4: cv2.IMREAD_REDUCED_COLOR_4,
+            8: cv2.IMREAD_REDUCED_COLOR_8
+        }[self._decode_scale]
+    
+    def _match_requested_size(self, frame: np.ndarray, width: int, height: int) -> np.ndarray:
+        """Resize a decoded image to the requested dimensions (full-scale decode only)."""
+        actual_h, actual_w = frame.shape[:2]
+        if self._decode_scale == 1 and width > 0 and height > 0 and (actual_w != width or actual_h != height):
+            self._logger.debug(f"[DECODE] Resizing {actual_w}x{actual_h} -> {width}x{height}")
+            frame = cv2.resize(frame, (width, height))
+        return frame
+    
+    def _decode_jpeg(self, frame_data: bytes, width: int, height: int, channels: int) -> np.ndarray:
+        """JPEG: TurboJPEG when available, OpenCV as fallback."""
+        if self.turbojpeg_enabled:
+            jpeg = get_turbojpeg()
+            if jpeg is not None:
+                try:
+                    if self._decode_scale > 1:
+                        frame = jpeg.decode(frame_data, pixel_format=TJPF_BGR,
+                                            scaling_factor=(1, self._decode_scale))
+                    else:
+                        frame = jpeg.decode(frame_data, pixel_format=TJPF_BGR)
+                    self._count_path('turbojpeg')
+                    return self._match_requested_size(frame, width, height)
+                except Exception as e:
+                    self._logger.debug(f"TurboJPEG decode failed: {e}")
+            if not self._fallback_to_opencv:
+                raise ValueError("TurboJPEG decode failed and fallback is disabled")
+        
+        frame = cv2.imdecode(np.frombuffer(frame_data, dtype=np.uint8), self._imdecode_flags())
+        if frame is None:
+            raise ValueError("JPEG decode returned None")
+        self._count_path('opencv')
+        return self._match_requested_size(frame, width, height)
+    
+    def _decode_imdecode(self, frame_data: bytes, width: int, height: int, channels: int) -> np.ndarray:
+        """PNG/WebP (and other formats OpenCV understands)."""
+        frame = cv2.imdecode(np.frombuffer(frame_data, dtype=np.uint8), self._imdecode_flags())
+        if frame is None:
+            raise ValueError("Image decode returned None")
+        self._count_path('opencv')
+        return self._match_requested_size(frame, width, height)
+    
+    def _decode_i420(self, frame_data: bytes, width: int, height: int, channels: int) -> np.ndarray:
+        """Planar YUV420 (I420)."""
+        if width <= 0 or height <= 0:
+            raise ValueError(f"YUV420 format requires valid dimensions, got {width}x{height}")
+        expected_size = int(width * height * 1.5)
+        if len(frame_data) != expected_size:
+            raise ValueError(f"YUV420 size mismatch: expected {expected_size} bytes, got {len(frame_data)}")
+        
+        yuv_frame = np.frombuffer(frame_data, dtype=np.uint8).reshape((int(height * 1.5), width))
+        self._count_path('yuv420')
+        return cv2.cvtColor(yuv_frame, cv2.COLOR_YUV2BGR_I420)
+    
+    def _decode_semiplanar(self, frame_data: bytes, width: int, height: int, code: int, name: str) -> np.ndarray:
+        if width <= 0 or height <= 0:
+            raise ValueError(f"{name} format requires valid dimensions, got {width}x{height}")
+        expected_size = int(width * height * 1.5)
+        if len(frame_data) != expected_size:
+            raise ValueError(f"{name} size mismatch: expected {expected_size} bytes, got {len(frame_data)}")
+        
+        yuv_frame = np.frombuffer(frame_data, dtype=np.uint8).reshape((int(height * 1.5), width))
+        self._count_path('yuv420')
+        return cv2.cvtColor(yuv_frame, code)
+    
+    def _decode_nv12(self, frame_data: bytes, width: int, height: int, channels: int) -> np.ndarray:
+        """Semi-planar YUV420 with interleaved UV (NV12)."""
+        return self._decode_semiplanar(frame_data, width, height, cv2.COLOR_YUV2BGR_NV12, 'NV12')
+    
+    def _decode_nv21(self, frame_data: bytes, width: int, height: int, channels: int) -> np.ndarray:
+        """Semi-planar YUV420 with interleaved VU (NV21, Android camera default)."""
+        return self._decode_semiplanar(frame_data, width, height, cv2.COLOR_YUV2BGR_NV21, 'NV21')
+    
+    def _raw_pixels(self, frame_data: bytes, width: int, height: int, channels: int) -> np.ndarray:
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Raw format requires valid dimensions, got {width}x{height}")
+        expected_size = int(width * height * channels)
+        if len(frame_data) != expected_size:
+            raise ValueError(f"Raw size mismatch: expected {expected_size} bytes, got {len(frame_data)}")
+        
+        frame = np.frombuffer(frame_data, dtype=np.uint8)
+        self._count_path('raw')
+        if channels == 1:
+            return frame.reshape((height, width))
+        return frame.reshape((height, width, channels))
+    
+    def _decode_rgb(self, frame_data: bytes, width: int, height: int, channels: int) -> np.ndarray:
+        """Raw RGB / RGBA / grayscale pixels, converted to BGR."""
+        frame = self._raw_pixels(frame_data, width, height, channels)
+        if channels == 3:
+            return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+        if channels == 4:
+            return cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR)
+        if channels == 1:
+            return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        return frame
+    
+    def _decode_bgr(self, frame_data: bytes, width: int, height: int, channels: int) -> np.ndarray:
+        """Raw pixels already in BGR order (legacy auto-detect behaviour)."""
+        return self._raw_pixels(frame_data, width, height, channels)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-decoder statistics.
+        
+        Returns:
+            Dictionary with selection counts and count/errors/avg_ms/max_ms per decoder
+        """
+        with self._stats_lock:
+            decoders = {}
+            for name, stats in self._stats.items():
+                count = stats['count']
+                decoders[name] = {
+                    'count': count,
+                    'errors': stats['errors'],
+                    'avg_ms': stats['total_time'] / count * 1000 if count else 0.0,
+                    'max_ms': stats['max_time'] * 1000
+                }
+        return {
+            'selection': dict(self._selection_stats),
+            'decoders': decoders,
+            'decode_scale': self._decode_scale,
+            'turbojpeg': self.turbojpeg_enabled
+        }
@@ -0,0 +1,285 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Any, Dict, List, Optional, Sequence
+
+from .metrics import get_registry
+from .thread_pool import TaskPriority, QUEUE_TIME_BUCKETS
+
+# Default stage layout: decode + preprocess, model, postprocess
+DEFAULT_STAGES = ('prepare', 'infer', 'postprocess')
+
+# Sorts after every job so a stage drains its queue before stopping
+_STOP_RANK = float('inf')
+
+
+class _Job:
+    __slots__ = ('future', 'session', 'rank', 'steps', 'value', 'enqueued_at')
+    
+    def __init__(self, future: Future, session: Optional[str], rank: int, steps: Sequence[Callable]):
+        self.future = future
+        self.session = session
+        self.rank = rank
+        self.steps = steps
+        self.value = None
+        self.enqueued_at = 0.0
+
+
+class _Stage:
+    __slots__ = ('name', 'index', 'threads', 'queue', 'workers', 'lock', 'busy', 'processed', 'failed',
+                 'queue_seconds')
+    
+    def __init__(self, name: str, index: int, threads: int, queue_depth: int):
+        self.name = name
+        self.index = index
+        self.threads = threads
+        # Entries: (-priority, sequence, job); higher priority first, FIFO within a priority
+        self.queue = queue.PriorityQueue(maxsize=queue_depth)
+        self.workers: List[threading.Thread] = []
+        self.lock = threading.Lock()
+        self.busy = 0
+        self.processed = 0
+        self.failed = 0
+        self.queue_seconds = None
+
+
+class FramePipeline:
+    """
+    Pipeline bertahap untuk frame: setiap stage punya thread dan antrian sendiri.
+    
+    A frame is submitted as one callable per stage: the first step takes
+    no arguments, every later step takes the result of the previous one
+    and the last result completes the returned Future. Each stage has its
+    own worker threads and a bounded queue in front of it, so while frame
+    N holds a model instance, frame N+1 is already being decoded and frame
+    N-1 postprocessed. A full queue blocks the stage before it
+    (backpressure up to submit()).
+    
+    Queues are ordered by TaskPriority (FIFO within a priority), and
+    max_inflight_per_session caps the frames one session (camera) has in
+    the pipeline; 2 keeps the next frame decoding while the current one
+    is in the model without letting one session fill the queues.
+    """
+    
+    def __init__(self,
+                 stages: Sequence[Dict[str, Any]],
+                 max_inflight_per_session: int = 2,
+                 submit_timeout: Optional[float] = 1.0,
+                 name: str = "frame"):
+        """
+        Args:
+            stages: Stage definitions in order: {'name', 'threads', 'queue_depth'}
+            max_inflight_per_session: Max frames per session in the pipeline (0 = unlimited)
+            submit_timeout: Max seconds submit() waits for room (None = wait forever)
+            name: Pipeline name (thread names and logs)
+        """
+        if not stages:
+            raise ValueError("FramePipeline needs at least one stage")
+        
+        self._logger = logging.getLogger(__name__)
+        self._name = name
+        self._max_inflight_per_session = max(0, int(max_inflight_per_session or 0))
+        self._submit_timeout = submit_timeout
+        self._sequence = itertools.count()
+        self._shutdown = False
+        
+        # Frames in the pipeline per session id
+        self._sessions: Dict[str, int] = {}
+        self._sessions_cond = threading.Condition()
+        
+        # Metrics (children cached so the hot path skips label lookups)
+        registry = get_registry()
+        queue_depth = registry.gauge(
+            'ai_pipeline_queue_depth', 'Frames waiting in front of a pipeline stage', ['stage']
+        )
+        busy_threads = registry.gauge(
+            'ai_pipeline_busy_threads', 'Pipeline stage threads working on a frame', ['stage']
+        )
+        queue_seconds = registry.histogram(
+            'ai_pipeline_queue_seconds', 'Time frames wait in front of a pipeline stage', ['stage'],
+            buckets=QUEUE_TIME_BUCKETS
+        )
+        
+        self._stages: List[_Stage] = []
+        for index, definition in enumerate(stages):
+            stage = _Stage(
+                definition['name'],
+                index,
+                max(1, int(definition.get('threads', 1))),
+                max(1, int(definition.get('queue_depth', 8)))
+            )
+            stage.queue_seconds = queue_seconds.labels(stage.name)
+            queue_depth.labels(stage.name).set_function(stage.queue.qsize)
+            busy_threads.labels(stage.name).set_function(lambda stage=stage: stage.busy)
+            self._stages.append(stage)
+        
+        for stage in self._stages:
+            for i in range(stage.threads):
+                thread = threading.Thread(
+                    target=self._stage_loop, args=(stage,), name=f"{name}-{stage.name}-{i}", daemon=True
+                )
+                thread.start()
+                stage.workers.append(thread)
+        
+        layout = ', '.join(f"{s.name} x{s.threads} (queue {s.queue.maxsize})" for s in self._stages)
+        self._logger.info(f"FramePipeline '{name}': {layout}")
+    
+    @property
+    def stage_names(self) -> List[str]:
+        return [stage.name for stage in self._stages]
+    
+    def _stage_loop(self, stage: _Stage) -> None:
+        next_stage = self._stages[stage.index + 1] if stage.index + 1 < len(self._stages) else None
+        while True:
+            _, _, job = stage.queue.get()
+            if job is None:
+                return
+            stage.queue_seconds.observe(time.perf_counter() - job.enqueued_at)
+            
+            if stage.index == 0 and not job.future.set_running_or_notify_cancel():
+                # Cancelled while queued
+                self._leave_session(job.session)
+                continue
+            
+            with stage.lock:
+                stage.busy += 1
+            try:
+                step = job.steps[stage.index]
+                job.value = step() if stage.index == 0 else step(job.value)
+                failed = None
+            except BaseException as e:
+                failed = e
+            with stage.lock:
+                stage.busy -= 1
+                if failed is None:
+                    stage.processed += 1
+                else:
+                    stage.failed += 1
+            if failed is not None:
+                self._finish(job, error=failed)
+                continue
+            
+            if next_stage is None:
+                self._finish(job, result=job.value)
+            else:
+                # Blocks while the next stage is full (backpressure)
+                self._put(next_stage, job, None)
+    
+    def _put(self, stage: _Stage, job: _Job, timeout: Optional[float]) -> None:
+        job.enqueued_at = time.perf_counter()
+        stage.queue.put((job.rank, next(self._sequence), job), timeout=timeout)
+    
+    def _finish(self, job: _Job, result: Any = None, error: Optional[BaseException] = None) -> None:
+        self._leave_session(job.session)
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+    
+    def _enter_session(self, session: Optional[str], deadline: Optional[float]) -> None:
+        if session is None or not self._max_inflight_per_session:
+            return
+        with self._sessions_cond:
+            while self._sessions.get(session, 0) >= self._max_inflight_per_session:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Full(
+                        f"Session {session} already has {self._max_inflight_per_session} frames in the pipeline"
+                    )
+                self._sessions_cond.wait(remaining)
+            self._sessions[session] = self._sessions.get(session, 0) + 1
+    
+    def _leave_session(self, session: Optional[str]) -> None:
+        if session is None or not self._max_inflight_per_session:
+            return
+        with self._sessions_cond:
+            count = self._sessions.get(session, 0) - 1
+            if count > 0:
+                self._sessions[session] = count
+            else:
+                self._sessions.pop(session, None)
+            self._sessions_cond.notify_all()
+    
+    def submit(self,
+               steps: Sequence[Callable],
+               session: Optional[str] = None,
+               priority: TaskPriority = TaskPriority.MEDIUM) -> Future:
+        """
+        Queue a frame into the first stage.
+        
+        Args:
+            steps: One callable per stage (first takes no arguments, the rest the previous result)
+            session: Session id for the per-session in-flight limit (None = not limited)
+            priority: Queue priority in every stage
+        
+        Returns:
+            Future of the last step's result
+        
+        Raises:
+            RuntimeError: Pipeline is shut down
+            ValueError: Wrong number of steps
+            queue.Full: No room within submit_timeout (session limit or first stage queue)
+        """
+        if self._shutdown:
+            raise RuntimeError("FramePipeline is shutdown")
+        if len(steps) != len(self._stages):
+            raise ValueError(f"Expected {len(self._stages)} steps ({self.stage_names}), got {len(steps)}")
+        
+        deadline = None if self._submit_timeout is None else time.monotonic() + self._submit_timeout
+        self._enter_session(session, deadline)
+        job = _Job(Future(), session, -priority.value, steps)
+        try:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            self._put(self._stages[0], job, remaining)
+        except queue.Full:
+            self._leave_session(session)
+            raise queue.Full(f"Pipeline stage '{self._stages[0].name}' queue is full")
+        return job.future
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dictionary with per-stage threads, queue depth, busy threads and counts
+        """
+        with self._sessions_cond:
+            sessions = len(self._sessions)
+        return {
+            'name': self._name,
+            'max_inflight_per_session': self._max_inflight_per_session,
+            'active_sessions': sessions,
+            'stages': [
+                {
+                    'name': stage.name,
+                    'threads': stage.threads,
+                    'queue_depth': stage.queue.qsize(),
+                    'max_queue_depth': stage.queue.maxsize,
+                    'busy': stage.busy,
+                    'processed': stage.processed,
+                    'failed': stage.failed
+                }
+                for stage in self._stages
+            ]
+        }
+    
+    def shutdown(self, wait: bool = True, timeout: float = 5.0) -> None:
+        """
+        Stop accepting frames; stages finish the queued frames, then stop.
+        
+        Args:
+            wait: Join the stage threads
+            timeout: Max seconds to wait per thread
+        """
+        if self._shutdown:
+            return
+        self._shutdown = True
+        # Stop stage by stage so frames still move downstream while upstream drains
+        for stage in self._stages:
+            for _ in stage.workers:
+                stage.queue.put((_STOP_RANK, next(self._sequence), None))
+            if wait:
+                for thread in stage.workers:
+                    thread.join(timeout=timeout)
+        self._logger.info(f"FramePipeline '{self._name}' shut down")
@@ -1,11 +1,38 @@
 import logging
+import time
 import numpy as np
 import cv2
-from typing import Optional, Dict, Any, Tuple, List, Union
+from typing import Optional, Dict, Any, Tuple, List, Union, Callable
 from pathlib import Path
 from .model_inference import ModelInference
 from .object_pool import ObjectPool
+from .thread_pool import TaskPriority
 from .config_manager import ConfigurationManager
+from .metrics import get_registry
+from .frame_decoder import yuv420_to_chw
+from .detection_batch import DetectionBatch
+from .roi_tracker import RoiTracker, RoiWindow
+
+RESIZE_MODES = ('stretch', 'letterbox')
+
+
+def letterbox_geometry(orig_w: int, orig_h: int, target_w: int, target_h: int) -> Tuple[int, int, int, int]:
+    """
+    Hitung ukuran dan padding letterbox (aspect ratio dipertahankan, gambar di tengah).
+    
+    Args:
+        orig_w: Lebar frame asli
+        orig_h: Tinggi frame asli
+        target_w: Lebar input model
+        target_h: Tinggi input model
+        
+    Returns:
+        Tuple (new_w, new_h, pad_x, pad_y): ukuran gambar setelah resize dan offset kiri/atas
+    """
+    gain = min(target_w / orig_w, target_h / orig_h)
+    new_w = max(1, min(target_w, int(round(orig_w * gain))))
+    new_h = max(1, min(target_h, int(round(orig_h * gain))))
+    return new_w, new_h, (target_w - new_w) // 2, (target_h - new_h) // 2
 
 
 class FrameProcessor:
@@ -19,7 +46,9 @@ class FrameProcessor:
                  config_manager: ConfigurationManager,
                  pool_size: Optional[int] = None,
                  target_size: Optional[Tuple[int, int]] = None,
-                 normalize: Optional[bool] = None):
+                 normalize: Optional[bool] = None,
+                 class_names: Optional[List[str]] = None,
+                 model_factory: Optional[Callable[[], ModelInference]] = None):
         """
         Inisialisasi FrameProcessor.
         
@@ -29,6 +58,8 @@ class FrameProcessor:
             pool_size: Jumlah model instance dalam pool (from config if not provided)
             target_size: Ukuran target untuk resize frame (width, height) (from config if not provided)
             normalize: Apakah akan melakukan normalisasi pixel (from config if not provided)
+            class_names: Nama class model (from config if not provided)
+            model_factory: Pembuat ModelInference untuk pool (default: model dari config)
         """
         self._logger = logging.getLogger(__name__)
         self._config_manager = config_manager
@@ -38,6 +69,8 @@ class FrameProcessor:
         self._pool_size = pool_size or config_manager.get('model.pool_size', 5)
         
         # Target size - MUST match model training size (check model metadata)
+        # An explicit target size belongs to a specific model and ignores config changes
+        self._fixed_target_size = target_size is not None
         self._target_size = target_size or self._parse_target_size(
             config_manager.get('model.target_size')
         )
@@ -46,20 +79,40 @@ class FrameProcessor:
         
         self._normalize = normalize if normalize is not None else config_manager.get('model.normalize', True)
         
+        # Resize mode: 'stretch' (ignore aspect ratio) or 'letterbox' (pad to target aspect)
+        self._resize_mode = self._parse_resize_mode(config_manager.get('model.resize_mode', 'stretch'))
+        self._letterbox_color = int(config_manager.get('model.letterbox_color', 114))
+        
+        # Region of interest from previous detections per session (None = always the full frame)
+        self._roi_tracker: Optional[RoiTracker] = self._create_roi_tracker(config_manager.get('model.roi', {}))
+        
         # Buat pool untuk model inference
         self._model_pool = ObjectPool(
-            create_object=lambda: ModelInference(config_manager),
+            create_object=model_factory or (lambda: ModelInference(config_manager)),
             max_size=self._pool_size,
             reset_object=self._reset_model
         )
         
+        # Metrics (children cached so the hot path skips label lookups)
+        registry = get_registry()
+        stage_seconds = registry.histogram(
+            'ai_stage_duration_seconds', 'Frame processing stage latency', ['stage']
+        )
+        self._preprocess_seconds = stage_seconds.labels('preprocess')
+        self._pool_wait_seconds = stage_seconds.labels('pool_wait')
+        self._inference_seconds = stage_seconds.labels('inference')
+        self._postprocess_seconds = stage_seconds.labels('postprocess')
+        
         # Class names from config
-        self._class_names = config_manager.get('model.class_names', [])
+        self._class_names = class_names if class_names is not None else config_manager.get('model.class_names', [])
         if not self._class_names:
             self._logger.warning("model.class_names not specified in config, using indices")
 
         self._logger.info(f"FrameProcessor initialized with model: {model_path}")
-        self._logger.info(f"Target size: {self._target_size}, Normalize: {self._normalize}")
+        self._logger.info(
+            f"Target size: {self._target_size}, Normalize: {self._normalize}, Resize mode: {self._resize_mode}, "
+            f"ROI: {self._roi_tracker is not None}"
+        )
         self._logger.info(f"Class names: {self._class_names}")
 
         # Register callback for configuration changes
@@ -100,6 +153,36 @@ class FrameProcessor:
             self._logger.warning(f"Unsupported target size format: {size_config}")
             return None
     
+    def _parse_resize_mode(self, mode: Optional[str]) -> str:
+        """
+        Validate the resize mode from configuration.
+        
+        Args:
+            mode: 'stretch' or 'letterbox'
+            
+        Returns:
+            Resize mode ('stretch' if the value is unknown)
+        """
+        mode = str(mode or 'stretch').lower()
+        if mode not in RESIZE_MODES:
+            self._logger.warning(f"Unknown resize mode '{mode}', using 'stretch'")
+            return 'stretch'
+        return mode
+    
+    def _create_roi_tracker(self, roi_config: Optional[Dict[str, Any]]) -> Optional[RoiTracker]:
+        """
+        Create the ROI tracker from the model.roi config section.
+        
+        Args:
+            roi_config: model.roi config dictionary
+            
+        Returns:
+            RoiTracker, or None when ROI mode is disabled
+        """
+        if not roi_config or not roi_config.get('enabled', False):
+            return None
+        return RoiTracker.from_config(roi_config)
+    
     def _on_config_changed(self, old_config: Dict[str, Any], new_config: Dict[str, Any]) -> None:
         """
         Callback for configuration changes.
@@ -118,11 +201,26 @@ class FrameProcessor:
                 self._normalize = bool(new_normalize)
                 self._logger.info(f"Updated normalize setting: {self._normalize}")
         
-        if old_model.get('target_size') != new_model.get('target_size'):
+        if old_model.get('target_size') != new_model.get('target_size') and not self._fixed_target_size:
             new_target_size = self._parse_target_size(new_model.get('target_size'))
             if new_target_size is not None:
                 self._target_size = new_target_size
                 self._logger.info(f"Updated target size: {self._target_size}")
+        
+        if old_model.get('resize_mode') != new_model.get('resize_mode'):
+            self._resize_mode = self._parse_resize_mode(new_model.get('resize_mode'))
+            self._logger.info(f"Updated resize mode: {self._resize_mode}")
+        
+        if old_model.get('letterbox_color') != new_model.get('letterbox_color'):
+            self._letterbox_color = int(new_model.get('letterbox_color', 114))
+            self._logger.info(f"Updated letterbox color: {self._letterbox_color}")
+        
+        if old_model.get('roi') != new_model.get('roi'):
+            try:
+                self._roi_tracker = self._create_roi_tracker(new_model.get('roi'))
+                self._logger.info(f"Updated ROI mode: {self._roi_tracker is not None}")
+            except ValueError as e:
+                self._logger.error(f"Invalid model.roi config, keeping current ROI mode: {e}")
     
     def _reset_model(self, model: ModelInference) -> None:
         """
@@ -158,7 +256,10 @@ class FrameProcessor:
         # Resize frame jika target_size disediakan
         if self._target_size:
             original_shape = frame.shape
-            frame = cv2.resize(frame, self._target_size)
+            if self._resize_mode == 'letterbox':
+                frame = self._letterbox(frame)
+            else:
+                frame = cv2.resize(frame, self._target_size)
             self._logger.debug(
                 f"[PREPROCESS] After resize {original_shape[:2]} -> {self._target_size}: "
                 f"shape={frame.shape}"
@@ -182,8 +283,62 @@ class FrameProcessor:
         
         return frame
     
+    def _letterbox(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Resize frame dengan aspect ratio tetap lalu pad ke target_size.
+        
+        Args:
+            frame: Frame HWC
+            
+        Returns:
+            Frame berukuran target_size
+        """
+        target_w, target_h = self._target_size
+        new_w, new_h, pad_x, pad_y = letterbox_geometry(frame.shape[1], frame.shape[0], target_w, target_h)
+        if (new_w, new_h) != (frame.shape[1], frame.shape[0]):
+            frame = cv2.resize(frame, (new_w, new_h))
+        color = (self._letterbox_color,) * (frame.shape[2] if frame.ndim == 3 else 1)
+        return cv2.copyMakeBorder(
+            frame,
+            pad_y, target_h - new_h - pad_y,
+            pad_x, target_w - new_w - pad_x,
+            cv2.BORDER_CONSTANT,
+            value=color
+        )
+    
+    def preprocess_yuv420(self, frame_data: bytes, width: int, height: int, layout: str,
+                          crop: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """
+        Preprocess frame YUV420 langsung ke input model (tanpa decode BGR full-size).
+        
+        Args:
+            frame_data: YUV420 bytes (I420, NV12 atau NV21, tanpa row padding)
+            width: Lebar frame
+            height: Tinggi frame
+            layout: 'i420', 'nv12' atau 'nv21'
+            crop: Region (x0, y0, x1, y1) yang dipakai sebagai frame (None = seluruh frame)
+            
+        Returns:
+            Tensor RGB CHW float32 (1, 3, H, W) sesuai target_size
+        """
+        scale = 1.0 / 255.0 if self._normalize else 1.0
+        if self._resize_mode != 'letterbox':
+            return yuv420_to_chw(frame_data, width, height, layout, self._target_size, scale, crop)
+        
+        # Letterbox: convert at the inner size, then place it on a padded canvas
+        target_w, target_h = self._target_size
+        content_w, content_h = (crop[2] - crop[0], crop[3] - crop[1]) if crop else (width, height)
+        new_w, new_h, pad_x, pad_y = letterbox_geometry(content_w, content_h, target_w, target_h)
+        tensor = np.full((1, 3, target_h, target_w), self._letterbox_color * scale, dtype=np.float32)
+        tensor[:, :, pad_y:pad_y + new_h, pad_x:pad_x + new_w] = yuv420_to_chw(
+            frame_data, width, height, layout, (new_w, new_h), scale, crop
+        )
+        return tensor
     
-    def postprocess_output(self, output: List[np.ndarray], original_shape: tuple = None) -> Dict[str, Any]:
+    def postprocess_output(self,
+                           output: List[np.ndarray],
+                           original_shape: tuple = None,
+                           roi: Optional[RoiWindow] = None) -> Dict[str, Any]:
         """
         Postprocess output dari model YOLO11n dengan NMS built-in.
         VECTORIZED VERSION - Uses NumPy matrix operations for speed.
@@ -196,15 +351,19 @@ class FrameProcessor:
         
         Args:
             output: Output dari model
-            original_shape: Original frame shape (H, W, C) before resize
+            original_shape: Original frame shape (H, W, C) before resize (the crop shape with ROI)
+            roi: ROI window of the frame: boxes are mapped from the crop back to
+                the full frame and recorded for the session (None = no ROI tracking)
             
         Returns:
-            Dictionary berisi hasil detections (identical JSON format to before)
+            Dictionary {"detections": DetectionBatch} (use DetectionBatch.to_dicts()
+            for the previous list-of-dicts JSON format)
         """
-        result = {"detections": []}
+        result = {"detections": DetectionBatch.empty(self._class_names)}
         
         try:
             if not output or len(output) == 0:
+                self._track_roi(roi, np.zeros((0, 4), dtype=np.float32))
                 return result
             
             # Model output: (1, 300, 6)
@@ -233,6 +392,7 @@ class FrameProcessor:
             )
             
             if len(valid_detections) == 0:
+                self._track_roi(roi, np.zeros((0, 4), dtype=np.float32))
                 return result
             
             # Get model input size
@@ -251,15 +411,6 @@ class FrameProcessor:
                     f"{orig_w}x{orig_h} - bbox may be incorrect!"
                 )
             
-            # VECTORIZED: Calculate scale factors
-            scale_x = orig_w / model_w
-            scale_y = orig_h / model_h
-            
-            self._logger.debug(
-                f"[POSTPROCESS] Scaling: model {model_w}x{model_h} -> "
-                f"original {orig_w}x{orig_h}, scale_x={scale_x:.2f}, scale_y={scale_y:.2f}"
-            )
-            
             # VECTORIZED: Extract all columns at once
             x1_all = valid_detections[:, 0]
             y1_all = valid_detections[:, 1]
@@ -268,11 +419,47 @@ class FrameProcessor:
             conf_all = valid_detections[:, 4]
             class_id_all = valid_detections[:, 5].astype(np.int32)
             
-            # VECTORIZED: Scale bbox from model coordinates to original frame coordinates
-            x1_scaled = x1_all * scale_x
-            y1_scaled = y1_all * scale_y
-            x2_scaled = x2_all * scale_x
-            y2_scaled = y2_all * scale_y
+            if self._resize_mode == 'letterbox':
+                # VECTORIZED: Remove letterbox padding, then undo the single uniform scale
+                new_w, new_h, pad_x, pad_y = letterbox_geometry(
+                    int(orig_w), int(orig_h), int(model_w), int(model_h)
+                )
+                scale_x = orig_w / new_w
+                scale_y = orig_h / new_h
+                
+                self._logger.debug(
+                    f"[POSTPROCESS] Letterbox: model {model_w}x{model_h} (content {new_w}x{new_h} "
+                    f"at +{pad_x}+{pad_y}) -> original {orig_w}x{orig_h}"
+                )
+                
+                # Boxes may reach into the padding; clip to the frame before taking w/h
+                x1_scaled = np.clip((x1_all - pad_x) * scale_x, 0.0, orig_w)
+                y1_scaled = np.clip((y1_all - pad_y) * scale_y, 0.0, orig_h)
+                x2_scaled = np.clip((x2_all - pad_x) * scale_x, 0.0, orig_w)
+                y2_scaled = np.clip((y2_all - pad_y) * scale_y, 0.0, orig_h)
+            else:
+                # VECTORIZED: Calculate scale factors
+                scale_x = orig_w / model_w
+                scale_y = orig_h / model_h
+                
+                self._logger.debug(
+                    f"[POSTPROCESS] Scaling: model {model_w}x{model_h} -> "
+                    f"original {orig_w}x{orig_h}, scale_x={scale_x:.2f}, scale_y={scale_y:.2f}"
+                )
+                
+                # VECTORIZED: Scale bbox from model coordinates to original frame coordinates
+                x1_scaled = x1_all * scale_x
+                y1_scaled = y1_all * scale_y
+                x2_scaled = x2_all * scale_x
+                y2_scaled = y2_all * scale_y
+            
+            if roi is not None and roi.cropped:
+                # Crop coordinates -> full frame coordinates
+                x1_scaled = x1_scaled + roi.x0
+                x2_scaled = x2_scaled + roi.x0
+                y1_scaled = y1_scaled + roi.y0
+                y2_scaled = y2_scaled + roi.y0
+                orig_w, orig_h = float(roi.frame_w), float(roi.frame_h)
             
             # VECTORIZED: Convert to x, y, w, h
             x_all = x1_scaled
@@ -286,6 +473,9 @@ class FrameProcessor:
             norm_w = np.clip(w_all / orig_w, 0.0, 1.0)
             norm_h = np.clip(h_all / orig_h, 0.0, 1.0)
             
+            # Region for the next frame of this session (before the client rotation)
+            self._track_roi(roi, np.stack([norm_x, norm_y, norm_x + norm_w, norm_y + norm_h], axis=1))
+            
             # Apply clockwise rotation if enabled (for portrait mode clients)
             rotate_clockwise = self._config_manager.get('model.rotate_bbox_clockwise', False)
             if rotate_clockwise:
@@ -303,27 +493,12 @@ class FrameProcessor:
                 final_w = norm_w
                 final_h = norm_h
             
-            # Build detections list (still need loop for dict creation, but math is vectorized)
-            detections = []
+            # Columns stay numpy arrays; serializers read them without per-detection dicts
+            result["detections"] = DetectionBatch.from_xywh(
+                final_x, final_y, final_w, final_h, conf_all, class_id_all, self._class_names
+            )
             num_detections = len(valid_detections)
             
-            for i in range(num_detections):
-                class_idx = class_id_all[i]
-                class_name = self._class_names[class_idx] if class_idx < len(self._class_names) else str(class_idx)
-                
-                detections.append({
-                    "class_name": class_name,
-                    "confidence": float(conf_all[i]),
-                    "bbox": {
-                        "x_min": float(final_x[i]),
-                        "y_min": float(final_y[i]),
-                        "width": float(final_w[i]),
-                        "height": float(final_h[i])
-                    }
-                })
-            
-            result["detections"] = detections
-            
             self._logger.debug(f"[POSTPROCESS] Returned {num_detections} detections")
             
         except Exception as e:
@@ -331,34 +506,140 @@ class FrameProcessor:
         
         return result
     
-    def process_frame(self, frame: np.ndarray) -> Dict[str, Any]:
+    def _track_roi(self, roi: Optional[RoiWindow], boxes: np.ndarray) -> None:
+        """Record the detections of a frame for its session (no-op without ROI tracking)."""
+        if roi is not None and self._roi_tracker is not None:
+            self._roi_tracker.update(roi, boxes)
+    
+    def _roi_window(self, session: Optional[str], width: int, height: int) -> Optional[RoiWindow]:
+        """ROI window for a frame of a session (None = no ROI tracking for this frame)."""
+        tracker = self._roi_tracker
+        if tracker is None or session is None:
+            return None
+        return tracker.window(session, width, height)
+    
+    def process_frame(self,
+                      frame: np.ndarray,
+                      priority: TaskPriority = TaskPriority.MEDIUM,
+                      session: Optional[str] = None) -> Dict[str, Any]:
         """
         Proses frame menggunakan model AI.
         
         Args:
             frame: Frame yang akan diproses
+            priority: Prioritas request saat menunggu model dari pool
+            session: Session id untuk ROI mode (None = seluruh frame)
             
         Returns:
             Dictionary berisi hasil inferensi
         """
-        # Store original frame shape for bbox normalization
-        original_shape = frame.shape
+        processed_frame, original_shape, roi = self.prepare_frame(frame, session)
+        return self.infer_prepared(processed_frame, original_shape, priority, roi)
+    
+    def prepare_frame(self, frame: np.ndarray, session: Optional[str] = None) -> Tuple[np.ndarray, tuple, Optional[RoiWindow]]:
+        """
+        Preprocess stage of process_frame (can run on another thread, e.g. CpuExecutor).
         
-        # Preprocess frame
+        With ROI mode the session's region is cropped at full resolution
+        before the resize to target_size.
+        
+        Args:
+            frame: BGR frame
+            session: Session id for ROI mode (None = full frame)
+            
+        Returns:
+            Tuple (model input, frame shape for bbox mapping, ROI window or None)
+        """
+        stage_start = time.perf_counter()
+        roi = self._roi_window(session, frame.shape[1], frame.shape[0])
+        if roi is not None and roi.cropped:
+            frame = frame[roi.y0:roi.y1, roi.x0:roi.x1]
         processed_frame = self.preprocess_frame(frame)
+        self._preprocess_seconds.observe(time.perf_counter() - stage_start)
+        return processed_frame, frame.shape, roi
+    
+    def process_yuv420(self, frame_data: bytes, width: int, height: int, layout: str,
+                       priority: TaskPriority = TaskPriority.MEDIUM,
+                       session: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Proses frame YUV420 (I420/NV12/NV21) dari kamera tanpa konversi BGR full-size.
         
+        Args:
+            frame_data: YUV420 bytes
+            width: Lebar frame
+            height: Tinggi frame
+            layout: 'i420', 'nv12' atau 'nv21'
+            priority: Prioritas request saat menunggu model dari pool
+            session: Session id untuk ROI mode (None = seluruh frame)
+            
+        Returns:
+            Dictionary berisi hasil inferensi
+        """
+        processed_frame, original_shape, roi = self.prepare_yuv420(frame_data, width, height, layout, session)
+        return self.infer_prepared(processed_frame, original_shape, priority, roi)
+    
+    def prepare_yuv420(self, frame_data: bytes, width: int, height: int, layout: str,
+                       session: Optional[str] = None) -> Tuple[np.ndarray, tuple, Optional[RoiWindow]]:
+        """
+        Preprocess stage of process_yuv420 (can run on another thread, e.g. CpuExecutor).
+        
+        Returns:
+            Tuple (model input, frame shape for bbox mapping, ROI window or None)
+        """
+        stage_start = time.perf_counter()
+        roi = self._roi_window(session, width, height)
+        if roi is not None and roi.cropped:
+            crop = (roi.x0, roi.y0, roi.x1, roi.y1)
+            processed_frame = self.preprocess_yuv420(frame_data, width, height, layout, crop)
+            original_shape = (roi.height, roi.width, 3)
+        else:
+            processed_frame = self.preprocess_yuv420(frame_data, width, height, layout)
+            original_shape = (height, width, 3)
+        self._preprocess_seconds.observe(time.perf_counter() - stage_start)
+        return processed_frame, original_shape, roi
+    
+    def infer_prepared(self,
+                       processed_frame: np.ndarray,
+                       original_shape: tuple,
+                       priority: TaskPriority = TaskPriority.MEDIUM,
+                       roi: Optional[RoiWindow] = None) -> Dict[str, Any]:
+        """
+        Run inference on a preprocessed frame and postprocess the output.
+        
+        Args:
+            processed_frame: Model input (1, 3, H, W)
+            original_shape: Frame shape (H, W, C) for bbox mapping
+            priority: Priority of the request in the model pool queue
+            roi: ROI window from prepare_frame / prepare_yuv420
+            
+        Returns:
+            Dictionary berisi hasil inferensi
+        """
+        output = self.infer(processed_frame, priority)
+        return self.postprocess(output, original_shape, roi)
+    
+    def infer(self, processed_frame: np.ndarray, priority: TaskPriority = TaskPriority.MEDIUM) -> List[np.ndarray]:
+        """
+        Run the model on a preprocessed frame (model pool slot held only for predict).
+        
+        Args:
+            processed_frame: Model input (1, 3, H, W)
+            priority: Priority of the request in the model pool queue
+            
+        Returns:
+            Raw model outputs
+        """
         # Dapatkan model dari pool
-        model = self._model_pool.acquire()
+        stage_start = time.perf_counter()
+        model = self._model_pool.acquire(priority)
+        self._pool_wait_seconds.observe(time.perf_counter() - stage_start)
         
         try:
             # Lakukan inferensi
+            stage_start = time.perf_counter()
             output = model.predict(processed_frame)
-            
-            # Postprocess output with original frame shape for correct normalization
-            result = self.postprocess_output(output, original_shape=original_shape)
-            
-            self._logger.debug("Frame processed successfully")
-            return result
+            self._inference_seconds.observe(time.perf_counter() - stage_start)
+            return output
             
         except Exception as e:
             self._logger.error(f"Error processing frame: {e}")
@@ -367,12 +648,36 @@ class FrameProcessor:
             # Kembalikan model ke pool
             self._model_pool.release(model)
     
-    def process_batch(self, frames: List[np.ndarray]) -> List[Dict[str, Any]]:
+    def postprocess(self,
+                    output: List[np.ndarray],
+                    original_shape: tuple,
+                    roi: Optional[RoiWindow] = None) -> Dict[str, Any]:
+        """
+        Postprocess raw model outputs (timed postprocess_output).
+        
+        Args:
+            output: Raw model outputs from infer()
+            original_shape: Frame shape (H, W, C) for bbox mapping
+            roi: ROI window from prepare_frame / prepare_yuv420
+            
+        Returns:
+            Dictionary berisi hasil inferensi
+        """
+        # Postprocess output with original frame shape for correct normalization
+        stage_start = time.perf_counter()
+        result = self.postprocess_output(output, original_shape=original_shape, roi=roi)
+        self._postprocess_seconds.observe(time.perf_counter() - stage_start)
+        
+        self._logger.debug("Frame processed successfully")
+        return result
+    
+    def process_batch(self, frames: List[np.ndarray], priority: TaskPriority = TaskPriority.MEDIUM) -> List[Dict[str, Any]]:
         """
         Proses batch frame menggunakan model AI.
         
         Args:
             frames: List frame yang akan diproses
+            priority: Prioritas request saat menunggu model dari pool
             
         Returns:
             List berisi hasil inferensi untuk setiap frame
@@ -380,12 +685,21 @@ class FrameProcessor:
         results = []
         
         for frame in frames:
-            result = self.process_frame(frame)
+            result = self.process_frame(frame, priority)
             results.append(result)
         
         self._logger.debug(f"Processed batch of {len(frames)} frames")
         return results
 
+    def prewarm_pool(self) -> int:
+        """
+        Membuat semua model instance di pool saat startup.
+        
+        Returns:
+            Jumlah model instance yang dibuat
+        """
+        return self._model_pool.prewarm()
+    
     def get_pool_stats(self) -> Dict[str, int]:
         """
         Mendapatkan statistik pool.
@@ -395,9 +709,19 @@ class FrameProcessor:
         """
         return {
             "pool_size": self._model_pool.size(),
-            "in_use": self._model_pool.in_use_count()
+            "in_use": self._model_pool.in_use_count(),
+            "max_size": self._model_pool.get_max_size()
         }
     
+    def get_target_size(self) -> Tuple[int, int]:
+        """
+        Mendapatkan ukuran target input model.
+        
+        Returns:
+            Ukuran target (width, height)
+        """
+        return self._target_size
+    
     def set_target_size(self, target_size: Tuple[int, int]) -> None:
         """
         Mengatur ukuran target untuk resize frame.
@@ -3,9 +3,99 @@ import time
 import threading
 import gc
 import tracemalloc
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Sequence, Tuple
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, deque
+import numpy as np
+
+from .time_series import TimeSeriesBuffer
+
+
+# Generational GC threshold presets (gen0, gen1, gen2).
+# 'server' trades a little more young-generation garbage for far fewer
+# collections while frames are being processed.
+GC_TUNING_PROFILES: Dict[str, Tuple[int, int, int]] = {
+    'default': (700, 10, 10),
+    'server': (50000, 20, 100),
+}
+
+
+def resolve_gc_thresholds(profile: str = 'default',
+                          thresholds: Optional[Sequence[int]] = None) -> Tuple[int, int, int]:
+    """
+    Resolve GC thresholds from a profile name or explicit values.
+    
+    Args:
+        profile: Name of a profile in GC_TUNING_PROFILES
+        thresholds: Explicit (gen0, gen1, gen2) thresholds, overrides profile
+        
+    Returns:
+        Tuple of (gen0, gen1, gen2) thresholds
+    """
+    if thresholds:
+        if len(thresholds) != 3:
+            raise ValueError(f"GC thresholds must have 3 values, got {list(thresholds)}")
+        values = tuple(int(v) for v in thresholds)
+        if values[0] <= 0 or values[1] < 0 or values[2] < 0:
+            raise ValueError(f"Invalid GC thresholds: {values}")
+        return values
+    
+    if profile not in GC_TUNING_PROFILES:
+        raise ValueError(
+            f"Unknown GC profile '{profile}', expected one of {sorted(GC_TUNING_PROFILES)}"
+        )
+    return GC_TUNING_PROFILES[profile]
+
+
+def apply_gc_thresholds(profile: str = 'default',
+                        thresholds: Optional[Sequence[int]] = None) -> Tuple[int, int, int]:
+    """
+    Apply GC thresholds from a profile or explicit values.
+    
+    Args:
+        profile: Name of a profile in GC_TUNING_PROFILES
+        thresholds: Explicit (gen0, gen1, gen2) thresholds, overrides profile
+        
+    Returns:
+        Tuple of thresholds that were applied
+    """
+    values = resolve_gc_thresholds(profile, thresholds)
+    gc.set_threshold(*values)
+    return values
+
+
+def _timed_full_collection() -> Tuple[float, int]:
+    """Run a full collection and return (duration in seconds, objects collected)."""
+    start = time.perf_counter()
+    collected = gc.collect(2)
+    return time.perf_counter() - start, collected
+
+
+def freeze_long_lived_objects() -> Dict[str, Any]:
+    """
+    Move every object alive right now into the permanent generation.
+    
+    Intended to run once after startup (models loaded, pool warmed) so that
+    ONNX sessions, protobuf descriptors and imported modules are no longer
+    rescanned by every full collection. A full collection is timed before
+    and after the freeze to measure the effect.
+    
+    Returns:
+        Dictionary with pause timings and frozen object count
+    """
+    pause_before, collected = _timed_full_collection()
+    gc.freeze()
+    frozen_objects = gc.get_freeze_count()
+    pause_after, _ = _timed_full_collection()
+    
+    return {
+        'timestamp': time.time(),
+        'frozen_objects': frozen_objects,
+        'collected_before_freeze': collected,
+        'full_gc_pause_before': pause_before,
+        'full_gc_pause_after': pause_after,
+        'thresholds': gc.get_threshold()
+    }
 
 
 @dataclass
@@ -47,12 +137,20 @@ class GarbageCollectionMonitor:
         self._max_snapshots = max_snapshots
         self._enable_gc_callbacks = enable_gc_callbacks
         
-        # GC statistics
-        self._gc_stats: List[GCStats] = []
-        self._gc_stats_lock = threading.Lock()
+        # GC statistics (ring buffer of the last 100 collections)
+        self._gc_stats = TimeSeriesBuffer(100, {
+            'generation': np.int8,
+            'collected_objects': np.int64,
+            'uncollectable_objects': np.int64,
+            'gc_duration': np.float64,
+            'memory_before': np.int64,
+            'memory_after': np.int64,
+            'memory_freed': np.int64,
+            'top_allocations': object
+        })
         
         # Memory snapshots
-        self._snapshots: List[Dict[str, Any]] = []
+        self._snapshots: deque = deque(maxlen=max_snapshots)
         self._snapshots_lock = threading.Lock()
         
         # Thread for taking snapshots
@@ -63,6 +161,10 @@ class GarbageCollectionMonitor:
         # Original GC callbacks
         self._original_gc_callbacks: List[Callable] = []
         
+        # State carried from the 'start' to the 'stop' phase of a collection
+        self._gc_start_time: Optional[float] = None
+        self._gc_memory_before: Optional[int] = None
+        
         # Logging limiter
         self._last_log_time = 0.0
         self._log_interval = 2.0  # seconds
@@ -73,7 +175,13 @@ class GarbageCollectionMonitor:
             'total_objects_collected': 0,
             'total_memory_freed': 0,
             'avg_gc_duration': 0.0,
-            'last_gc_time': 0.0
+            'last_gc_time': 0.0,
+            'pauses_by_generation': {
+                gen: {'count': 0, 'total_duration': 0.0, 'max_duration': 0.0}
+                for gen in range(3)
+            },
+            'gc_thresholds': gc.get_threshold(),
+            'gc_freeze': None
         }
         self._stats_lock = threading.Lock()
         
@@ -164,10 +272,6 @@ class GarbageCollectionMonitor:
             # Add to snapshots
             with self._snapshots_lock:
                 self._snapshots.append(snapshot_data)
-                
-                # Limit snapshots
-                if len(self._snapshots) > self._max_snapshots:
-                    self._snapshots.pop(0)
             
             self._logger.debug(f"Memory snapshot taken: {snapshot_data['total_size']} bytes")
             
@@ -208,19 +312,24 @@ class GarbageCollectionMonitor:
             info: GC information dictionary
         """
         if phase == 'start':
-            # Record start time and memory
-            info['start_time'] = time.time()
+            # Record start time and memory. The interpreter passes a fresh info
+            # dict to every phase, so the values are kept on the instance
+            # (collections never nest).
+            self._gc_start_time = time.perf_counter()
             
             if self._enable_tracemalloc:
-                info['memory_before'] = tracemalloc.get_traced_memory()[0]
+                self._gc_memory_before = tracemalloc.get_traced_memory()[0]
             else:
                 import psutil
                 process = psutil.Process()
-                info['memory_before'] = process.memory_info().rss
+                self._gc_memory_before = process.memory_info().rss
         
         elif phase == 'stop':
             # Calculate duration and memory freed
-            duration = time.time() - info.get('start_time', 0)
+            if self._gc_start_time is None:
+                return
+            duration = time.perf_counter() - self._gc_start_time
+            self._gc_start_time = None
             
             if self._enable_tracemalloc:
                 memory_after = tracemalloc.get_traced_memory()[0]
@@ -229,7 +338,7 @@ class GarbageCollectionMonitor:
                 process = psutil.Process()
                 memory_after = process.memory_info().rss
             
-            memory_before = info.get('memory_before', memory_after)
+            memory_before = self._gc_memory_before if self._gc_memory_before is not None else memory_after
             memory_freed = max(0, memory_before - memory_after)
             
             # Get generation
@@ -266,12 +375,17 @@ class GarbageCollectionMonitor:
                     self._logger.error(f"Error getting top allocations: {e}")
             
             # Add to GC stats
-            with self._gc_stats_lock:
-                self._gc_stats.append(gc_stats)
-                
-                # Limit GC stats
-                if len(self._gc_stats) > 100:  # Keep last 100 GC stats
-                    self._gc_stats.pop(0)
+            self._gc_stats.append(
+                timestamp=gc_stats.timestamp,
+                generation=gc_stats.generation,
+                collected_objects=gc_stats.collected_objects,
+                uncollectable_objects=gc_stats.uncollectable_objects,
+                gc_duration=gc_stats.gc_duration,
+                memory_before=gc_stats.memory_before,
+                memory_after=gc_stats.memory_after,
+                memory_freed=gc_stats.memory_freed,
+                top_allocations=gc_stats.top_allocations
+            )
             
             # Update statistics
             with self._stats_lock:
@@ -286,6 +400,12 @@ class GarbageCollectionMonitor:
                                      gc_stats.gc_duration)
                     self._stats['avg_gc_duration'] = total_duration / self._stats['total_gc_calls']
                 
+                pauses = self._stats['pauses_by_generation'].get(generation)
+                if pauses is not None:
+                    pauses['count'] += 1
+                    pauses['total_duration'] += gc_stats.gc_duration
+                    pauses['max_duration'] = max(pauses['max_duration'], gc_stats.gc_duration)
+                
                 self._stats['last_gc_time'] = gc_stats.timestamp
             
             # Log GC event
@@ -325,11 +445,19 @@ class GarbageCollectionMonitor:
         Returns:
             List of GCStats
         """
-        with self._gc_stats_lock:
-            if max_items is None:
-                return self._gc_stats.copy()
-            else:
-                return self._gc_stats[-max_items:]
+        return [GCStats(**record) for record in self._gc_stats.records(max_items)]
+    
+    def get_pause_summary(self, window: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get percentile summary of recent GC pause durations.
+        
+        Args:
+            window: Only use collections from the last N seconds (None for all)
+            
+        Returns:
+            Dictionary with count, min, max, mean, p50, p95 and p99 (seconds)
+        """
+        return self._gc_stats.summary('gc_duration', window)
     
     def get_snapshots(self, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -342,10 +470,11 @@ class GarbageCollectionMonitor:
             List of memory snapshots
         """
         with self._snapshots_lock:
-            if max_items is None:
-                return self._snapshots.copy()
-            else:
-                return self._snapshots[-max_items:]
+            snapshots = list(self._snapshots)
+        
+        if max_items is None:
+            return snapshots
+        return snapshots[-max_items:]
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -356,9 +485,13 @@ class GarbageCollectionMonitor:
         """
         with self._stats_lock:
             stats = self._stats.copy()
+            stats['pauses_by_generation'] = {
+                gen: dict(pauses) for gen, pauses in self._stats['pauses_by_generation'].items()
+            }
         
         # Add current GC counts
         stats['current_gc_counts'] = gc.get_count()
+        stats['frozen_object_count'] = gc.get_freeze_count()
         
         # Add current object count
         stats['current_object_count'] = len(gc.get_objects())
@@ -454,7 +587,7 @@ class GarbageCollectionMonitor:
         
         try:
             # Get recent snapshots
-            recent_snapshots = self._snapshots[-min_snapshots:]
+            recent_snapshots = self.get_snapshots(min_snapshots)
             
             # Check for consistent growth
             potential_leaks = []
@@ -526,12 +659,54 @@ class GarbageCollectionMonitor:
             f"Force GC Gen {generation} completed: {gen_collected} objects collected"
         )
     
+    def apply_gc_tuning(self,
+                        profile: str = 'default',
+                        thresholds: Optional[Sequence[int]] = None) -> Tuple[int, int, int]:
+        """
+        Apply generational GC thresholds.
+        
+        Args:
+            profile: Name of a profile in GC_TUNING_PROFILES
+            thresholds: Explicit (gen0, gen1, gen2) thresholds, overrides profile
+            
+        Returns:
+            Tuple of thresholds that were applied
+        """
+        old_thresholds = gc.get_threshold()
+        new_thresholds = apply_gc_thresholds(profile, thresholds)
+        
+        with self._stats_lock:
+            self._stats['gc_thresholds'] = new_thresholds
+        
+        self._logger.info(
+            f"GC thresholds set to {new_thresholds} (profile: {profile}, was: {old_thresholds})"
+        )
+        return new_thresholds
+    
+    def freeze_after_warmup(self) -> Dict[str, Any]:
+        """
+        Freeze all long-lived startup objects and report the pause reduction.
+        
+        Returns:
+            Dictionary with pause timings and frozen object count
+        """
+        result = freeze_long_lived_objects()
+        
+        with self._stats_lock:
+            self._stats['gc_freeze'] = result
+        
+        self._logger.info(
+            f"GC freeze: {result['frozen_objects']} objects moved to permanent generation, "
+            f"full GC pause {result['full_gc_pause_before'] * 1000:.2f}ms -> "
+            f"{result['full_gc_pause_after'] * 1000:.2f}ms"
+        )
+        return result
+    
     def clear_history(self) -> None:
         """
         Clear GC stats and snapshots history.
         """
-        with self._gc_stats_lock:
-            self._gc_stats.clear()
+        self._gc_stats.clear()
         
         with self._snapshots_lock:
             self._snapshots.clear()
@@ -0,0 +1,150 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import grpc
+
+MB = 1024 * 1024
+
+# Setting name -> (gRPC channel argument, type, minimum, maximum, scale)
+# Sizes are configured in MB, times in ms. None = not a channel argument.
+SETTINGS = {
+    'max_receive_message_mb': ('grpc.max_receive_message_length', int, 1, 1024, MB),
+    'max_send_message_mb': ('grpc.max_send_message_length', int, 1, 1024, MB),
+    'max_concurrent_streams': ('grpc.max_concurrent_streams', int, 1, 10000, 1),
+    'keepalive_time_ms': ('grpc.keepalive_time_ms', int, 1000, 24 * 3600 * 1000, 1),
+    'keepalive_timeout_ms': ('grpc.keepalive_timeout_ms', int, 100, 600 * 1000, 1),
+    'keepalive_permit_without_calls': ('grpc.keepalive_permit_without_calls', bool, None, None, 1),
+    'min_ping_interval_without_data_ms': (
+        'grpc.http2.min_ping_interval_without_data_ms', int, 1000, 24 * 3600 * 1000, 1
+    ),
+    'max_ping_strikes': ('grpc.http2.max_ping_strikes', int, 0, 100, 1),
+    'max_connection_idle_ms': ('grpc.max_connection_idle_ms', int, 1000, None, 1),
+    'max_connection_age_ms': ('grpc.max_connection_age_ms', int, 1000, None, 1),
+    'max_connection_age_grace_ms': ('grpc.max_connection_age_grace_ms', int, 0, None, 1),
+    'write_buffer_kb': ('grpc.http2.write_buffer_size', int, 0, 64 * 1024, 1024),
+    'maximum_concurrent_rpcs': (None, int, 1, 100000, 1),
+    'compression': (None, str, None, None, 1),
+}
+
+COMPRESSION = {
+    'none': grpc.Compression.NoCompression,
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+}
+
+PRESETS: Dict[str, Dict[str, Any]] = {
+    # gRPC library defaults (4MB receive limit, no keepalive, unbounded queue)
+    'default': {},
+    # Go gateway on the same LAN/host: few long-lived connections, frames up
+    # to 1080p PNG/raw RGB, keepalive so dead connections are noticed, and a
+    # bounded RPC queue so overload fails fast instead of stalling
+    'lan_gateway': {
+        'max_receive_message_mb': 16,
+        'max_send_message_mb': 16,
+        'max_concurrent_streams': 100,
+        'keepalive_time_ms': 30000,
+        'keepalive_timeout_ms': 10000,
+        'keepalive_permit_without_calls': True,
+        'min_ping_interval_without_data_ms': 10000,
+        'max_ping_strikes': 0,
+        'maximum_concurrent_rpcs': 64,
+        'compression': 'none',
+    },
+    # ProcessBatchFrames with many large frames per request: big messages,
+    # few concurrent streams, longer keepalive timeout for slow transfers
+    'large_batch': {
+        'max_receive_message_mb': 128,
+        'max_send_message_mb': 64,
+        'max_concurrent_streams': 16,
+        'keepalive_time_ms': 60000,
+        'keepalive_timeout_ms': 20000,
+        'keepalive_permit_without_calls': True,
+        'min_ping_interval_without_data_ms': 10000,
+        'max_ping_strikes': 0,
+        'write_buffer_kb': 1024,
+        'maximum_concurrent_rpcs': 16,
+        'compression': 'none',
+    },
+}
+
+
+@dataclass
+class ServerTransportOptions:
+    """Data class untuk opsi transport server gRPC (preset + override dari config)."""
+    preset: str
+    settings: Dict[str, Any]
+    channel_options: List[Tuple[str, Any]] = field(default_factory=list)
+    maximum_concurrent_rpcs: Optional[int] = None
+    compression: Optional[grpc.Compression] = None
+
+
+def _validate(name: str, value: Any) -> Any:
+    if name not in SETTINGS:
+        raise ValueError(f"Unknown grpc.server_options setting: {name}")
+    _, kind, minimum, maximum, _ = SETTINGS[name]
+    if kind is bool:
+        if not isinstance(value, bool):
+            raise ValueError(f"grpc.server_options.{name} must be true/false, got {value!r}")
+        return value
+    if kind is str:
+        if name == 'compression' and value not in COMPRESSION:
+            raise ValueError(f"grpc.server_options.compression must be one of {list(COMPRESSION)}, got {value!r}")
+        return value
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or int(value) != value:
+        raise ValueError(f"grpc.server_options.{name} must be an integer, got {value!r}")
+    value = int(value)
+    if minimum is not None and value < minimum or maximum is not None and value > maximum:
+        raise ValueError(f"grpc.server_options.{name}={value} outside [{minimum}, {maximum}]")
+    return value
+
+
+def resolve_server_options(section: Optional[Dict[str, Any]]) -> ServerTransportOptions:
+    """
+    Build gRPC server arguments from the grpc.server_options config section.
+    
+    The section names a preset ('default', 'lan_gateway', 'large_batch')
+    and may override any of its settings; 'channel_args' passes extra raw
+    gRPC channel arguments through unchanged.
+    
+    Args:
+        section: grpc.server_options config dictionary (None = 'default' preset)
+    
+    Returns:
+        ServerTransportOptions for grpc.server(...)
+    
+    Raises:
+        ValueError: Unknown preset or setting, or a value out of range
+    """
+    section = dict(section or {})
+    preset = section.pop('preset', 'default')
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown grpc.server_options preset: {preset} (available: {list(PRESETS)})")
+    raw_args = section.pop('channel_args', {}) or {}
+    
+    settings = dict(PRESETS[preset])
+    settings.update({name: value for name, value in section.items() if value is not None})
+    settings = {name: _validate(name, value) for name, value in settings.items()}
+    
+    # Keepalive pings must be answered before the next one is due, and the
+    # server has to accept the pings it would otherwise punish as abuse
+    keepalive_time = settings.get('keepalive_time_ms')
+    keepalive_timeout = settings.get('keepalive_timeout_ms')
+    if keepalive_time and keepalive_timeout and keepalive_timeout >= keepalive_time:
+        raise ValueError("grpc.server_options.keepalive_timeout_ms must be below keepalive_time_ms")
+    min_ping = settings.get('min_ping_interval_without_data_ms')
+    if keepalive_time and min_ping and min_ping > keepalive_time:
+        raise ValueError(
+            "grpc.server_options.min_ping_interval_without_data_ms must not exceed keepalive_time_ms"
+        )
+    
+    options = ServerTransportOptions(preset=preset, settings=settings)
+    for name, value in settings.items():
+        channel_arg, kind, _, _, scale = SETTINGS[name]
+        if channel_arg is not None:
+            options.channel_options.append((channel_arg, int(value) if kind is bool else value * scale))
+    for channel_arg, value in raw_args.items():
+        options.channel_options.append((channel_arg, value))
+    options.maximum_concurrent_rpcs = settings.get('maximum_concurrent_rpcs')
+    if 'compression' in settings:
+        options.compression = COMPRESSION[settings['compression']]
+    return options
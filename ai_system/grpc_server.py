@@ -3,20 +3,15 @@ import time
 import numpy as np
 import cv2
 import grpc
+import gc
+import threading
+import tracemalloc
 from concurrent import futures
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 from PIL import Image
 import io
-
-# TurboJPEG support (optional, falls back to OpenCV if not available)
-try:
-    from turbojpeg import TurboJPEG, TJPF_BGR
-    TURBOJPEG_AVAILABLE = True
-    _turbojpeg_instance: Optional[TurboJPEG] = None
-except ImportError:
-    TURBOJPEG_AVAILABLE = False
-    _turbojpeg_instance = None
+import queue
 
 # Import generated protobuf classes
 import sys
@@ -30,7 +25,7 @@ try:
     from ai_service_pb2 import (
         FrameRequest, FrameResponse, BatchFrameRequest,
         BatchFrameResponse, ModelInfoResponse, ServerStatsResponse,
-        Empty, BBox, Detection, AIResults
+        Empty, BBox, Detection, DetectionColumns, AIResults
     )
     from ai_service_pb2_grpc import AIServiceServicer, add_AIServiceServicer_to_server
 except ImportError as e:
@@ -110,9 +105,17 @@ except ImportError as e:
             self.confidence = 0.0
             self.bbox = BBox()
     
+    class DetectionColumns:
+        def __init__(self):
+            self.boxes = []
+            self.confidences = []
+            self.class_index = []
+            self.class_names = []
+    
     class AIResults:
         def __init__(self):
             self.detections = []
+            self.columns = DetectionColumns()
     
     class AIServiceServicer:
         pass
@@ -122,47 +125,19 @@ except ImportError as e:
 
 from .frame_processor import FrameProcessor
 from .memory_manager import MemoryManager
-
-
-def _get_turbojpeg() -> Optional['TurboJPEG']:
-    """
-    Get or create TurboJPEG instance (singleton pattern).
-    Supports portable loading from local 'libs' directory.
-    """
-    global _turbojpeg_instance
-    if TURBOJPEG_AVAILABLE and _turbojpeg_instance is None:
-        try:
-            # 1. Try to find DLL in local 'libs' folder (Portable Mode)
-            # This allows copying the project to another machine without installing libjpeg-turbo
-            base_path = Path(__file__).parent.parent  # Serv_ScaI root
-            local_dll_paths = [
-                base_path / "tool" / "libjpeg-turbo64" / "bin" / "turbojpeg.dll",       # Windows
-                base_path / "tool" / "libjpeg-turbo64" / "lib" / "libturbojpeg.so",     # Linux (Portable)
-                base_path / "tool" / "libjpeg-turbo64" / "lib64" / "libturbojpeg.so",   # Linux (Portable 64-bit)
-                base_path / "tool" / "libjpeg-turbo64" / "lib" / "libturbojpeg.dylib",  # macOS
-            ]
-            
-            dll_path = None
-            for path in local_dll_paths:
-                if path.exists():
-                    dll_path = str(path)
-                    logging.info(f"Checking local TurboJPEG: Found at {dll_path}")
-                    break
-            
-            if dll_path:
-                # Portable mode: Load specific DLL
-                logging.info(f"Initializing TurboJPEG in PORTABLE mode from: {dll_path}")
-                _turbojpeg_instance = TurboJPEG(lib_path=dll_path)
-            else:
-                # System mode: Let PyTurboJPEG find it automatically
-                logging.info("Initializing TurboJPEG in SYSTEM mode (global install)")
-                _turbojpeg_instance = TurboJPEG()
-                
-        except Exception as e:
-            logging.warning(f"Failed to initialize TurboJPEG: {e}")
-            logging.warning("System will fallback to OpenCV for decoding.")
-            
-    return _turbojpeg_instance
+from .gc_monitor import apply_gc_thresholds, freeze_long_lived_objects
+from .memory_monitor import MemoryAlertLevel
+from .memory_pressure_policy import MemoryPressurePolicy, DegradationAction
+from .metrics import get_registry, install_process_metrics, MetricsServer
+from .frame_decoder import FrameDecoder
+from .model_registry import ModelRegistry, DEFAULT_VARIANT
+from .detection_batch import DetectionBatch
+from .shm_ring import SharedFrameRing
+from .grpc_options import resolve_server_options
+from .thread_pool import TaskPriority
+from .cpu_executor import CpuExecutor, split_cores
+from .frame_pipeline import FramePipeline, DEFAULT_STAGES
+from .roi_tracker import RoiWindow
 
 
 class AIService(AIServiceServicer):
@@ -186,13 +161,77 @@ class AIService(AIServiceServicer):
         self._max_workers = config_manager.get('grpc.max_workers', 10)
         pool_size = config_manager.get('model.pool_size', 5)
         
-        # Decoder configuration
-        self._use_turbojpeg = config_manager.get('decoder.use_turbojpeg', True)
-        self._fallback_to_opencv = config_manager.get('decoder.fallback_to_opencv', True)
+        # Frame decoder (format sniffing + per-format decoders)
+        self._frame_decoder = FrameDecoder(config_manager)
         
         # Direct inference mode (no double pooling)
         self._direct_inference = config_manager.get('grpc.direct_inference', True)
         
+        # Degradation knobs driven by the memory pressure policy
+        self._inflight_limit: Optional[int] = None  # None = unlimited
+        self._inflight_count = 0
+        self._inflight_lock = threading.Lock()
+        
+        # Metrics (children cached so the hot path skips label lookups)
+        registry = get_registry()
+        install_process_metrics(registry)
+        frames_total = registry.counter('ai_frames_total', 'Frames handled by ProcessFrame', ['status'])
+        self._frames_success = frames_total.labels('success')
+        self._frames_error = frames_total.labels('error')
+        self._frames_rejected = frames_total.labels('rejected')
+        self._detections_total = registry.counter('ai_detections_total', 'Detections returned to clients').labels()
+        stage_seconds = registry.histogram(
+            'ai_stage_duration_seconds', 'Frame processing stage latency', ['stage']
+        )
+        self._decode_seconds = stage_seconds.labels('decode')
+        self._total_seconds = stage_seconds.labels('total')
+        self._yuv_direct_frames = registry.counter(
+            'ai_decode_total', 'Frames decoded by decode path', ['path']
+        ).labels('yuv420_direct')
+        registry.gauge('ai_inflight_frames', 'Frames currently being processed').set_function(
+            lambda: self._inflight_count
+        )
+        registry.gauge('ai_decode_scale', 'JPEG decode downscale denominator').set_function(
+            lambda: self._frame_decoder.decode_scale
+        )
+        transport_frames = registry.counter(
+            'ai_frame_transport_total', 'Frames received per payload transport', ['transport']
+        )
+        self._inline_frames = transport_frames.labels('inline')
+        self._shm_frames = transport_frames.labels('shm')
+        self._class_seconds = registry.histogram(
+            'ai_request_class_duration_seconds', 'ProcessFrame latency per request class', ['request_class']
+        )
+        self._class_seconds_children: Dict[str, Any] = {}
+        
+        # Shared memory frame ring for a gateway on the same host (only slot indexes go over gRPC)
+        self._frame_ring: Optional[SharedFrameRing] = None
+        shm_config = config_manager.get('grpc.shared_memory', {}) or {}
+        if shm_config.get('enabled', False):
+            try:
+                self._frame_ring = SharedFrameRing.create(
+                    shm_config.get('name', 'ai_system_frames'),
+                    slots=int(shm_config.get('slots', 8)),
+                    slot_bytes=int(shm_config.get('slot_bytes', 4 * 1024 * 1024))
+                )
+                self._logger.info(
+                    f"Shared memory frame ring: {self._frame_ring.name} "
+                    f"({self._frame_ring.slots} x {self._frame_ring.slot_bytes // 1024}KB)"
+                )
+            except Exception as e:
+                self._logger.error(f"Shared memory frame ring unavailable: {e}")
+        
+        # Dedicated, core-pinned threads for decode/preprocess (None = run on the gRPC thread)
+        self._cpu_executor: Optional[CpuExecutor] = None
+        executor_config = config_manager.get('cpu_executor', {}) or {}
+        if executor_config.get('enabled', False):
+            cores = split_cores(executor_config.get('cores'), config_manager.get('model.inference_cores'))
+            self._cpu_executor = CpuExecutor(cores, pin=executor_config.get('pin', True), name='image')
+            opencv_threads = executor_config.get('opencv_threads')
+            if opencv_threads is not None:
+                # Executor workers already parallelize across frames
+                cv2.setNumThreads(int(opencv_threads))
+        
         # Memory monitoring
         enable_memory_monitoring = config_manager.get('memory.enable_monitoring', True)
         
@@ -207,6 +246,23 @@ class AIService(AIServiceServicer):
             pool_size=pool_size
         )
         
+        # Model variants (default = the processor above) and per-request selection
+        self._model_registry = ModelRegistry(config_manager, self._frame_processor)
+        
+        # Request classes (metadata) -> priority lanes for model pool slots
+        self._priority_config: Dict[str, Any] = {}
+        self._request_classes: Dict[str, TaskPriority] = {}
+        self._apply_priority_policy(config_manager.get('grpc.priority', {}) or {})
+        
+        # Session id metadata: per-session pipeline limit and ROI tracking (model.roi)
+        self._session_key = config_manager.get('grpc.session_metadata_key', 'x-session-id')
+        
+        # Staged decode -> infer -> postprocess pipeline (None = whole frame on the gRPC thread)
+        self._frame_pipeline: Optional[FramePipeline] = None
+        pipeline_config = config_manager.get('pipeline', {}) or {}
+        if pipeline_config.get('enabled', False):
+            self._frame_pipeline = self._create_frame_pipeline(pipeline_config)
+        
         # Initialize memory manager
         self._memory_manager = None
         if enable_memory_monitoring:
@@ -226,9 +282,19 @@ class AIService(AIServiceServicer):
             # Register buffer pool with memory manager
             if hasattr(self._frame_processor, '_buffer_pool') and self._frame_processor._buffer_pool:
                 self._memory_manager.register_buffer_pool("frame_processor", self._frame_processor._buffer_pool)
+            
+            self._register_variant_pools()
+        
+        # Degrade gracefully instead of getting OOM-killed under memory pressure
+        self._pressure_policy: Optional[MemoryPressurePolicy] = None
+        if self._memory_manager and config_manager.get('memory.pressure_policy.enabled', False):
+            self._pressure_policy = self._create_pressure_policy()
+        
+        # Warm the model pool and take long-lived startup objects out of GC scans
+        self._apply_startup_gc_tuning()
         
         # Log initialization info
-        decoder_info = "TurboJPEG" if (self._use_turbojpeg and TURBOJPEG_AVAILABLE) else "OpenCV"
+        decoder_info = "TurboJPEG" if self._frame_decoder.turbojpeg_enabled else "OpenCV"
         inference_mode = "Direct (no thread pool)" if self._direct_inference else "Thread Pool"
         self._logger.info(f"AIService initialized - Model: {self._model_path}")
         self._logger.info(f"Decoder: {decoder_info}, Inference: {inference_mode}")
@@ -236,6 +302,273 @@ class AIService(AIServiceServicer):
         # Register callback for configuration changes
         config_manager.add_config_change_callback(self._on_config_changed)
     
+    def _default_infer_threads(self) -> int:
+        """
+        Infer stage threads when pipeline.stages.infer.threads is not set.
+        
+        One thread per model instance of every registry variant (the stage
+        serves all of them), plus each pool's grpc.priority reserved_slots:
+        a lower priority frame holds its infer thread while it waits for a
+        slot it may not use, and without the extra threads a higher priority
+        frame would wait in the infer queue while the reserved model is idle.
+        Sized at startup; a later grpc.priority reload does not resize it.
+        
+        Returns:
+            Number of infer threads
+        """
+        reserved = sum(int(slots) for slots in (self._priority_config.get('reserved_slots') or {}).values())
+        threads = 0
+        for name in self._model_registry.variant_names():
+            pool_stats = self._model_registry.get_variant(name).processor.get_pool_stats()
+            threads += pool_stats['max_size'] + reserved
+        return max(1, threads)
+    
+    def _create_frame_pipeline(self, pipeline_config: Dict[str, Any]) -> FramePipeline:
+        """
+        Build the staged frame pipeline from the pipeline config section.
+        
+        Args:
+            pipeline_config: pipeline config dictionary
+            
+        Returns:
+            FramePipeline with prepare, infer and postprocess stages
+        """
+        stage_config = pipeline_config.get('stages', {}) or {}
+        stages = []
+        for name in DEFAULT_STAGES:
+            config = stage_config.get(name, {}) or {}
+            threads = int(config.get('threads', 0) or 0)
+            if threads <= 0:
+                # More infer threads than model instances would only wait on the pool
+                threads = self._default_infer_threads() if name == 'infer' else 1
+            stages.append({'name': name, 'threads': threads, 'queue_depth': config.get('queue_depth', 8)})
+        
+        submit_timeout_ms = pipeline_config.get('submit_timeout_ms', 1000)
+        return FramePipeline(
+            stages,
+            max_inflight_per_session=pipeline_config.get('max_inflight_per_session', 2),
+            submit_timeout=None if submit_timeout_ms is None else submit_timeout_ms / 1000.0,
+            name='frame'
+        )
+    
+    def _register_variant_pools(self) -> None:
+        """Register the model pools of non-default variants with the memory manager."""
+        for name in self._model_registry.variant_names():
+            if name != DEFAULT_VARIANT:
+                variant = self._model_registry.get_variant(name)
+                self._memory_manager.register_object_pool(f"model_{name}", variant.processor._model_pool)
+    
+    def _apply_priority_policy(self, priority_config: Dict[str, Any]) -> None:
+        """
+        Configure priority lanes from the grpc.priority config section.
+        
+        Each request class (named in request metadata) maps to a
+        TaskPriority; the model pools of all variants then hand freed
+        model instances to waiting requests by priority ('strict' or
+        'weighted') and keep reserved_slots out of reach of lower classes.
+        
+        Args:
+            priority_config: grpc.priority config dictionary
+        """
+        enabled = priority_config.get('enabled', False)
+        classes = {
+            name: TaskPriority[str(level).upper()]
+            for name, level in (priority_config.get('classes') or {}).items()
+        }
+        weights = {
+            TaskPriority[str(level).upper()]: float(weight)
+            for level, weight in (priority_config.get('weights') or {}).items()
+        }
+        reserved = {
+            TaskPriority[str(level).upper()]: int(slots)
+            for level, slots in (priority_config.get('reserved_slots') or {}).items()
+        }
+        policy = priority_config.get('policy', 'strict') if enabled else None
+        
+        for name in self._model_registry.variant_names():
+            pool = self._model_registry.get_variant(name).processor._model_pool
+            pool.set_priority_policy(policy, weights, reserved)
+        
+        self._priority_config = priority_config if enabled else {}
+        self._request_classes = classes if enabled else {}
+        if enabled:
+            lanes = ', '.join(f"{name}={level.name}" for name, level in classes.items())
+            self._logger.info(f"Priority lanes ({policy}): {lanes}")
+    
+    def _request_priority(self, metadata: Dict[str, str], default_class: Optional[str] = None) -> Tuple[str, TaskPriority]:
+        """
+        Request class and priority of a request.
+        
+        Args:
+            metadata: Invocation metadata
+            default_class: Class when the client sends none (default: grpc.priority.default_class)
+            
+        Returns:
+            Tuple (class name, TaskPriority); unknown classes get the default class
+        """
+        if not self._request_classes:
+            return 'default', TaskPriority.MEDIUM
+        config = self._priority_config
+        default_class = default_class or config.get('default_class', 'standard')
+        request_class = metadata.get(config.get('metadata_key', 'x-request-class'), default_class)
+        if request_class not in self._request_classes:
+            request_class = default_class
+        return request_class, self._request_classes.get(request_class, TaskPriority.MEDIUM)
+    
+    def _observe_class_latency(self, request_class: str, seconds: float) -> None:
+        child = self._class_seconds_children.get(request_class)
+        if child is None:
+            child = self._class_seconds_children[request_class] = self._class_seconds.labels(request_class)
+        child.observe(seconds)
+    
+    @staticmethod
+    def _get_metadata(context) -> Dict[str, str]:
+        """Invocation metadata as a dict (empty when called without a gRPC context)."""
+        if context is None:
+            return {}
+        return {key: value for key, value in context.invocation_metadata()}
+    
+    def _apply_startup_gc_tuning(self) -> None:
+        """
+        Startup phase: prewarm the model pool, apply GC thresholds and freeze the heap.
+        
+        Everything alive at this point (ONNX sessions, protobuf descriptors,
+        OpenCV/numpy modules) lives for the whole process, so it is moved to
+        the permanent generation and skipped by every later full collection.
+        """
+        gc_tuning = self._config_manager.get('memory.gc_tuning', {}) or {}
+        profile = gc_tuning.get('profile', 'default')
+        thresholds = gc_tuning.get('thresholds')
+        
+        if gc_tuning.get('prewarm_pool', False):
+            start = time.time()
+            created = self._model_registry.prewarm()
+            self._logger.info(f"Model pool prewarmed: {created} instances in {time.time() - start:.2f}s")
+        
+        if self._memory_manager:
+            self._memory_manager.apply_gc_tuning(profile, thresholds)
+        else:
+            applied = apply_gc_thresholds(profile, thresholds)
+            self._logger.info(f"GC thresholds set to {applied} (profile: {profile})")
+        
+        if gc_tuning.get('freeze_after_warmup', False):
+            if self._memory_manager:
+                self._memory_manager.freeze_after_warmup()
+            else:
+                result = freeze_long_lived_objects()
+                self._logger.info(
+                    f"GC freeze: {result['frozen_objects']} objects frozen, full GC pause "
+                    f"{result['full_gc_pause_before'] * 1000:.2f}ms -> "
+                    f"{result['full_gc_pause_after'] * 1000:.2f}ms"
+                )
+    
+    def _create_pressure_policy(self) -> MemoryPressurePolicy:
+        """
+        Build the memory pressure policy with the server's degradation actions.
+        
+        WARNING drops caches and lowers the JPEG decode scale (frames are
+        resized to the model input anyway); CRITICAL additionally shrinks the
+        model pools of all variants and caps in-flight frames. Everything
+        except the one-shot cache drop is restored once pressure clears.
+        
+        Returns:
+            MemoryPressurePolicy instance
+        """
+        policy_config = self._config_manager.get('memory.pressure_policy', {}) or {}
+        # Pool -> (normal size, size under pressure); pool_size caps every variant's pool
+        configured_size = policy_config.get('pool_size')
+        pool_sizes = {}
+        for name in self._model_registry.variant_names():
+            pool = self._model_registry.get_variant(name).processor._model_pool
+            normal_size = pool.get_max_size()
+            pressure_size = min(normal_size, configured_size) if configured_size else max(1, normal_size // 2)
+            pool_sizes[pool] = (normal_size, pressure_size)
+        pressure_pool_size = pool_sizes[self._frame_processor._model_pool][1]
+        max_inflight = policy_config.get('max_inflight_frames', pressure_pool_size * 2)
+        decode_scale = policy_config.get('decode_scale', 2)
+        
+        policy = MemoryPressurePolicy(
+            memory_monitor=self._memory_manager.get_memory_monitor(),
+            restore_after=policy_config.get('restore_after', 60.0)
+        )
+        policy.add_action(DegradationAction(
+            name='drop_caches',
+            level=MemoryAlertLevel.WARNING,
+            apply=self._drop_caches
+        ))
+        policy.add_action(DegradationAction(
+            name='reduce_decode_scale',
+            level=MemoryAlertLevel.WARNING,
+            apply=lambda: self.set_decode_scale(decode_scale),
+            restore=lambda: self.set_decode_scale(1)
+        ))
+        policy.add_action(DegradationAction(
+            name='shrink_model_pool',
+            level=MemoryAlertLevel.CRITICAL,
+            apply=lambda: self._resize_model_pools(pool_sizes, pressure=True),
+            restore=lambda: self._resize_model_pools(pool_sizes, pressure=False)
+        ))
+        policy.add_action(DegradationAction(
+            name='cap_inflight_frames',
+            level=MemoryAlertLevel.CRITICAL,
+            apply=lambda: self.set_inflight_limit(max_inflight),
+            restore=lambda: self.set_inflight_limit(None)
+        ))
+        return policy
+    
+    def _resize_model_pools(self, pool_sizes: Dict[Any, Tuple[int, int]], pressure: bool) -> None:
+        """
+        Set every model pool to its size under pressure, or back to its normal size.
+        
+        Args:
+            pool_sizes: ObjectPool -> (normal size, size under pressure)
+            pressure: True to shrink, False to restore
+        """
+        for pool, (normal_size, pressure_size) in pool_sizes.items():
+            pool.set_max_size(pressure_size if pressure else normal_size)
+    
+    def _drop_caches(self) -> None:
+        """Release memory held by monitoring history and tracemalloc, then collect."""
+        self._throttled_logs.clear()
+        if self._memory_manager:
+            self._memory_manager.clear_history()
+        if tracemalloc.is_tracing():
+            tracemalloc.clear_traces()
+        gc.collect()
+    
+    def set_decode_scale(self, scale: int) -> None:
+        """
+        Set the JPEG decode downscale denominator.
+        
+        Args:
+            scale: 1 (full size), 2, 4 or 8
+        """
+        self._frame_decoder.set_decode_scale(scale)
+    
+    def set_inflight_limit(self, limit: Optional[int]) -> None:
+        """
+        Cap the number of frames processed concurrently.
+        
+        Args:
+            limit: Maximum in-flight frames, or None for unlimited
+        """
+        with self._inflight_lock:
+            self._inflight_limit = limit
+        self._logger.info(f"In-flight frame limit set to {limit if limit is not None else 'unlimited'}")
+    
+    def _try_enter_inflight(self) -> bool:
+        """Reserve an in-flight slot; False if the current limit is reached."""
+        with self._inflight_lock:
+            if self._inflight_limit is not None and self._inflight_count >= self._inflight_limit:
+                return False
+            self._inflight_count += 1
+            return True
+    
+    def _exit_inflight(self) -> None:
+        """Release an in-flight slot."""
+        with self._inflight_lock:
+            self._inflight_count -= 1
+    
     def _log_throttled(self, key: str, level: int, message: str, *args, **kwargs):
         """Log a message only if the interval has passed for the given key."""
         now = time.time()
@@ -252,18 +585,6 @@ class AIService(AIServiceServicer):
             old_config: Old configuration
             new_config: New configuration
         """
-        # Check if decoder configuration changed
-        old_decoder = old_config.get('decoder', {})
-        new_decoder = new_config.get('decoder', {})
-        
-        if old_decoder.get('use_turbojpeg') != new_decoder.get('use_turbojpeg'):
-            self._use_turbojpeg = new_decoder.get('use_turbojpeg', True)
-            self._logger.info(f"Updated TurboJPEG setting: {self._use_turbojpeg}")
-        
-        if old_decoder.get('fallback_to_opencv') != new_decoder.get('fallback_to_opencv'):
-            self._fallback_to_opencv = new_decoder.get('fallback_to_opencv', True)
-            self._logger.info(f"Updated fallback_to_opencv setting: {self._fallback_to_opencv}")
-        
         # Check if memory monitoring configuration changed
         old_memory = old_config.get('memory', {})
         new_memory = new_config.get('memory', {})
@@ -288,6 +609,8 @@ class AIService(AIServiceServicer):
                 # Register buffer pool with memory manager
                 if hasattr(self._frame_processor, '_buffer_pool') and self._frame_processor._buffer_pool:
                     self._memory_manager.register_buffer_pool("frame_processor", self._frame_processor._buffer_pool)
+                
+                self._register_variant_pools()
             elif not enable_memory_monitoring and self._memory_manager:
                 self._logger.info("Disabling memory monitoring")
                 self._memory_manager.shutdown()
@@ -300,238 +623,126 @@ class AIService(AIServiceServicer):
                 warning_threshold = new_memory.get('warning_threshold', 70.0)
                 critical_threshold = new_memory.get('critical_threshold', 85.0)
                 self._memory_manager.set_memory_thresholds(warning_threshold, critical_threshold)
-    
-    def _decode_jpeg_turbojpeg(self, frame_data: bytes) -> Optional[np.ndarray]:
-        """
-        Decode JPEG using TurboJPEG (faster than OpenCV).
-        
-        Args:
-            frame_data: JPEG bytes
-            
-        Returns:
-            Decoded frame as BGR numpy array, or None if failed
-        """
-        if not self._use_turbojpeg or not TURBOJPEG_AVAILABLE:
-            return None
         
-        jpeg = _get_turbojpeg()
-        if jpeg is None:
-            return None
-        
-        try:
-            # Decode directly to BGR format (native OpenCV format)
-            frame = jpeg.decode(frame_data, pixel_format=TJPF_BGR)
-            return frame
-        except Exception as e:
-            self._logger.debug(f"TurboJPEG decode failed: {e}")
-            return None
+        # Priority lanes
+        old_priority = old_config.get('grpc', {}).get('priority', {})
+        new_priority = new_config.get('grpc', {}).get('priority', {})
+        if old_priority != new_priority:
+            try:
+                self._apply_priority_policy(new_priority or {})
+            except (KeyError, ValueError) as e:
+                self._logger.error(f"Invalid grpc.priority config, keeping previous lanes: {e}")
     
     def _bytes_to_numpy(self, frame_data: bytes, width: int, height: int, channels: int, format: str = 'auto') -> np.ndarray:
         """
-        Convert bytes to numpy array.
-        Supports: JPEG, PNG, YUV420, and raw RGB/BGR formats.
-        Uses TurboJPEG for faster JPEG decoding when available.
+        Convert bytes to numpy array via the frame decoder.
         
         Args:
             frame_data: Frame data as bytes
             width: Frame width (0 if unknown)
             height: Frame height (0 if unknown)
             channels: Number of channels
-            format: Frame format ('jpeg', 'yuv420', 'rgb', or 'auto' for auto-detection)
+            format: Frame format ('jpeg', 'png', 'webp', 'yuv420', 'rgb', ... or 'auto' to sniff)
             
         Returns:
             Frame as numpy array (BGR format for OpenCV)
         """
-        data_len = len(frame_data)
-        self._logger.debug(
-            f"[DECODE] Input: format={format}, bytes={data_len}, dims={width}x{height}x{channels}"
-        )
+        return self._frame_decoder.decode(frame_data, width, height, channels, format)
+    
+    def _request_frame_data(self, request: FrameRequest) -> Union[bytes, memoryview]:
+        """
+        Get the frame payload, inline or from the shared memory ring.
         
-        # EXPLICIT FORMAT DECODING (when client specifies format)
-        if format and format != 'auto':
-            format_lower = format.lower()
-            
-            # JPEG format - try TurboJPEG first
-            if format_lower == 'jpeg':
-                # Try TurboJPEG first (faster)
-                frame = self._decode_jpeg_turbojpeg(frame_data)
-                if frame is not None:
-                    actual_h, actual_w = frame.shape[:2]
-                    self._logger.debug(f"[DECODE] ✅ TurboJPEG decoded: {actual_w}x{actual_h}")
-                    
-                    # Resize if target dimensions provided and differ
-                    if width > 0 and height > 0 and (actual_w != width or actual_h != height):
-                        self._logger.debug(f"[DECODE] Resizing {actual_w}x{actual_h} -> {width}x{height}")
-                        frame = cv2.resize(frame, (width, height))
-                    
-                    return frame
-                
-                # Fallback to OpenCV if TurboJPEG failed
-                if self._fallback_to_opencv:
-                    try:
-                        data_array = np.frombuffer(frame_data, dtype=np.uint8)
-                        frame = cv2.imdecode(data_array, cv2.IMREAD_COLOR)
-                        
-                        if frame is not None:
-                            actual_h, actual_w = frame.shape[:2]
-                            self._logger.debug(f"[DECODE] ✅ OpenCV JPEG decoded: {actual_w}x{actual_h}")
-                            
-                            # Resize if target dimensions provided and differ
-                            if width > 0 and height > 0 and (actual_w != width or actual_h != height):
-                                self._logger.debug(f"[DECODE] Resizing {actual_w}x{actual_h} -> {width}x{height}")
-                                frame = cv2.resize(frame, (width, height))
-                            
-                            return frame
-                        else:
-                            raise ValueError("JPEG decode returned None")
-                    except Exception as e:
-                        self._logger.error(f"[DECODE] ❌ OpenCV JPEG decode failed: {e}")
-                        raise
-                else:
-                    raise ValueError("TurboJPEG decode failed and fallback is disabled")
-            
-            # YUV420 format
-            elif format_lower == 'yuv420':
-                if width <= 0 or height <= 0:
-                    raise ValueError(f"YUV420 format requires valid dimensions, got {width}x{height}")
-                
-                expected_yuv_size = int(width * height * 1.5)
-                if data_len != expected_yuv_size:
-                    raise ValueError(
-                        f"YUV420 size mismatch: expected {expected_yuv_size} bytes, got {data_len}"
-                    )
-                
-                try:
-                    yuv_data = np.frombuffer(frame_data, dtype=np.uint8)
-                    yuv_frame = yuv_data.reshape((int(height * 1.5), width))
-                    frame = cv2.cvtColor(yuv_frame, cv2.COLOR_YUV2BGR_I420)
-                    self._logger.debug(f"[DECODE] ✅ YUV420 decoded: {width}x{height}")
-                    return frame
-                except Exception as e:
-                    self._logger.error(f"[DECODE] ❌ YUV420 decode failed: {e}")
-                    raise
-            
-            # Raw RGB format
-            elif format_lower == 'rgb':
-                if width <= 0 or height <= 0:
-                    raise ValueError(f"RGB format requires valid dimensions, got {width}x{height}")
-                
-                expected_rgb_size = int(width * height * channels)
-                if data_len != expected_rgb_size:
-                    raise ValueError(
-                        f"RGB size mismatch: expected {expected_rgb_size} bytes, got {data_len}"
-                    )
-                
-                try:
-                    frame = np.frombuffer(frame_data, dtype=np.uint8)
-                    if channels == 1:
-                        frame = frame.reshape((height, width))
-                    else:
-                        frame = frame.reshape((height, width, channels))
-                        # Convert RGB to BGR for OpenCV
-                        if channels == 3:
-                            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    
-                    self._logger.debug(f"[DECODE] ✅ RGB decoded: {width}x{height}x{channels}")
-                    return frame
-                except Exception as e:
-                    self._logger.error(f"[DECODE] ❌ RGB decode failed: {e}")
-                    raise
+        Args:
+            request: FrameRequest
             
-            else:
-                self._logger.warning(f"[DECODE] Unknown format '{format}', falling back to auto-detection")
-        
-        # AUTO-DETECTION (fallback when format not specified or unknown)
-        self._logger.debug("[DECODE] Using auto-detection...")
+        Returns:
+            request.frame_data, or a zero-copy view of the shared memory slot
+            (valid until the response is sent)
+        """
+        if request.shm_length > 0:
+            if self._frame_ring is None:
+                raise ValueError("Frame sent via shared memory but grpc.shared_memory is not enabled")
+            self._shm_frames.inc()
+            return self._frame_ring.read(request.shm_slot, request.shm_length, request.shm_seq)
+        self._inline_frames.inc()
+        return request.frame_data
+    
+    def _prepare_input(self,
+                       processor: FrameProcessor,
+                       request: FrameRequest,
+                       frame_data: Union[bytes, memoryview],
+                       frame_format: str,
+                       session: Optional[str] = None) -> Tuple[np.ndarray, tuple, Optional[RoiWindow]]:
+        """
+        Decode a frame and build the model input.
         
-        # STRATEGY 1: Try TurboJPEG first (fastest for JPEG)
-        frame = self._decode_jpeg_turbojpeg(frame_data)
-        if frame is not None:
-            actual_h, actual_w = frame.shape[:2]
-            self._logger.debug(f"[DECODE] ✅ TurboJPEG auto-detected: {actual_w}x{actual_h}")
+        Args:
+            processor: FrameProcessor of the selected model variant
+            request: FrameRequest (dimensions)
+            frame_data: Frame payload
+            frame_format: Client format hint ('auto' = sniff)
+            session: Session id (ROI mode crops to the session's region)
             
-            # Resize if target dimensions provided and differ
-            if width > 0 and height > 0 and (actual_w != width or actual_h != height):
-                self._logger.debug(f"[DECODE] Resizing {actual_w}x{actual_h} -> {width}x{height}")
-                frame = cv2.resize(frame, (width, height))
+        Returns:
+            Tuple (model input, frame shape for bbox mapping, ROI window or None)
             
-            return frame
+        Raises:
+            ValueError: A shared memory slot was reused by the producer while it was decoded
+        """
+        yuv_layout = self._frame_decoder.direct_yuv_layout(frame_format)
+        if yuv_layout:
+            # Camera YUV420 (I420/NV12/NV21): planes go straight to the model input
+            self._yuv_direct_frames.inc()
+            prepared = processor.prepare_yuv420(frame_data, request.width, request.height, yuv_layout, session)
+        else:
+            # Convert bytes to numpy array (format sniffed from magic bytes if not given)
+            decode_start = time.perf_counter()
+            frame = self._bytes_to_numpy(
+                frame_data,
+                request.width,
+                request.height,
+                request.channels,
+                frame_format  # Pass format from client
+            )
+            self._decode_seconds.observe(time.perf_counter() - decode_start)
+            prepared = processor.prepare_frame(frame, session)
         
-        # STRATEGY 2: Try OpenCV JPEG/PNG decode
-        try:
-            data_array = np.frombuffer(frame_data, dtype=np.uint8)
-            frame = cv2.imdecode(data_array, cv2.IMREAD_COLOR)
-            
-            if frame is not None:
-                actual_h, actual_w = frame.shape[:2]
-                self._logger.debug(
-                    f"[DECODE] ✅ OpenCV JPEG/PNG auto-detected: {actual_w}x{actual_h}"
-                )
-                
-                # Resize if target dimensions provided and differ
-                if width > 0 and height > 0 and (actual_w != width or actual_h != height):
-                    self._logger.debug(f"[DECODE] Resizing {actual_w}x{actual_h} -> {width}x{height}")
-                    frame = cv2.resize(frame, (width, height))
-                
-                return frame
-        except Exception as e:
-            self._logger.debug(f"[DECODE] OpenCV JPEG/PNG auto-detect failed: {e}")
+        if request.shm_length > 0:
+            # Seqlock check: the model input must come from an unmodified slot
+            self._frame_ring.verify(request.shm_slot, request.shm_length, request.shm_seq)
+        return prepared
+    
+    def _prepare_step(self,
+                      processor: FrameProcessor,
+                      request: FrameRequest,
+                      frame_data: Union[bytes, memoryview],
+                      frame_format: str,
+                      session: Optional[str] = None) -> Tuple[np.ndarray, tuple, Optional[RoiWindow]]:
+        """Decode + preprocess, on the pinned image cores when the CPU executor is enabled."""
+        if self._cpu_executor:
+            return self._cpu_executor.call(
+                self._prepare_input, processor, request, frame_data, frame_format, session
+            )
+        return self._prepare_input(processor, request, frame_data, frame_format, session)
+    
+    def _pipeline_steps(self,
+                        processor: FrameProcessor,
+                        request: FrameRequest,
+                        frame_data: Union[bytes, memoryview],
+                        frame_format: str,
+                        priority: TaskPriority,
+                        session: Optional[str] = None) -> tuple:
+        """
+        One step per pipeline stage (prepare, infer, postprocess) for a frame.
         
-        # STRATEGY 3: Check for YUV420 format (size = w * h * 1.5)
-        # YUV420 requires exact dimensions to decode
-        if width > 0 and height > 0:
-            expected_yuv_size = int(width * height * 1.5)
-            expected_raw_size = int(width * height * channels)
-            
-            if data_len == expected_yuv_size:
-                self._logger.debug(f"[DECODE] ✅ YUV420 auto-detected: {width}x{height}")
-                try:
-                    yuv_data = np.frombuffer(frame_data, dtype=np.uint8)
-                    yuv_frame = yuv_data.reshape((int(height * 1.5), width))
-                    frame = cv2.cvtColor(yuv_frame, cv2.COLOR_YUV2BGR_I420)
-                    self._logger.debug(f"[DECODE] YUV->BGR: shape={frame.shape}")
-                    return frame
-                except Exception as e:
-                    self._logger.error(f"[DECODE] YUV420 auto-detect conversion failed: {e}")
-            
-            # STRATEGY 4: Raw RGB/BGR format
-            elif data_len == expected_raw_size:
-                self._logger.debug(f"[DECODE] ✅ Raw format auto-detected: {width}x{height}x{channels}")
-                frame = np.frombuffer(frame_data, dtype=np.uint8)
-                
-                if channels == 1:
-                    frame = frame.reshape((height, width))
-                else:
-                    frame = frame.reshape((height, width, channels))
-                
-                return frame
-        
-        # STRATEGY 5: Auto-detect YUV420 from data size (when dims unknown)
-        # Common resolutions: 640x360, 1280x720, 1920x1080
-        common_resolutions = [
-            (640, 360), (1280, 720), (1920, 1080),
-            (320, 240), (800, 600), (1024, 768)
-        ]
-        
-        for w, h in common_resolutions:
-            if data_len == int(w * h * 1.5):
-                self._logger.debug(f"[DECODE] ✅ YUV420 auto-detected by size: {w}x{h}")
-                try:
-                    yuv_data = np.frombuffer(frame_data, dtype=np.uint8)
-                    yuv_frame = yuv_data.reshape((int(h * 1.5), w))
-                    frame = cv2.cvtColor(yuv_frame, cv2.COLOR_YUV2BGR_I420)
-                    return frame
-                except Exception as e:
-                    self._logger.debug(f"[DECODE] YUV420 auto-detect failed for {w}x{h}: {e}")
-        
-        # ALL STRATEGIES FAILED
-        self._logger.error(
-            f"[DECODE] ❌ All decode strategies failed! "
-            f"format={format}, data_len={data_len}, dims={width}x{height}x{channels}"
-        )
-        raise ValueError(
-            f"Failed to decode frame: format={format}, {data_len} bytes, dims={width}x{height}x{channels}. "
-            f"Not JPEG/PNG, not YUV420, not raw RGB."
+        Returns:
+            Tuple of callables for FramePipeline.submit
+        """
+        return (
+            lambda: self._prepare_step(processor, request, frame_data, frame_format, session),
+            lambda prepared: (processor.infer(prepared[0], priority),) + prepared[1:],
+            lambda inferred: processor.postprocess(*inferred)
         )
     
     def ProcessFrame(self, request: FrameRequest, context) -> FrameResponse:
@@ -547,38 +758,68 @@ class AIService(AIServiceServicer):
         """
         start_time = time.time()
         
+        if not self._try_enter_inflight():
+            self._log_throttled(
+                "inflight_limit",
+                logging.WARNING,
+                f"[FRAME] Rejected: in-flight frame limit ({self._inflight_limit}) reached under memory pressure"
+            )
+            self._frames_rejected.inc()
+            response = FrameResponse()
+            response.success = False
+            response.message = "Server under memory pressure: in-flight frame limit reached"
+            response.processing_time_ms = (time.time() - start_time) * 1000
+            return response
+        
         try:
+            frame_data = self._request_frame_data(request)
+            
             # Update validation: Allow width/height=0 if data is present (auto-detect)
-            if len(request.frame_data) == 0:
+            if len(frame_data) == 0:
                  raise ValueError(f"Invalid frame data: empty")
             
-            if (request.width <= 0 or request.height <= 0) and len(request.frame_data) < 100:
+            if (request.width <= 0 or request.height <= 0) and len(frame_data) < 100:
                  # Simple heuristic: if dimensions are 0, data must be substantial (imagedata)
                  # 100 bytes is arbitrary small limit for a valid image file
-                 raise ValueError(f"Invalid frame: dimensions 0 and data too small ({len(request.frame_data)} bytes)")
+                 raise ValueError(f"Invalid frame: dimensions 0 and data too small ({len(frame_data)} bytes)")
 
             # Log frame metadata
-            frame_format = getattr(request, 'format', '') or 'auto'  # Default to 'auto' if not provided
+            frame_format = request.format or 'auto'  # '' = sniff from content
             self._logger.debug(
                 f"[FRAME] format={frame_format}, {request.width}x{request.height}, "
-                f"{len(request.frame_data)} bytes"
+                f"{len(frame_data)} bytes"
             )
             
-            # Convert bytes to numpy array (uses TurboJPEG if available)
-            frame = self._bytes_to_numpy(
-                request.frame_data,
-                request.width,
-                request.height,
-                request.channels,
-                frame_format  # Pass format from client
-            )
+            # Pick the model variant (client hint, or fallback to a faster model under load)
+            metadata = self._get_metadata(context)
+            variant = self._model_registry.select(metadata.get('x-model-variant'))
+            processor = variant.processor
+            request_class, priority = self._request_priority(metadata)
+            session = metadata.get(self._session_key)
             
-            # DIRECT INFERENCE - No thread pool handover
-            # This eliminates context switching overhead
-            result = self._frame_processor.process_frame(frame)
+            if self._frame_pipeline:
+                # Staged: this frame is decoded while earlier frames are still in the model
+                result = self._frame_pipeline.submit(
+                    self._pipeline_steps(processor, request, frame_data, frame_format, priority, session),
+                    session=session,
+                    priority=priority
+                ).result()
+            else:
+                # Decode + preprocess, then inference on this thread
+                processed_frame, original_shape, roi = self._prepare_step(
+                    processor, request, frame_data, frame_format, session
+                )
+                result = processor.infer_prepared(processed_frame, original_shape, priority, roi)
             
             # Calculate processing time in milliseconds
             processing_time_ms = (time.time() - start_time) * 1000
+            self._model_registry.record_latency(variant.name, processing_time_ms / 1000.0)
+            self._observe_class_latency(request_class, processing_time_ms / 1000.0)
+            if context is not None:
+                context.set_trailing_metadata((
+                    ('x-model-variant', variant.name),
+                    ('x-request-class', request_class),
+                ))
             
             # Create response with new format
             response = FrameResponse()
@@ -586,38 +827,12 @@ class AIService(AIServiceServicer):
             response.message = "Frame processed successfully"
             response.processing_time_ms = processing_time_ms
             
-            # Map detections to AIResults - ALWAYS create AIResults even if empty
-            ai_results = AIResults()  # Always create, even if no detections
-            detection_count = 0
-            
-            if 'detections' in result and isinstance(result['detections'], list):
-                for d in result['detections']:
-                    if isinstance(d, dict):
-                        det = Detection()
-                        det.class_name = d.get('class_name', 'unknown')
-                        det.confidence = d.get('confidence', 0.0)
-                        
-                        bbox_data = d.get('bbox', {})
-                        bbox = BBox()
-                        bbox.x_min = bbox_data.get('x_min', 0.0)
-                        bbox.y_min = bbox_data.get('y_min', 0.0)
-                        # Convert width/height to x_max/y_max
-                        bbox.x_max = bbox_data.get('x_min', 0.0) + bbox_data.get('width', 0.0)
-                        bbox.y_max = bbox_data.get('y_min', 0.0) + bbox_data.get('height', 0.0)
-                        
-                        det.bbox.CopyFrom(bbox)
-                        ai_results.detections.append(det)
-                        detection_count += 1
-                        
-                        # Log each detection only if throttled (every 10s per class)
-                        self._log_throttled(
-                            f"det_{det.class_name}", 
-                            logging.INFO,
-                            f"[DETECTION] {det.class_name} ({det.confidence:.2f}) at [{bbox.x_min:.3f},{bbox.y_min:.3f},{bbox.x_max:.3f},{bbox.y_max:.3f}]"
-                        )
-            
-            # ALWAYS set ai_results, even if empty
-            response.ai_results.CopyFrom(ai_results)
+            # Map detections to AIResults - ALWAYS set ai_results even if empty
+            detection_count = self._fill_ai_results(response.ai_results, result, request.columnar)
+            
+            self._frames_success.inc()
+            self._detections_total.inc(detection_count)
+            self._total_seconds.observe(processing_time_ms / 1000.0)
             
             # Only log if there are detections or if processing took long (throttled)
             if detection_count > 0 or processing_time_ms > 1000:
@@ -629,8 +844,19 @@ class AIService(AIServiceServicer):
             
             return response
             
+        except queue.Full as e:
+            # Pipeline backpressure: the frame never started, the client may retry
+            self._log_throttled("pipeline_full", logging.WARNING, f"[FRAME] Rejected: {e}")
+            self._frames_rejected.inc()
+            response = FrameResponse()
+            response.success = False
+            response.message = f"Server busy: {e}"
+            response.processing_time_ms = (time.time() - start_time) * 1000
+            return response
+            
         except Exception as e:
             self._logger.error(f"[FRAME ERROR] Error processing frame: {e}", exc_info=True)
+            self._frames_error.inc()
             processing_time_ms = (time.time() - start_time) * 1000
             
             response = FrameResponse()
@@ -639,6 +865,42 @@ class AIService(AIServiceServicer):
             response.processing_time_ms = processing_time_ms
             
             return response
+        finally:
+            self._exit_inflight()
+    
+    def _fill_ai_results(self, ai_results: AIResults, result: Dict[str, Any], columnar: bool = False) -> int:
+        """
+        Serialize postprocess results into the AIResults message.
+        
+        Args:
+            ai_results: AIResults message of the response (filled in place)
+            result: Result of FrameProcessor.process_frame / process_yuv420
+            columnar: Fill ai_results.columns (packed arrays) instead of one
+                Detection + BBox message per detection
+            
+        Returns:
+            Number of detections
+        """
+        batch: DetectionBatch = result.get('detections')
+        if columnar:
+            ai_results.columns.SetInParent()  # present even if empty
+            batch.to_columns(ai_results.columns)
+        else:
+            ai_results.SetInParent()
+            batch.to_proto(ai_results)
+        
+        # Log one detection per class, throttled (every 10s per class)
+        if len(batch) and self._logger.isEnabledFor(logging.INFO):
+            names = batch.names()
+            for i in batch.first_per_class():
+                x_min, y_min, x_max, y_max = batch.boxes[i].tolist()
+                self._log_throttled(
+                    f"det_{names[i]}",
+                    logging.INFO,
+                    f"[DETECTION] {names[i]} ({batch.confidences[i]:.2f}) at [{x_min:.3f},{y_min:.3f},{x_max:.3f},{y_max:.3f}]"
+                )
+        
+        return len(batch)
     
     def ProcessBatchFrames(self, request: BatchFrameRequest, context) -> BatchFrameResponse:
         """
@@ -654,40 +916,60 @@ class AIService(AIServiceServicer):
         start_time = time.time()
         
         try:
-            # Convert all frames to numpy arrays
-            frames = []
-            for frame_request in request.frames:
-                frame = self._bytes_to_numpy(
-                    frame_request.frame_data,
-                    frame_request.width,
-                    frame_request.height,
-                    frame_request.channels
-                )
-                frames.append(frame)
+            # Batch uploads run in the batch lane unless the client names a class
+            _, priority = self._request_priority(
+                self._get_metadata(context), self._priority_config.get('batch_rpc_class', 'batch')
+            )
             
-            # DIRECT BATCH PROCESSING - No thread pool handover
-            results = self._frame_processor.process_batch(frames)
+            frames = request.frames
+            processor = self._frame_processor
+            if self._frame_pipeline:
+                # Queue every frame: decode of frame i+1 overlaps inference of frame i
+                pending = []
+                try:
+                    for frame_request in frames:
+                        pending.append(self._frame_pipeline.submit(
+                            self._pipeline_steps(
+                                processor,
+                                frame_request,
+                                self._request_frame_data(frame_request),
+                                frame_request.format or 'auto',
+                                priority
+                            ),
+                            priority=priority
+                        ))
+                    results = [future.result() for future in pending]
+                except BaseException:
+                    # The batch fails as a whole: frames not started yet skip the model
+                    for future in pending:
+                        future.cancel()
+                    raise
+            else:
+                # DIRECT BATCH PROCESSING - No thread pool handover
+                results = []
+                for frame_request in frames:
+                    processed_frame, original_shape, roi = self._prepare_step(
+                        processor,
+                        frame_request,
+                        self._request_frame_data(frame_request),
+                        frame_request.format or 'auto'
+                    )
+                    results.append(processor.infer_prepared(processed_frame, original_shape, priority, roi))
             
             # Calculate total processing time
             total_processing_time = time.time() - start_time
             
             # Create responses for each frame
             responses = []
-            for i, result in enumerate(results):
+            for i, (frame_request, result) in enumerate(zip(frames, results)):
                 response = FrameResponse(
                     success=True,
                     message=f"Frame {i} processed successfully",
-                    processing_time=total_processing_time / len(frames)  # Average time
+                    processing_time_ms=total_processing_time * 1000 / len(frames)  # Average time
                 )
-                
-                # Add results to response
-                for key, value in result.items():
-                    if isinstance(value, (int, float)):
-                        response.results[key] = float(value)
-                    elif isinstance(value, list) and len(value) > 0 and isinstance(value[0], (int, float)):
-                        # For lists of numbers, take the first value as a simple example
-                        response.results[key] = float(value[0])
-                
+                detection_count = self._fill_ai_results(response.ai_results, result, frame_request.columnar)
+                self._frames_success.inc()
+                self._detections_total.inc(detection_count)
                 responses.append(response)
             
             # Create batch response
@@ -701,8 +983,18 @@ class AIService(AIServiceServicer):
             self._logger.debug(f"Batch of {len(frames)} frames processed in {total_processing_time:.4f} seconds")
             return batch_response
             
+        except queue.Full as e:
+            # Pipeline backpressure: the client may retry the batch
+            self._log_throttled("pipeline_full", logging.WARNING, f"[BATCH] Rejected: {e}")
+            self._frames_rejected.inc()
+            return BatchFrameResponse(
+                success=False,
+                message=f"Server busy: {e}",
+                total_processing_time=time.time() - start_time
+            )
+            
         except Exception as e:
-            self._logger.error(f"Error processing batch frames: {e}")
+            self._logger.error(f"Error processing batch frames: {e}", exc_info=True)
             return BatchFrameResponse(
                 success=False,
                 message=f"Error processing batch frames: {str(e)}",
@@ -775,6 +1067,12 @@ class AIService(AIServiceServicer):
             
             # Create status message
             status = f"Server is running. Model pool: {pool_stats['in_use']}/{pool_stats['pool_size']} in use. Direct inference mode: {self._direct_inference}"
+            if self._frame_pipeline:
+                queues = ', '.join(
+                    f"{stage['name']} {stage['queue_depth']}/{stage['max_queue_depth']}"
+                    for stage in self._frame_pipeline.get_stats()['stages']
+                )
+                status += f". Pipeline queues: {queues}"
             
             # Create response
             response = ServerStatsResponse(
@@ -799,11 +1097,24 @@ class AIService(AIServiceServicer):
         """Gracefully shutdown the service."""
         self._logger.info("Shutting down AIService...")
         
+        # Restore degraded settings before the monitor goes away
+        if self._pressure_policy:
+            self._pressure_policy.shutdown()
+        
         # Shutdown memory manager if enabled
         if self._memory_manager:
             self._logger.info("Shutting down memory manager...")
             self._memory_manager.shutdown()
         
+        if self._frame_ring:
+            self._frame_ring.close()
+        
+        if self._frame_pipeline:
+            self._frame_pipeline.shutdown()
+        
+        if self._cpu_executor:
+            self._cpu_executor.shutdown()
+        
         self._logger.info("AIService shutdown complete")
 
 
@@ -824,8 +1135,21 @@ def serve(config_manager: ConfigurationManager):
     max_workers = config_manager.get('grpc.max_workers', 10)
     enable_memory_monitoring = config_manager.get('memory.enable_monitoring', True)
     
+    # Transport tuning (message size, keepalive, concurrency, compression)
+    transport = resolve_server_options(config_manager.get('grpc.server_options', {}))
+    logger.info(
+        f"gRPC server options: preset={transport.preset}, "
+        f"max_concurrent_rpcs={transport.maximum_concurrent_rpcs}, "
+        f"channel_args={dict(transport.channel_options)}"
+    )
+    
     # Create gRPC server
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=max_workers),
+        options=transport.channel_options,
+        maximum_concurrent_rpcs=transport.maximum_concurrent_rpcs,
+        compression=transport.compression
+    )
     
     # Add AIService to server
     ai_service = AIService(config_manager)
@@ -836,9 +1160,31 @@ def serve(config_manager: ConfigurationManager):
     # Bind server to port
     server.add_insecure_port(f'{host}:{port}')
     
+    # Same-host gateway: Unix domain socket skips TCP loopback
+    unix_socket = config_manager.get('grpc.unix_socket', '')
+    if unix_socket:
+        socket_path = Path(unix_socket)
+        if socket_path.exists():
+            socket_path.unlink()  # stale socket from a previous run
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        server.add_insecure_port(f'unix:{socket_path}')
+    
     # Start server
     server.start()
-    logger.info(f"Server started on {host}:{port}")
+    logger.info(f"Server started on {host}:{port}" + (f" and unix:{unix_socket}" if unix_socket else ""))
+    
+    # Expose Prometheus metrics over HTTP
+    metrics_server = None
+    if config_manager.get('metrics.enabled', False):
+        metrics_server = MetricsServer(
+            host=config_manager.get('metrics.host', '0.0.0.0'),
+            port=config_manager.get('metrics.port', 9100)
+        )
+        try:
+            metrics_server.start()
+        except OSError as e:
+            logger.error(f"Failed to start metrics endpoint: {e}")
+            metrics_server = None
     
     try:
         # Keep server running
@@ -849,6 +1195,9 @@ def serve(config_manager: ConfigurationManager):
         # Shutdown AIService
         ai_service.shutdown()
         
+        if metrics_server:
+            metrics_server.stop()
+        
         # Shutdown configuration manager
         if config_manager:
             logger.info("Shutting down configuration manager...")
@@ -856,4 +1205,6 @@ def serve(config_manager: ConfigurationManager):
         
         # Shutdown gRPC server
         server.stop(5.0)  # 5 seconds grace period
+        if unix_socket and Path(unix_socket).exists():
+            Path(unix_socket).unlink()
         logger.info("Server shutdown complete")
\ No newline at end of file
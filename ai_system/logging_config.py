@@ -1,18 +1,166 @@
+import atexit
+import copy
+import json
 import logging
 import logging.handlers
+import queue
+import threading
+import time
 import os
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Any, Optional
 
-def setup_logging(log_level=logging.INFO, log_dir=None, log_file_prefix="ai_system"):
+# Active async pipeline (set by setup_logging when async logging is enabled)
+_queue_handler: Optional["DroppingQueueHandler"] = None
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_sampling_filter: Optional["LoggerSamplingFilter"] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatter yang menghasilkan satu objek JSON per baris log.
+    
+    Only a fixed set of fields is emitted so formatting stays cheap; values
+    that are not JSON serializable are converted with str().
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler yang tidak pernah memblokir thread pemanggil.
+    
+    Records are put with put_nowait(); when the bounded queue is full the
+    record is dropped and counted per level instead of waiting for the
+    listener to catch up with disk or stdout.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._drop_lock = threading.Lock()
+        self.dropped: Dict[str, int] = {}
+        self.enqueued = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Make the record safe to hand to another thread.
+        
+        The message is interpolated and the traceback rendered here, but the
+        final formatting is left to the listener's handlers.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+
+
+class LoggerSamplingFilter(logging.Filter):
+    """
+    Filter yang mengambil sampel log di bawah WARNING per logger.
+    
+    Rates map a logger name (or parent name) to the fraction of records to
+    keep, e.g. {"ai_system.grpc_server": 0.1} keeps every 10th DEBUG/INFO
+    record from that logger and its children. WARNING and above always pass.
+    """
+    
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self._rates = {name: max(0.0, min(1.0, float(rate))) for name, rate in (rates or {}).items()}
+        self._lock = threading.Lock()
+        self._seen: Dict[str, int] = {}
+        self.sampled_out: Dict[str, int] = {}
+    
+    def _rate_for(self, name: str) -> Optional[str]:
+        """Return the most specific configured logger name matching name."""
+        while name:
+            if name in self._rates:
+                return name
+            name = name.rpartition('.')[0]
+        return None
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self._rates:
+            return True
+        key = self._rate_for(record.name)
+        if key is None:
+            return True
+        
+        rate = self._rates[key]
+        with self._lock:
+            seen = self._seen.get(key, 0)
+            self._seen[key] = seen + 1
+            # Keep a record whenever the running total of kept records increases
+            keep = rate > 0 and int((seen + 1) * rate) > int(seen * rate)
+            if not keep:
+                self.sampled_out[key] = self.sampled_out.get(key, 0) + 1
+        return keep
+
+
+def _create_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
+def setup_logging(log_level=logging.INFO,
+                  log_dir=None,
+                  log_file_prefix="ai_system",
+                  log_format="text",
+                  async_logging=True,
+                  queue_size=10000,
+                  sampling=None):
     """
     Setup logging configuration for the AI system.
     
+    With async_logging the root logger only has a non-blocking queue handler;
+    a QueueListener thread owns the console and file handlers, so request
+    threads never wait on disk or stdout.
+    
     Args:
         log_level: Logging level (default: logging.INFO)
         log_dir: Directory to store log files (default: logs/ in current directory)
         log_file_prefix: Prefix for log file names (default: "ai_system")
+        log_format: "text" or "json" (default: "text")
+        async_logging: Route records through a background listener (default: True)
+        queue_size: Maximum queued records before new ones are dropped (default: 10000)
+        sampling: Optional mapping of logger name to keep rate for records below WARNING
     """
+    global _queue_handler, _queue_listener, _sampling_filter
+    
+    # Stop a previous pipeline so its queue is flushed before reconfiguring
+    shutdown_logging()
+    
     # Create log directory if not exists
     if log_dir is None:
         log_dir = Path("logs")
@@ -29,16 +177,12 @@ def setup_logging(log_level=logging.INFO, log_dir=None, log_file_prefix="ai_syst
     logger.handlers.clear()
     
     # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    formatter = _create_formatter(log_format)
     
     # Create console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
     
     # Create file handler with rotation
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -51,7 +195,6 @@ def setup_logging(log_level=logging.INFO, log_dir=None, log_file_prefix="ai_syst
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
     
     # Create error file handler
     error_log_file = log_dir / f"{log_file_prefix}_errors_{timestamp}.log"
@@ -62,21 +205,88 @@ def setup_logging(log_level=logging.INFO, log_dir=None, log_file_prefix="ai_syst
     )
     error_file_handler.setLevel(logging.ERROR)
     error_file_handler.setFormatter(formatter)
-    logger.addHandler(error_file_handler)
+    
+    handlers = [console_handler, file_handler, error_file_handler]
+    _sampling_filter = LoggerSamplingFilter(sampling) if sampling else None
+    
+    if async_logging:
+        _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        _queue_handler.setLevel(log_level)
+        if _sampling_filter:
+            _queue_handler.addFilter(_sampling_filter)
+        logger.addHandler(_queue_handler)
+        
+        _queue_listener = logging.handlers.QueueListener(
+            _queue_handler.queue,
+            *handlers,
+            respect_handler_level=True
+        )
+        _queue_listener.start()
+    else:
+        for handler in handlers:
+            if _sampling_filter:
+                handler.addFilter(_sampling_filter)
+            logger.addHandler(handler)
     
     # Log initialization
-    logger.info(f"Logging initialized. Log file: {log_file}")
+    logger.info(
+        f"Logging initialized. Log file: {log_file} "
+        f"(format: {log_format}, async: {async_logging})"
+    )
     
     return logger
 
+
+def shutdown_logging():
+    """
+    Stop the background listener, flushing records still in the queue.
+    """
+    global _queue_handler, _queue_listener
+    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+    
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """
+    Get statistics of the async logging pipeline.
+    
+    Returns:
+        Dictionary with queue depth, enqueued/dropped counts and sampled-out counts
+    """
+    stats = {
+        'async': _queue_handler is not None,
+        'timestamp': time.time()
+    }
+    if _queue_handler is not None:
+        stats['queue_size'] = _queue_handler.queue.qsize()
+        stats['queue_capacity'] = _queue_handler.queue.maxsize
+        stats['enqueued'] = _queue_handler.enqueued
+        stats['dropped'] = dict(_queue_handler.dropped)
+        stats['total_dropped'] = sum(_queue_handler.dropped.values())
+    if _sampling_filter is not None:
+        stats['sampled_out'] = dict(_sampling_filter.sampled_out)
+    return stats
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name):
     """
     Get a logger with the specified name.
     
     Args:
         name: Name of the logger
-        
+    
     Returns:
         Logger instance
     """
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
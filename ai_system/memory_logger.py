@@ -1,12 +1,15 @@
 import logging
 import time
 import json
-from typing import Dict, Any, Optional, List
+from collections import deque
+from typing import Dict, Any, Optional, List, Deque
 from pathlib import Path
 from threading import Lock
 from datetime import datetime
+import numpy as np
 
 from .memory_monitor import MemoryMonitor, MemoryStats, MemoryAlertLevel
+from .time_series import TimeSeriesBuffer
 
 
 class MemoryLogger:
@@ -70,9 +73,21 @@ class MemoryLogger:
         self._stop_logging = False
         self._log_lock = Lock()
         
-        # History for tracking
-        self._history: List[Dict[str, Any]] = []
+        # History for tracking: memory samples go to a ring buffer, the rare
+        # free-form pool/thread entries to a bounded deque
         self._max_history_size = 1000
+        self._memory_history = TimeSeriesBuffer(self._max_history_size, {
+            'rss_mb': np.float32,
+            'vms_mb': np.float32,
+            'percent': np.float32,
+            'available_mb': np.float32,
+            'count0': np.int32,
+            'count1': np.int32,
+            'count2': np.int32,
+            'objects': np.int64,
+            'alert_level': np.int8  # -1 for periodic samples
+        })
+        self._event_history: Deque[Dict[str, Any]] = deque(maxlen=self._max_history_size)
         
         # Register alert callback with memory monitor
         self._memory_monitor.add_alert_callback(self._log_memory_alert)
@@ -149,7 +164,7 @@ class MemoryLogger:
             }
             
             # Add to history
-            self._add_to_history(log_entry)
+            self._add_memory_sample(stats)
             
             # Log as JSON
             self._logger.info(f"Memory stats: {json.dumps(log_entry)}")
@@ -186,7 +201,7 @@ class MemoryLogger:
             }
             
             # Add to history
-            self._add_to_history(alert_entry)
+            self._add_memory_sample(stats, alert_level)
             
             # Log alert with appropriate level
             if alert_level == MemoryAlertLevel.CRITICAL:
@@ -197,6 +212,27 @@ class MemoryLogger:
         except Exception as e:
             self._logger.error(f"Error logging memory alert: {e}")
     
+    def _add_memory_sample(self, stats: MemoryStats, alert_level: Optional[MemoryAlertLevel] = None) -> None:
+        """
+        Add memory sample to history.
+        
+        Args:
+            stats: Memory statistics
+            alert_level: Alert level if the sample comes from an alert
+        """
+        self._memory_history.append(
+            timestamp=stats.timestamp,
+            rss_mb=stats.rss / (1024 * 1024),
+            vms_mb=stats.vms / (1024 * 1024),
+            percent=stats.percent,
+            available_mb=stats.available / (1024 * 1024),
+            count0=stats.gc_count0,
+            count1=stats.gc_count1,
+            count2=stats.gc_count2,
+            objects=stats.gc_objects,
+            alert_level=alert_level.value if alert_level is not None else -1
+        )
+    
     def _add_to_history(self, entry: Dict[str, Any]) -> None:
         """
         Add entry to history.
@@ -204,11 +240,37 @@ class MemoryLogger:
         Args:
             entry: Log entry to add to history
         """
-        self._history.append(entry)
+        self._event_history.append(entry)
+    
+    def _memory_record_to_entry(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a ring buffer record back to the log entry format.
         
-        # Limit history size
-        if len(self._history) > self._max_history_size:
-            self._history.pop(0)
+        Args:
+            record: Record from the memory history buffer
+            
+        Returns:
+            Log entry dictionary
+        """
+        entry = {
+            'timestamp': record['timestamp'],
+            'datetime': datetime.fromtimestamp(record['timestamp']).isoformat()
+        }
+        if record['alert_level'] >= 0:
+            entry['alert_level'] = MemoryAlertLevel(record['alert_level']).name
+        entry['memory'] = {
+            'rss_mb': record['rss_mb'],
+            'vms_mb': record['vms_mb'],
+            'percent': record['percent'],
+            'available_mb': record['available_mb']
+        }
+        entry['gc'] = {
+            'count0': record['count0'],
+            'count1': record['count1'],
+            'count2': record['count2'],
+            'objects': record['objects']
+        }
+        return entry
     
     def log_object_pool_stats(self, pool_name: str, pool_stats: Dict[str, Any]) -> None:
         """
@@ -306,16 +368,37 @@ class MemoryLogger:
         Returns:
             List of log entries
         """
+        entries = [
+            self._memory_record_to_entry(record)
+            for record in self._memory_history.records(max_items)
+        ]
+        events = list(self._event_history)
+        entries.extend(events if max_items is None else events[-max_items:])
+        entries.sort(key=lambda entry: entry['timestamp'])
+        
         if max_items is None:
-            return self._history.copy()
-        else:
-            return self._history[-max_items:]
+            return entries
+        return entries[-max_items:]
+    
+    def get_memory_summary(self, column: str = 'percent', window: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get percentile summary of logged memory samples.
+        
+        Args:
+            column: Sample column (e.g. 'percent', 'rss_mb')
+            window: Only use samples from the last N seconds (None for all)
+            
+        Returns:
+            Dictionary with count, min, max, mean, p50, p95 and p99
+        """
+        return self._memory_history.summary(column, window)
     
     def clear_history(self) -> None:
         """
         Clear logging history.
         """
-        self._history.clear()
+        self._memory_history.clear()
+        self._event_history.clear()
         self._logger.info("Logging history cleared")
     
     def export_history_to_file(self, file_path: Path) -> None:
@@ -331,7 +414,7 @@ class MemoryLogger:
             
             # Write history to file
             with open(file_path, 'w') as f:
-                json.dump(self._history, f, indent=2)
+                json.dump(self.get_history(), f, indent=2)
             
             self._logger.info(f"Logging history exported to {file_path}")
             
@@ -108,6 +108,15 @@ class MemoryManager:
         
         self._logger.info("MemoryManager initialized")
     
+    def get_memory_monitor(self) -> MemoryMonitor:
+        """
+        Get the underlying MemoryMonitor (e.g. to register alert callbacks).
+        
+        Returns:
+            MemoryMonitor instance
+        """
+        return self._memory_monitor
+    
     def register_object_pool(self, name: str, object_pool: ObjectPool) -> None:
         """
         Register object pool for monitoring.
@@ -224,6 +233,27 @@ class MemoryManager:
         """
         self._gc_monitor.force_gc(generation)
     
+    def apply_gc_tuning(self,
+                        profile: str = 'default',
+                        thresholds: Optional[List[int]] = None) -> None:
+        """
+        Apply generational GC thresholds.
+        
+        Args:
+            profile: GC tuning profile name
+            thresholds: Explicit (gen0, gen1, gen2) thresholds, overrides profile
+        """
+        self._gc_monitor.apply_gc_tuning(profile, thresholds)
+    
+    def freeze_after_warmup(self) -> Dict[str, Any]:
+        """
+        Freeze long-lived startup objects out of future GC scans.
+        
+        Returns:
+            Dictionary with pause timings and frozen object count
+        """
+        return self._gc_monitor.freeze_after_warmup()
+    
     def detect_memory_leaks(self, 
                            min_snapshots: int = 3,
                            growth_threshold: float = 1.1) -> List[Dict[str, Any]]:
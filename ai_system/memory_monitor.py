@@ -7,6 +7,9 @@ import os
 from typing import Dict, Any, Optional, Callable, List
 from dataclasses import dataclass
 from enum import Enum
+import numpy as np
+
+from .time_series import TimeSeriesBuffer
 
 
 class MemoryAlertLevel(Enum):
@@ -66,13 +69,25 @@ class MemoryMonitor:
         self._stop_monitoring = False
         self._monitor_lock = threading.Lock()
         
-        # History untuk tracking memory usage
-        self._history: List[MemoryStats] = []
+        # History untuk tracking memory usage (ring buffer, O(1) per sample)
         self._max_history_size = 100
+        self._history = TimeSeriesBuffer(self._max_history_size, {
+            'rss': np.int64,
+            'vms': np.int64,
+            'percent': np.float32,
+            'available': np.int64,
+            'gc_count0': np.int32,
+            'gc_count1': np.int32,
+            'gc_count2': np.int32,
+            'gc_objects': np.int64
+        })
         
         # Alert callbacks
         self._alert_callbacks: List[Callable[[MemoryStats, MemoryAlertLevel], None]] = []
         
+        # Sample callbacks (called on every check, including NORMAL level)
+        self._sample_callbacks: List[Callable[[MemoryStats, MemoryAlertLevel], None]] = []
+        
         # Statistics
         self._stats = {
             'max_memory_percent': 0.0,
@@ -128,6 +143,9 @@ class MemoryMonitor:
                 if alert_level != MemoryAlertLevel.NORMAL:
                     self._trigger_alert(stats, alert_level)
                 
+                # Notify sample callbacks (used to detect pressure clearing)
+                self._notify_sample_callbacks(stats, alert_level)
+                
                 # Update statistics
                 self._update_stats(stats)
                 
@@ -179,11 +197,17 @@ class MemoryMonitor:
         Args:
             stats: MemoryStats to add to history
         """
-        self._history.append(stats)
-        
-        # Limit history size
-        if len(self._history) > self._max_history_size:
-            self._history.pop(0)
+        self._history.append(
+            timestamp=stats.timestamp,
+            rss=stats.rss,
+            vms=stats.vms,
+            percent=stats.percent,
+            available=stats.available,
+            gc_count0=stats.gc_count0,
+            gc_count1=stats.gc_count1,
+            gc_count2=stats.gc_count2,
+            gc_objects=stats.gc_objects
+        )
     
     def _check_alert_level(self, stats: MemoryStats) -> MemoryAlertLevel:
         """
@@ -233,6 +257,20 @@ class MemoryMonitor:
             except Exception as e:
                 self._logger.error(f"Error in memory alert callback: {e}")
     
+    def _notify_sample_callbacks(self, stats: MemoryStats, alert_level: MemoryAlertLevel) -> None:
+        """
+        Call sample callbacks with the latest memory statistics.
+        
+        Args:
+            stats: Current memory statistics
+            alert_level: Alert level of the sample
+        """
+        for callback in self._sample_callbacks:
+            try:
+                callback(stats, alert_level)
+            except Exception as e:
+                self._logger.error(f"Error in memory sample callback: {e}")
+    
     def _update_stats(self, stats: MemoryStats) -> None:
         """
         Update memory statistics.
@@ -322,6 +360,27 @@ class MemoryMonitor:
             self._alert_callbacks.remove(callback)
             self._logger.info("Memory alert callback removed")
     
+    def add_sample_callback(self, callback: Callable[[MemoryStats, MemoryAlertLevel], None]) -> None:
+        """
+        Add callback called on every memory check, whatever the alert level.
+        
+        Args:
+            callback: Callback function that takes MemoryStats and MemoryAlertLevel
+        """
+        self._sample_callbacks.append(callback)
+        self._logger.info("Memory sample callback added")
+    
+    def remove_sample_callback(self, callback: Callable[[MemoryStats, MemoryAlertLevel], None]) -> None:
+        """
+        Remove memory sample callback.
+        
+        Args:
+            callback: Callback function to remove
+        """
+        if callback in self._sample_callbacks:
+            self._sample_callbacks.remove(callback)
+            self._logger.info("Memory sample callback removed")
+    
     def get_current_stats(self) -> MemoryStats:
         """
         Get current memory statistics.
@@ -341,10 +400,20 @@ class MemoryMonitor:
         Returns:
             List of MemoryStats
         """
-        if max_items is None:
-            return self._history.copy()
-        else:
-            return self._history[-max_items:]
+        return [MemoryStats(**record) for record in self._history.records(max_items)]
+    
+    def get_history_summary(self, column: str = 'percent', window: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get percentile summary of a history column.
+        
+        Args:
+            column: MemoryStats field name (e.g. 'percent', 'rss')
+            window: Only use samples from the last N seconds (None for all)
+            
+        Returns:
+            Dictionary with count, min, max, mean, p50, p95 and p99
+        """
+        return self._history.summary(column, window)
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,222 @@
+import logging
+import time
+import threading
+import psutil
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Callable
+
+from .memory_monitor import MemoryMonitor, MemoryStats, MemoryAlertLevel
+
+
+@dataclass
+class DegradationAction:
+    """Data class untuk satu langkah degradasi saat memory pressure."""
+    name: str
+    level: MemoryAlertLevel  # Minimum alert level that triggers the action
+    apply: Callable[[], None]
+    restore: Optional[Callable[[], None]] = None  # None for one-shot actions (run once per episode)
+
+
+class MemoryPressurePolicy:
+    """
+    Policy engine yang menurunkan beban server saat memory pressure.
+    
+    Actions are applied in registration order when MemoryMonitor raises an
+    alert at or above their level, and restored in reverse order once the
+    alert level has stayed below their level for ``restore_after`` seconds.
+    Every transition is logged with the RSS measured before and after it.
+    """
+    
+    def __init__(self,
+                 memory_monitor: MemoryMonitor,
+                 restore_after: float = 60.0,
+                 max_events: int = 100):
+        """
+        Initialize MemoryPressurePolicy.
+        
+        Args:
+            memory_monitor: MemoryMonitor instance providing alerts
+            restore_after: Seconds of lower pressure before actions are restored
+            max_events: Number of action events kept for get_stats()
+        """
+        self._logger = logging.getLogger(__name__)
+        self._memory_monitor = memory_monitor
+        self._restore_after = restore_after
+        self._process = psutil.Process(os.getpid())
+        
+        self._actions: List[DegradationAction] = []
+        self._active: Dict[str, float] = {}  # action name -> time applied
+        # Alert level -> time the alert level first dropped below it (per level,
+        # so WARNING alerts do not keep restarting the calm time of CRITICAL actions)
+        self._calm_since: Dict[MemoryAlertLevel, float] = {}
+        self._lock = threading.Lock()
+        
+        self._events: deque = deque(maxlen=max_events)
+        self._stats = {
+            'total_applied': 0,
+            'total_restored': 0,
+            'total_failed': 0
+        }
+        
+        self._memory_monitor.add_alert_callback(self._on_alert)
+        self._memory_monitor.add_sample_callback(self._on_sample)
+        
+        self._logger.info(f"MemoryPressurePolicy initialized (restore_after={restore_after}s)")
+    
+    def add_action(self, action: DegradationAction) -> None:
+        """
+        Register a degradation action.
+        
+        Args:
+            action: DegradationAction to register
+        """
+        with self._lock:
+            self._actions.append(action)
+        self._logger.info(f"Degradation action registered: {action.name} (level: {action.level.name})")
+    
+    def _on_alert(self, stats: MemoryStats, alert_level: MemoryAlertLevel) -> None:
+        """
+        Alert callback: apply every inactive action at or below the alert level.
+        
+        Args:
+            stats: Current memory statistics
+            alert_level: Alert level
+        """
+        with self._lock:
+            # Pressure at these levels again: their calm time starts over
+            for level in list(self._calm_since):
+                if level.value <= alert_level.value:
+                    del self._calm_since[level]
+            for action in self._actions:
+                if action.level.value <= alert_level.value and action.name not in self._active:
+                    if self._run(action, 'apply', action.apply, stats):
+                        # One-shot actions are also tracked so they run once per episode
+                        self._active[action.name] = time.time()
+    
+    def _on_sample(self, stats: MemoryStats, alert_level: MemoryAlertLevel) -> None:
+        """
+        Sample callback: restore actions once pressure has cleared long enough.
+        
+        Args:
+            stats: Current memory statistics
+            alert_level: Alert level
+        """
+        with self._lock:
+            now = time.time()
+            calm_levels = {
+                action.level for action in self._actions
+                if action.name in self._active and action.level.value > alert_level.value
+            }
+            for level in list(self._calm_since):
+                if level not in calm_levels:
+                    del self._calm_since[level]
+            
+            restored_levels = set()
+            for level in calm_levels:
+                since = self._calm_since.setdefault(level, now)
+                if now - since >= self._restore_after:
+                    restored_levels.add(level)
+            if not restored_levels:
+                return
+            
+            for action in reversed(self._actions):
+                if action.name in self._active and action.level in restored_levels:
+                    if action.restore:
+                        self._run(action, 'restore', action.restore, stats)
+                    del self._active[action.name]
+            for level in restored_levels:
+                del self._calm_since[level]
+    
+    def _run(self,
+             action: DegradationAction,
+             phase: str,
+             func: Callable[[], None],
+             stats: MemoryStats) -> bool:
+        """
+        Run one phase of an action and log its measured effect.
+        
+        Args:
+            action: Action being applied or restored
+            phase: 'apply' or 'restore'
+            func: Function to call
+            stats: Memory statistics that triggered the transition
+        
+        Returns:
+            True if the function completed without error
+        """
+        rss_before = self._process.memory_info().rss
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            self._stats['total_failed'] += 1
+            self._logger.error(f"[MEMORY POLICY] {phase} {action.name} failed: {e}")
+            return False
+        
+        duration = time.perf_counter() - start
+        rss_after = self._process.memory_info().rss
+        delta_mb = (rss_after - rss_before) / (1024 * 1024)
+        
+        self._stats['total_applied' if phase == 'apply' else 'total_restored'] += 1
+        self._events.append({
+            'timestamp': time.time(),
+            'action': action.name,
+            'phase': phase,
+            'memory_percent': stats.percent,
+            'rss_before': rss_before,
+            'rss_after': rss_after,
+            'duration': duration
+        })
+        
+        self._logger.warning(
+            f"[MEMORY POLICY] {phase} {action.name} at {stats.percent:.1f}% memory: "
+            f"RSS {rss_before / (1024 * 1024):.1f}MB -> {rss_after / (1024 * 1024):.1f}MB "
+            f"({delta_mb:+.1f}MB) in {duration * 1000:.1f}ms"
+        )
+        return True
+    
+    def is_active(self, name: str) -> bool:
+        """
+        Check whether an action is currently applied.
+        
+        Args:
+            name: Action name
+        
+        Returns:
+            True if the action is active
+        """
+        with self._lock:
+            return name in self._active
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get policy statistics.
+        
+        Returns:
+            Dictionary containing counters, active actions and recent events
+        """
+        with self._lock:
+            stats = self._stats.copy()
+            stats['active_actions'] = list(self._active)
+            stats['recent_events'] = list(self._events)
+        return stats
+    
+    def shutdown(self) -> None:
+        """
+        Restore all active actions and detach from the memory monitor.
+        """
+        self._memory_monitor.remove_alert_callback(self._on_alert)
+        self._memory_monitor.remove_sample_callback(self._on_sample)
+        
+        with self._lock:
+            for action in reversed(self._actions):
+                if action.name in self._active and action.restore:
+                    try:
+                        action.restore()
+                    except Exception as e:
+                        self._logger.error(f"Error restoring {action.name} on shutdown: {e}")
+            self._active.clear()
+        
+        self._logger.info("MemoryPressurePolicy shutdown")
@@ -0,0 +1,444 @@
+import bisect
+import gc
+import logging
+import os
+import threading
+import time
+import psutil
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List, Tuple, Callable, Sequence
+
+# Latency buckets in seconds (1ms .. 10s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _ShardedValues:
+    """
+    Per-thread value shards untuk update tanpa lock.
+    
+    Each thread writes only to its own list, so the hot path is a plain
+    list item update; the lock is only taken the first time a thread
+    touches the metric and when a scrape sums the shards.
+    """
+    
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._shards: List[List[float]] = []
+        self._lock = threading.Lock()
+    
+    def shard(self) -> List[float]:
+        shard = getattr(self._local, 'values', None)
+        if shard is None:
+            shard = [0.0] * self._size
+            with self._lock:
+                self._shards.append(shard)
+            self._local.values = shard
+        return shard
+    
+    def totals(self) -> List[float]:
+        with self._lock:
+            shards = list(self._shards)
+        totals = [0.0] * self._size
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class Counter:
+    """Monotonic counter (one labeled child)."""
+    
+    def __init__(self):
+        self._values = _ShardedValues(1)
+    
+    def inc(self, amount: float = 1.0) -> None:
+        """
+        Increment the counter.
+        
+        Args:
+            amount: Non-negative increment
+        """
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        self._values.shard()[0] += amount
+    
+    def get(self) -> float:
+        return self._values.totals()[0]
+
+
+class Gauge:
+    """Gauge that can go up and down, or be computed at scrape time."""
+    
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+        self._function: Optional[Callable[[], float]] = None
+    
+    def set(self, value: float) -> None:
+        self._value = float(value)
+    
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+    
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+    
+    def set_function(self, function: Callable[[], float]) -> None:
+        """
+        Compute the gauge value when it is scraped.
+        
+        Args:
+            function: Callable returning the current value
+        """
+        self._function = function
+    
+    def get(self) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._value
+
+
+class Histogram:
+    """Cumulative histogram (one labeled child)."""
+    
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._upper_bounds = sorted(float(b) for b in buckets)
+        # Layout: one slot per bucket, +Inf bucket, sum, count
+        self._values = _ShardedValues(len(self._upper_bounds) + 3)
+    
+    def observe(self, value: float) -> None:
+        """
+        Record an observation.
+        
+        Args:
+            value: Observed value (seconds for latency histograms)
+        """
+        shard = self._values.shard()
+        shard[bisect.bisect_left(self._upper_bounds, value)] += 1
+        shard[-2] += value
+        shard[-1] += 1
+    
+    def time(self) -> "_HistogramTimer":
+        """Context manager that observes the elapsed time of its block."""
+        return _HistogramTimer(self)
+    
+    def get(self) -> Dict[str, Any]:
+        totals = self._values.totals()
+        cumulative = []
+        running = 0.0
+        for bound, count in zip(self._upper_bounds + [float('inf')], totals[:-2]):
+            running += count
+            cumulative.append((bound, running))
+        return {'buckets': cumulative, 'sum': totals[-2], 'count': totals[-1]}
+
+
+class _HistogramTimer:
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self._start = 0.0
+    
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class MetricFamily:
+    """
+    Metric dengan nama, help text, dan label.
+    
+    Children are created per label combination with labels(); a family
+    without label names acts as its own single child.
+    """
+    
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 metric_type: str,
+                 label_names: Sequence[str] = (),
+                 factory: Callable[[], Any] = Counter):
+        self.name = name
+        self.documentation = documentation
+        self.type = metric_type
+        self.label_names = tuple(label_names)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+    
+    def labels(self, *values: Any, **kwargs: Any) -> Any:
+        """
+        Get (or create) the child for a label combination.
+        
+        Hot paths should keep the returned child instead of calling this
+        for every observation.
+        
+        Returns:
+            Counter, Gauge or Histogram child
+        """
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.label_names)
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {key}")
+        
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._factory()
+                    self._children[key] = child
+        return child
+    
+    def __getattr__(self, attribute: str) -> Any:
+        # Unlabeled families forward inc/set/observe/... to their only child
+        if attribute.startswith('_') or self.label_names:
+            raise AttributeError(attribute)
+        return getattr(self.labels(), attribute)
+    
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], Any]]:
+        with self._lock:
+            children = list(self._children.items())
+        return [(self.name, key, child.get()) for key, child in children]
+    
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}"
+        ]
+        for name, key, value in self.samples():
+            if self.type == 'histogram':
+                for bound, count in value['buckets']:
+                    labels = _format_labels(self.label_names, key, ('le', _format_value(bound)))
+                    lines.append(f"{name}_bucket{labels} {_format_value(count)}")
+                labels = _format_labels(self.label_names, key)
+                lines.append(f"{name}_sum{labels} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{labels} {_format_value(value['count'])}")
+            else:
+                lines.append(f"{name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registry in-process untuk metrics dengan exposition format Prometheus.
+    """
+    
+    def __init__(self):
+        self._logger = logging.getLogger(__name__)
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+    
+    def _register(self, name: str, documentation: str, metric_type: str,
+                  label_names: Sequence[str], factory: Callable[[], Any]) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is not None:
+                if family.type != metric_type or family.label_names != tuple(label_names):
+                    raise ValueError(f"Metric {name} already registered with a different type or labels")
+                return family
+            family = MetricFamily(name, documentation, metric_type, label_names, factory)
+            self._families[name] = family
+            return family
+    
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> MetricFamily:
+        """Get or create a counter family."""
+        return self._register(name, documentation, 'counter', label_names, Counter)
+    
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> MetricFamily:
+        """Get or create a gauge family."""
+        return self._register(name, documentation, 'gauge', label_names, Gauge)
+    
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> MetricFamily:
+        """Get or create a histogram family."""
+        return self._register(name, documentation, 'histogram', label_names,
+                              lambda: Histogram(buckets))
+    
+    def get(self, name: str) -> Optional[MetricFamily]:
+        return self._families.get(name)
+    
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            families = list(self._families.values())
+        lines = []
+        for family in families:
+            try:
+                lines.extend(family.render())
+            except Exception as e:
+                # A failing scrape-time gauge must not break the whole scrape
+                self._logger.warning(f"Error rendering metric {family.name}: {e}")
+        return '\n'.join(lines) + '\n'
+
+
+_default_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """
+    Get the process-wide default registry.
+    
+    Returns:
+        MetricsRegistry instance
+    """
+    return _default_registry
+
+
+_gc_metrics_lock = threading.Lock()
+_gc_metrics_installed = False
+
+
+def install_process_metrics(registry: Optional[MetricsRegistry] = None) -> None:
+    """
+    Register GC pause and process memory metrics.
+    
+    GC pauses are measured with a gc.callbacks hook; memory gauges are read
+    from psutil when scraped. Safe to call more than once.
+    
+    Args:
+        registry: Target registry (default: process-wide registry)
+    """
+    global _gc_metrics_installed
+    registry = registry or _default_registry
+    process = psutil.Process(os.getpid())
+    
+    registry.gauge('ai_process_resident_memory_bytes', 'Resident memory of the AI process').set_function(
+        lambda: process.memory_info().rss
+    )
+    registry.gauge('ai_system_memory_percent', 'System memory usage percent').set_function(
+        lambda: psutil.virtual_memory().percent
+    )
+    registry.gauge('ai_gc_frozen_objects', 'Objects moved to the permanent generation by gc.freeze').set_function(
+        gc.get_freeze_count
+    )
+    
+    with _gc_metrics_lock:
+        if _gc_metrics_installed:
+            return
+        _gc_metrics_installed = True
+    
+    pauses = registry.histogram(
+        'ai_gc_pause_seconds', 'Garbage collection pause duration', ['generation'],
+        buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+    )
+    collected = registry.counter('ai_gc_collected_objects_total', 'Objects collected by the GC', ['generation'])
+    pause_children = [pauses.labels(str(generation)) for generation in range(3)]
+    collected_children = [collected.labels(str(generation)) for generation in range(3)]
+    started = threading.local()
+    
+    def _gc_callback(phase: str, info: Dict[str, int]) -> None:
+        if phase == 'start':
+            started.time = time.perf_counter()
+        elif phase == 'stop':
+            start = getattr(started, 'time', None)
+            if start is None:
+                return
+            generation = info.get('generation', 0)
+            pause_children[generation].observe(time.perf_counter() - start)
+            collected_children[generation].inc(info.get('collected', 0))
+            started.time = None
+    
+    gc.callbacks.append(_gc_callback)
+
+
+class MetricsServer:
+    """
+    HTTP server kecil yang melayani /metrics di thread background.
+    """
+    
+    def __init__(self,
+                 registry: Optional[MetricsRegistry] = None,
+                 host: str = '0.0.0.0',
+                 port: int = 9100):
+        """
+        Initialize MetricsServer.
+        
+        Args:
+            registry: Registry to expose (default: process-wide registry)
+            host: Bind address
+            port: Bind port (0 picks a free port)
+        """
+        self._logger = logging.getLogger(__name__)
+        self._registry = registry or _default_registry
+        self._host = host
+        self._port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1] if self._server else self._port
+    
+    def _make_handler(self):
+        registry = self._registry
+        logger = self._logger
+        
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                logger.debug(f"[METRICS] {self.address_string()} {format % args}")
+        
+        return _MetricsHandler
+    
+    def start(self) -> None:
+        """Start serving in a daemon thread."""
+        if self._server is not None:
+            return
+        self._server = ThreadingHTTPServer((self._host, self._port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='MetricsServer', daemon=True)
+        self._thread.start()
+        self._logger.info(f"Metrics endpoint listening on http://{self._host}:{self.port}/metrics")
+    
+    def stop(self) -> None:
+        """Stop the HTTP server."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._logger.info("Metrics endpoint stopped")
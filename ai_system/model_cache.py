@@ -0,0 +1,207 @@
+import hashlib
+import logging
+import os
+import platform
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+import onnxruntime as ort
+
+_logger = logging.getLogger(__name__)
+
+# Serializes cache builds per key so concurrent pool growth optimizes once
+_build_locks: Dict[str, threading.Lock] = {}
+_build_locks_guard = threading.Lock()
+
+# (path, size, mtime) -> sha256, so the model file is hashed once per process
+_hash_cache: Dict[Tuple[str, int, int], str] = {}
+
+_cpu_signature: Optional[str] = None
+
+OPTIMIZATION_LEVELS = {
+    'basic': ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    'extended': ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    'all': ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+def model_hash(model_path: Path) -> str:
+    """
+    SHA-256 of the model file (memoized per path, size and mtime).
+    
+    Args:
+        model_path: Path to the model file
+    
+    Returns:
+        Hex digest
+    """
+    stat = model_path.stat()
+    key = (str(model_path.resolve()), stat.st_size, stat.st_mtime_ns)
+    digest = _hash_cache.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(model_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+        digest = _hash_cache[key] = sha.hexdigest()
+    return digest
+
+
+def cpu_signature() -> str:
+    """
+    Identify the CPU features optimized graphs depend on.
+    
+    ORT_ENABLE_ALL layout transforms (e.g. NCHWc) are specific to the
+    instruction sets available, so an optimized model is only reused on a
+    CPU with the same architecture and feature flags.
+    
+    Returns:
+        Short hash of architecture + CPU flags
+    """
+    global _cpu_signature
+    if _cpu_signature is None:
+        parts = [platform.machine(), platform.processor()]
+        try:
+            with open('/proc/cpuinfo', 'r') as f:
+                for line in f:
+                    if line.startswith(('flags', 'Features')):
+                        parts.append(' '.join(sorted(line.split(':', 1)[1].split())))
+                        break
+        except OSError:
+            pass
+        _cpu_signature = hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+    return _cpu_signature
+
+
+def cache_key(model_path: Path, providers: List[str], level: str = 'all', model_format: str = 'onnx') -> str:
+    """
+    Cache key for an optimized model.
+    
+    Args:
+        model_path: Source ONNX model
+        providers: Execution providers the session will use
+        level: Optimization level name ('basic', 'extended', 'all')
+        model_format: 'onnx' or 'ort'
+    
+    Returns:
+        Key combining model hash, ORT version, providers, level and CPU features
+    """
+    material = '|'.join([
+        model_hash(model_path), ort.__version__, ','.join(providers), level, model_format, cpu_signature()
+    ])
+    return hashlib.sha256(material.encode()).hexdigest()[:24]
+
+
+def _build_lock(key: str) -> threading.Lock:
+    with _build_locks_guard:
+        lock = _build_locks.get(key)
+        if lock is None:
+            lock = _build_locks[key] = threading.Lock()
+        return lock
+
+
+def get_optimized_model(model_path: Path,
+                        cache_dir: Path,
+                        providers: List[str],
+                        level: str = 'all',
+                        model_format: str = 'onnx') -> Tuple[Path, bool]:
+    """
+    Get (building on first use) the optimized model for a source model.
+    
+    The optimized graph is produced by letting ONNX Runtime save the
+    session graph after optimization, then moved into place atomically so
+    concurrent processes never see a partial file.
+    
+    Args:
+        model_path: Source ONNX model
+        cache_dir: Directory for optimized models
+        providers: Execution providers (optimizations are provider specific)
+        level: Optimization level name ('basic', 'extended', 'all')
+        model_format: 'onnx' (optimized ONNX) or 'ort' (ORT flatbuffer format)
+    
+    Returns:
+        Tuple (path of optimized model, True if it was just built)
+    """
+    if level not in OPTIMIZATION_LEVELS:
+        raise ValueError(f"Unknown optimization level: {level}")
+    if model_format not in ('onnx', 'ort'):
+        raise ValueError(f"Unknown optimized model format: {model_format}")
+    
+    key = cache_key(model_path, providers, level, model_format)
+    cached = Path(cache_dir) / f"{model_path.stem}.{key}.{model_format}"
+    if cached.exists():
+        return cached, False
+    
+    with _build_lock(key):
+        if cached.exists():
+            return cached, False
+        
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cached.with_name(f"{cached.stem}.{os.getpid()}.tmp.{model_format}")
+        options = ort.SessionOptions()
+        options.graph_optimization_level = OPTIMIZATION_LEVELS[level]
+        options.optimized_model_filepath = str(temp_path)
+        if model_format == 'ort':
+            options.add_session_config_entry('session.save_model_format', 'ORT')
+        
+        start = time.perf_counter()
+        ort.InferenceSession(str(model_path), options, providers=providers)
+        os.replace(temp_path, cached)
+        _logger.info(
+            f"Optimized model cached: {cached.name} ({level}, {model_format}) "
+            f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return cached, True
+
+
+def session_options_for_cached() -> ort.SessionOptions:
+    """
+    Session options for loading a cached optimized model.
+    
+    Optimizations already applied offline are not run again.
+    
+    Returns:
+        SessionOptions with graph optimizations disabled
+    """
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    return options
+
+
+def clear_cache(cache_dir: Path, keep: Optional[List[Path]] = None) -> int:
+    """
+    Delete cached optimized models (e.g. after an ORT upgrade).
+    
+    Args:
+        cache_dir: Cache directory
+        keep: Paths to keep
+    
+    Returns:
+        Number of files deleted
+    """
+    keep_set = {Path(p).resolve() for p in keep or []}
+    removed = 0
+    for path in Path(cache_dir).glob('*.*'):
+        if path.suffix in ('.onnx', '.ort') and path.resolve() not in keep_set:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def get_cache_info(cache_dir: Path) -> Dict[str, Any]:
+    """
+    Describe the cache directory.
+    
+    Returns:
+        Dictionary with file count, total size and file names
+    """
+    files = [p for p in Path(cache_dir).glob('*') if p.suffix in ('.onnx', '.ort')] if Path(cache_dir).exists() else []
+    return {
+        'dir': str(cache_dir),
+        'files': sorted(p.name for p in files),
+        'total_bytes': sum(p.stat().st_size for p in files),
+        'ort_version': ort.__version__,
+        'cpu_signature': cpu_signature()
+    }
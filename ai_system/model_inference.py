@@ -1,6 +1,7 @@
 import logging
+import time
 import numpy as np
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 
 # Ultralytics YOLO for TensorRT
@@ -13,6 +14,9 @@ except ImportError:
 # ONNX Runtime support
 import onnxruntime as ort
 
+from .model_cache import get_optimized_model, session_options_for_cached
+from .cpu_executor import parse_cores
+
 
 class ModelInference:
     """
@@ -20,18 +24,30 @@ class ModelInference:
     Config-driven architecture following strict parameter centralization rules.
     """
     
-    def __init__(self, config_manager: Any):
+    def __init__(self,
+                 config_manager: Any,
+                 model_path: Optional[Path] = None,
+                 target_size: Optional[Tuple[int, int]] = None,
+                 engine_path: Optional[Path] = None):
         """
         Args:
             config_manager: ConfigurationManager instance to retrieve all parameters
+            model_path: ONNX model to load instead of model.path (model variants)
+            target_size: Input size (width, height) instead of model.target_size
+            engine_path: TensorRT engine for model_path; when model_path is given
+                the engine from model.tensorrt_engine_path is not used
         """
         self._config = config_manager
         self._logger = logging.getLogger(__name__)
         self._use_yolo = False
         
-        # Get paths from central config
-        engine_path_str = self._config.get('model.tensorrt_engine_path')
-        onnx_path_str = self._config.get('model.path')
+        # Get paths from central config (or from the variant overrides)
+        if model_path is not None:
+            engine_path_str = str(engine_path) if engine_path else None
+            onnx_path_str = str(model_path)
+        else:
+            engine_path_str = self._config.get('model.tensorrt_engine_path')
+            onnx_path_str = self._config.get('model.path')
         
         if not onnx_path_str:
             raise ValueError("model.path must be defined in config.json")
@@ -40,7 +56,7 @@ class ModelInference:
         self._onnx_path = Path(onnx_path_str)
         
         # Initialize basic metadata first (needed for warmup)
-        self._init_metadata()
+        self._init_metadata(target_size)
         
         # Select Backend (GPU TensorRT via YOLO -> CPU ONNX)
         backend_initialized = False
@@ -81,13 +97,16 @@ class ModelInference:
                 self._logger.error(f"CPU Backend (ONNX) warmup failed: {e}")
                 raise
 
-    def _init_metadata(self):
-        """Initialize model metadata from configuration."""
-        target_size_str = self._config.get('model.target_size')
-        if not target_size_str:
-             raise ValueError("model.target_size must be defined in config.json")
-             
-        w, h = map(int, target_size_str.split(','))
+    def _init_metadata(self, target_size: Optional[Tuple[int, int]] = None):
+        """Initialize model metadata from configuration (or the given target size)."""
+        if target_size is not None:
+            w, h = int(target_size[0]), int(target_size[1])
+        else:
+            target_size_str = self._config.get('model.target_size')
+            if not target_size_str:
+                 raise ValueError("model.target_size must be defined in config.json")
+                 
+            w, h = map(int, target_size_str.split(','))
         self._input_shape = (1, 3, h, w)
         self._output_shape = (1, 300, 6) # YOLO11n fixed output shape
         
@@ -125,9 +144,76 @@ class ModelInference:
         if 'CUDAExecutionProvider' in available:
              providers.insert(0, 'CUDAExecutionProvider')
              
-        self._session = ort.InferenceSession(str(onnx_path), providers=providers)
+        self._session = self._create_onnx_session(onnx_path, providers)
         self._onnx_input_name = self._session.get_inputs()[0].name
         self._onnx_output_names = [o.name for o in self._session.get_outputs()]
+        
+        # Prefer the real output shape when the model declares it statically
+        output_shape = self._session.get_outputs()[0].shape
+        if all(isinstance(dim, int) for dim in output_shape):
+            self._output_shape = tuple(output_shape)
+            self._output_info['output0']['shape'] = self._output_shape
+    
+    def _create_onnx_session(self, onnx_path: Path, providers: List[str]) -> ort.InferenceSession:
+        """
+        Create the ONNX Runtime session, from the optimized-model cache when enabled.
+        
+        The first instance optimizes the graph once and writes it to
+        model.optimization_cache.dir (keyed by model hash, ORT version,
+        providers and CPU features); every later instance and restart loads
+        the optimized file with graph optimizations disabled.
+        """
+        cache_config = self._config.get('model.optimization_cache', {}) or {}
+        if cache_config.get('enabled', False):
+            try:
+                start = time.perf_counter()
+                cached_path, built = get_optimized_model(
+                    onnx_path,
+                    Path(cache_config.get('dir', 'Model_train/.cache')),
+                    providers,
+                    level=cache_config.get('level', 'all'),
+                    model_format=cache_config.get('format', 'onnx')
+                )
+                session = ort.InferenceSession(
+                    str(cached_path), self._apply_thread_options(session_options_for_cached()), providers=providers
+                )
+                self._logger.info(
+                    f"ONNX session from {'new' if built else 'cached'} optimized model {cached_path.name} "
+                    f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+                )
+                return session
+            except Exception as e:
+                self._logger.warning(f"Optimized model cache unavailable ({e}), loading {onnx_path} directly")
+        
+        return ort.InferenceSession(
+            str(onnx_path), self._apply_thread_options(ort.SessionOptions()), providers=providers
+        )
+    
+    def _apply_thread_options(self, options: ort.SessionOptions) -> ort.SessionOptions:
+        """
+        Apply the inference thread budget from config to session options.
+        
+        model.intra_op_threads limits the ONNX Runtime intra-op pool of each
+        model instance (0 = ORT default, one thread per core). With
+        model.inference_cores the pool threads are pinned to those cores,
+        leaving the other cores to the image executor (cpu_executor).
+        ORT pins the N-1 pool threads; thread 1 is the calling thread.
+        model.intra_op_spinning=false stops idle pool threads from
+        busy-waiting on cores other work needs.
+        """
+        cores = parse_cores(self._config.get('model.inference_cores', []))
+        threads = int(self._config.get('model.intra_op_threads', 0) or 0)
+        if cores and not threads:
+            threads = len(cores)
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        if cores and threads > 1:
+            # 1-based logical processor ids, one entry per pool thread
+            pinned = [cores[i % len(cores)] + 1 for i in range(1, threads)]
+            options.add_session_config_entry('session.intra_op_thread_affinities', ';'.join(map(str, pinned)))
+        if not self._config.get('model.intra_op_spinning', True):
+            options.add_session_config_entry('session.intra_op.allow_spinning', '0')
+        return options
     
     def _warmup(self):
         """Pre-heat the model to avoid latency on first request."""
@@ -0,0 +1,306 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+from .config_manager import ConfigurationManager
+from .frame_processor import FrameProcessor
+from .model_inference import ModelInference
+from .metrics import get_registry
+
+DEFAULT_VARIANT = 'default'
+
+
+@dataclass
+class ModelVariant:
+    """Data class untuk satu varian model (file, ukuran input, pool sendiri)."""
+    name: str
+    processor: FrameProcessor
+    path: Path
+    target_size: Tuple[int, int]
+    latency_slo_ms: Optional[float] = None  # None = no latency-based fallback
+    description: str = ''
+
+
+class ModelRegistry:
+    """
+    Registry varian model dengan pool masing-masing dan policy pemilihan per request.
+    
+    The default variant is the FrameProcessor built from model.* config.
+    Additional variants (other input sizes, int8 models, other class sets)
+    come from model.registry.variants and get their own FrameProcessor and
+    model pool, created lazily on first use.
+    
+    select() picks the variant for a request:
+    
+    1. the client hint, if hints are allowed and it names a known variant;
+    2. the default variant, unless it is overloaded (every pooled model is
+       busy, or its latency EWMA is above its SLO) and a fallback variant is
+       configured that is not overloaded itself; then the fallback.
+    
+    Latency is only sampled for the variant that served a request, so
+    while traffic goes to the fallback the default gets no new samples.
+    The EWMA therefore decays towards zero with latency_half_life_s since
+    its last sample: a default that was over its SLO gets traffic (and
+    fresh samples) again after a few half-lives instead of staying in
+    fallback until the fallback pool is saturated.
+    """
+    
+    def __init__(self, config_manager: ConfigurationManager, default_processor: FrameProcessor):
+        """
+        Initialize ModelRegistry.
+        
+        Args:
+            config_manager: ConfigurationManager instance
+            default_processor: FrameProcessor for model.path (the default variant)
+        """
+        self._logger = logging.getLogger(__name__)
+        self._config_manager = config_manager
+        
+        registry_config = config_manager.get('model.registry', {}) or {}
+        self._allow_client_hint = registry_config.get('allow_client_hint', True)
+        self._fallback_variant: Optional[str] = registry_config.get('fallback_variant')
+        self._ewma_alpha = float(registry_config.get('ewma_alpha', 0.2))
+        self._latency_half_life = float(registry_config.get('latency_half_life_s', 5.0) or 0.0)
+        
+        self._variants: Dict[str, ModelVariant] = {}
+        self._latency_ewma: Dict[str, float] = {}
+        self._latency_sampled_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hint': 0, 'default': 0, 'fallback': 0, 'unknown_hint': 0}
+        
+        metrics = get_registry()
+        self._selected_total = metrics.counter(
+            'ai_model_selected_total', 'Requests routed to each model variant', ['variant', 'reason']
+        )
+        self._selected_children: Dict[Tuple[str, str], Any] = {}
+        self._latency_gauge = metrics.gauge(
+            'ai_model_latency_ewma_seconds', 'Smoothed processing latency per model variant', ['variant']
+        )
+        # Pool gauges per variant (every variant has its own FrameProcessor and pool)
+        self._pool_size_gauge = metrics.gauge(
+            'ai_model_pool_size', 'Model instances created (idle + in use) per model variant', ['variant']
+        )
+        self._pool_in_use_gauge = metrics.gauge(
+            'ai_model_pool_in_use', 'Model instances currently in use per model variant', ['variant']
+        )
+        self._pool_max_size_gauge = metrics.gauge(
+            'ai_model_pool_max_size', 'Maximum model instances per model variant', ['variant']
+        )
+        
+        default_slo = registry_config.get('latency_slo_ms') or None
+        self.register_variant(ModelVariant(
+            name=DEFAULT_VARIANT,
+            processor=default_processor,
+            path=Path(config_manager.get('model.path', 'Model_train/best.onnx')),
+            target_size=default_processor.get_target_size(),
+            latency_slo_ms=default_slo,
+            description='model.path'
+        ))
+        
+        if registry_config.get('enabled', False):
+            for spec in registry_config.get('variants', []) or []:
+                try:
+                    self.register_variant(self._create_variant(spec))
+                except Exception as e:
+                    self._logger.error(f"Skipping model variant {spec.get('name', '?')}: {e}")
+        
+        if self._fallback_variant and self._fallback_variant not in self._variants:
+            self._logger.warning(f"Fallback variant '{self._fallback_variant}' is not registered, fallback disabled")
+            self._fallback_variant = None
+        
+        self._logger.info(
+            f"ModelRegistry initialized - variants: {self.variant_names()}, "
+            f"fallback: {self._fallback_variant}, client hints: {self._allow_client_hint}"
+        )
+    
+    def _create_variant(self, spec: Dict[str, Any]) -> ModelVariant:
+        """
+        Build a variant from a model.registry.variants entry.
+        
+        Args:
+            spec: {name, path, target_size, engine_path?, class_names?, pool_size?,
+                   normalize?, latency_slo_ms?, description?}
+        
+        Returns:
+            ModelVariant with its own FrameProcessor and pool
+        """
+        name = spec['name']
+        path = Path(spec['path'])
+        if not path.exists():
+            raise FileNotFoundError(f"model file not found: {path}")
+        
+        target_size = tuple(int(v) for v in str(spec['target_size']).split(','))
+        if len(target_size) != 2:
+            raise ValueError(f"invalid target_size: {spec['target_size']}")
+        engine_path = Path(spec['engine_path']) if spec.get('engine_path') else None
+        config_manager = self._config_manager
+        
+        processor = FrameProcessor(
+            model_path=path,
+            config_manager=config_manager,
+            pool_size=spec.get('pool_size', 2),
+            target_size=target_size,
+            normalize=spec.get('normalize'),
+            class_names=spec.get('class_names'),
+            model_factory=lambda: ModelInference(
+                config_manager, model_path=path, target_size=target_size, engine_path=engine_path
+            )
+        )
+        return ModelVariant(
+            name=name,
+            processor=processor,
+            path=path,
+            target_size=target_size,
+            latency_slo_ms=spec.get('latency_slo_ms'),
+            description=spec.get('description', '')
+        )
+    
+    def register_variant(self, variant: ModelVariant) -> None:
+        """
+        Register (or replace) a model variant.
+        
+        Args:
+            variant: ModelVariant to register
+        """
+        with self._lock:
+            self._variants[variant.name] = variant
+            self._latency_ewma.setdefault(variant.name, 0.0)
+        self._latency_gauge.labels(variant.name).set_function(
+            lambda name=variant.name: self.latency(name)
+        )
+        pool_stats = variant.processor.get_pool_stats
+        self._pool_size_gauge.labels(variant.name).set_function(
+            lambda: sum(pool_stats()[key] for key in ('pool_size', 'in_use'))
+        )
+        self._pool_in_use_gauge.labels(variant.name).set_function(lambda: pool_stats()['in_use'])
+        self._pool_max_size_gauge.labels(variant.name).set_function(lambda: pool_stats()['max_size'])
+        self._logger.info(
+            f"Model variant registered: {variant.name} ({variant.path}, "
+            f"{variant.target_size[0]}x{variant.target_size[1]}, SLO: {variant.latency_slo_ms or '-'}ms)"
+        )
+    
+    def get_variant(self, name: str) -> Optional[ModelVariant]:
+        return self._variants.get(name)
+    
+    def get_default(self) -> ModelVariant:
+        return self._variants[DEFAULT_VARIANT]
+    
+    def variant_names(self) -> List[str]:
+        return list(self._variants.keys())
+    
+    def is_overloaded(self, variant: ModelVariant) -> bool:
+        """
+        Check whether a variant would make the request queue or miss its SLO.
+        
+        Args:
+            variant: ModelVariant to check
+        
+        Returns:
+            True if every pooled model is busy or the latency EWMA exceeds the SLO
+        """
+        pool_stats = variant.processor.get_pool_stats()
+        if pool_stats['in_use'] >= pool_stats['max_size']:
+            return True
+        if variant.latency_slo_ms:
+            return self.latency(variant.name) * 1000.0 > variant.latency_slo_ms
+        return False
+    
+    def latency(self, name: str) -> float:
+        """
+        Latency EWMA of a variant, decayed by the time since its last sample.
+        
+        Args:
+            name: Variant name
+        
+        Returns:
+            Smoothed latency in seconds (0.0 = no samples)
+        """
+        ewma = self._latency_ewma.get(name, 0.0)
+        if ewma == 0.0 or self._latency_half_life <= 0.0:
+            return ewma
+        age = time.monotonic() - self._latency_sampled_at.get(name, 0.0)
+        return ewma * 0.5 ** (max(0.0, age) / self._latency_half_life)
+    
+    def select(self, hint: Optional[str] = None) -> ModelVariant:
+        """
+        Choose the variant for one request.
+        
+        Args:
+            hint: Variant name requested by the client (e.g. x-model-variant metadata)
+        
+        Returns:
+            Selected ModelVariant
+        """
+        if hint and self._allow_client_hint:
+            variant = self._variants.get(hint)
+            if variant is not None:
+                self._count(variant.name, 'hint')
+                return variant
+            self._stats['unknown_hint'] += 1
+        
+        default = self._variants[DEFAULT_VARIANT]
+        if self._fallback_variant and self.is_overloaded(default):
+            fallback = self._variants[self._fallback_variant]
+            if not self.is_overloaded(fallback):
+                self._count(fallback.name, 'fallback')
+                return fallback
+        
+        self._count(default.name, 'default')
+        return default
+    
+    def _count(self, name: str, reason: str) -> None:
+        self._stats[reason] += 1
+        child = self._selected_children.get((name, reason))
+        if child is None:
+            child = self._selected_children[(name, reason)] = self._selected_total.labels(name, reason)
+        child.inc()
+    
+    def record_latency(self, name: str, seconds: float) -> None:
+        """
+        Update the latency EWMA of a variant.
+        
+        Args:
+            name: Variant name
+            seconds: Processing time of one request
+        """
+        with self._lock:
+            previous = self.latency(name)
+            if previous == 0.0:
+                self._latency_ewma[name] = seconds
+            else:
+                self._latency_ewma[name] = previous + self._ewma_alpha * (seconds - previous)
+            self._latency_sampled_at[name] = time.monotonic()
+    
+    def prewarm(self) -> int:
+        """
+        Create every model instance of every variant pool.
+        
+        Returns:
+            Total number of model instances created
+        """
+        return sum(variant.processor.prewarm_pool() for variant in list(self._variants.values()))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get registry statistics.
+        
+        Returns:
+            Dictionary with selection counts and per-variant pool/latency state
+        """
+        variants = {}
+        for name, variant in list(self._variants.items()):
+            variants[name] = {
+                'path': str(variant.path),
+                'target_size': list(variant.target_size),
+                'latency_ewma_ms': self.latency(name) * 1000.0,
+                'latency_slo_ms': variant.latency_slo_ms,
+                'pool': variant.processor.get_pool_stats()
+            }
+        return {
+            'selection': dict(self._stats),
+            'fallback_variant': self._fallback_variant,
+            'variants': variants
+        }
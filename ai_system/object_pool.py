@@ -1,8 +1,14 @@
+import itertools
 import logging
 import time
-from typing import Generic, TypeVar, Optional, List, Callable
+from collections import deque
+from typing import Generic, TypeVar, Optional, List, Callable, Dict, Any
 from threading import Lock, Condition
 
+from .thread_pool import TaskPriority
+
+PRIORITY_POLICIES = ('strict', 'weighted')
+
 T = TypeVar('T')
 
 class ObjectPool(Generic[T]):
@@ -40,7 +46,57 @@ class ObjectPool(Generic[T]):
         self._cond = Condition(self._lock)
         self._logger = logging.getLogger(__name__)
         
-    def acquire(self) -> T:
+        # Priority scheduling of waiters (None = unordered, set_priority_policy)
+        self._priority_policy: Optional[str] = None
+        self._priority_weights: Dict[int, float] = {}
+        self._reserved_slots: Dict[int, int] = {}
+        self._waiters: Dict[int, deque] = {}  # priority value -> tickets in arrival order
+        self._virtual_time: Dict[int, float] = {}
+        self._virtual_clock = 0.0
+        self._tickets = itertools.count()
+        self._grants: Dict[int, int] = {}
+        
+    def set_priority_policy(self,
+                            policy: Optional[str],
+                            weights: Optional[Dict[TaskPriority, float]] = None,
+                            reserved_slots: Optional[Dict[TaskPriority, int]] = None) -> None:
+        """
+        Mengatur urutan pemberian objek ke thread yang menunggu berdasarkan prioritas.
+        
+        Policies:
+            strict:   the highest priority waiter always goes first (FIFO within a priority)
+            weighted: waiting priorities share freed objects in proportion to
+                      their weights, so low priority work still progresses
+        
+        reserved_slots keeps objects out of reach of lower priorities: with
+        {HIGH: 1} MEDIUM and LOW callers can hold at most max_size - 1
+        objects, so a HIGH caller never waits behind a full pool of long
+        running low priority work.
+        
+        Args:
+            policy: 'strict', 'weighted' or None (unordered, the default)
+            weights: Relative share per priority for 'weighted' (default: 1 each)
+            reserved_slots: Objects only usable by the given priority and above
+        """
+        if policy is not None and policy not in PRIORITY_POLICIES:
+            raise ValueError(f"Unknown priority policy: {policy} (expected one of {PRIORITY_POLICIES})")
+        weights = weights or {}
+        if any(weight <= 0 for weight in weights.values()):
+            raise ValueError("Priority weights must be positive")
+        
+        with self._cond:
+            self._priority_policy = policy
+            self._priority_weights = {priority.value: float(weight) for priority, weight in weights.items()}
+            self._reserved_slots = {
+                priority.value: int(slots) for priority, slots in (reserved_slots or {}).items() if int(slots) > 0
+            }
+            self._cond.notify_all()
+        
+        self._logger.info(
+            f"Pool priority policy: {policy}, weights={self._priority_weights}, reserved={self._reserved_slots}"
+        )
+    
+    def acquire(self, priority: TaskPriority = TaskPriority.MEDIUM) -> T:
         """
         Mendapatkan objek dari pool.
         Jika pool kosong dan belum mencapai max_size, buat objek baru.
@@ -48,9 +104,15 @@ class ObjectPool(Generic[T]):
            - Jika block=True, tunggu sampai ada objek kembali.
            - Jika block=False, buat objek baru sementara (burst mode, hati-hati memory leak).
         
+        Args:
+            priority: Prioritas pemanggil (dipakai jika set_priority_policy aktif)
+        
         Returns:
             Objek yang siap digunakan
         """
+        if self._priority_policy is not None:
+            return self._acquire_scheduled(priority.value)
+        
         with self._cond:
             # Cek apakah ada objek nganggur di pool
             while not self._pool:
@@ -86,6 +148,61 @@ class ObjectPool(Generic[T]):
             self._logger.debug(f"Object acquired from pool. In use: {self._in_use_count}/{self._max_size}")
             return obj
     
+    def _slot_limit(self, level: int) -> int:
+        """Objects a caller of this priority may hold (max_size minus slots reserved above it)."""
+        reserved = sum(slots for reserved_level, slots in self._reserved_slots.items() if reserved_level > level)
+        return max(1, self._max_size - reserved)
+    
+    def _eligible(self, level: int) -> bool:
+        return self._in_use_count < self._slot_limit(level) and (
+            bool(self._pool) or self._in_use_count < self._max_size
+        )
+    
+    def _next_level(self) -> Optional[int]:
+        """Priority whose oldest waiter gets the next object under the current policy."""
+        waiting = [level for level, tickets in self._waiters.items() if tickets and self._eligible(level)]
+        if not waiting:
+            return None
+        if self._priority_policy == 'strict':
+            return max(waiting)
+        # Weighted: smallest virtual time (grants / weight), ties to the higher priority
+        return min(waiting, key=lambda level: (self._virtual_time.get(level, 0.0), -level))
+    
+    def _acquire_scheduled(self, level: int) -> T:
+        """acquire() when waiters are ordered by priority."""
+        with self._cond:
+            ticket = next(self._tickets)
+            tickets = self._waiters.setdefault(level, deque())
+            if not tickets:
+                # A priority that was idle starts at the current virtual clock (no banked credit)
+                self._virtual_time[level] = max(self._virtual_time.get(level, 0.0), self._virtual_clock)
+            tickets.append(ticket)
+            deadline = time.monotonic() + self._timeout
+            try:
+                while True:
+                    if tickets[0] == ticket and self._next_level() == level:
+                        break
+                    if not self._block and not self._eligible(level):
+                        self._logger.warning(f"Pool limit reached ({self._max_size}), creating temporary burst object!")
+                        return self._create_object()
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait(timeout=remaining):
+                        raise TimeoutError(f"Timed out waiting for object from pool after {self._timeout}s")
+                
+                if self._pool:
+                    obj = self._pool.pop()
+                else:
+                    obj = self._create_object()
+                self._in_use_count += 1
+                self._grants[level] = self._grants.get(level, 0) + 1
+                self._virtual_clock = self._virtual_time.get(level, 0.0)
+                self._virtual_time[level] = self._virtual_clock + 1.0 / self._priority_weights.get(level, 1.0)
+                return obj
+            finally:
+                tickets.remove(ticket)
+                # The next waiter (possibly of another priority) may now be first in line
+                self._cond.notify_all()
+    
     def release(self, obj: T) -> None:
         """
         Mengembalikan objek ke pool.
@@ -103,23 +220,93 @@ class ObjectPool(Generic[T]):
                     # Jangan kembalikan objek rusak ke pool
                     if self._in_use_count > 0:
                         self._in_use_count -= 1
-                    self._cond.notify()
+                    self._notify_waiters()
                     return
 
             # Cek apakah objek ini bagian dari tracked pool atau burst object
             if self._in_use_count > 0:
                 self._in_use_count -= 1
                 
+                # Pool sudah diperkecil (set_max_size), buang objek yang berlebih
+                if len(self._pool) + self._in_use_count >= self._max_size:
+                    self._logger.debug(f"Object discarded, pool shrunk to {self._max_size}")
+                    self._notify_waiters()
+                    return
+                
                 # Kembalikan ke pool
                 self._pool.append(obj)
                 self._logger.debug(f"Object returned. Pool size: {len(self._pool)}, In use: {self._in_use_count}")
                 
                 # Beritahu thread yang menunggu
-                self._cond.notify()
+                self._notify_waiters()
             else:
                 # Ini aneh, mungkin burst object atau logic error, discard saja
                 self._logger.warning("Object released but tracking count is 0 (discarding)")
 
+    def _notify_waiters(self) -> None:
+        """Wake a waiter; with a priority policy all of them, only the chosen one proceeds."""
+        if self._priority_policy is not None:
+            self._cond.notify_all()
+        else:
+            self._cond.notify()
+    
+    def prewarm(self, count: Optional[int] = None) -> int:
+        """
+        Membuat objek di depan sehingga request pertama tidak menanggung biaya inisialisasi.
+        
+        Args:
+            count: Jumlah objek idle yang diinginkan (default: max_size)
+            
+        Returns:
+            Jumlah objek baru yang dibuat
+        """
+        target = self._max_size if count is None else min(count, self._max_size)
+        created = 0
+        
+        with self._cond:
+            while len(self._pool) + self._in_use_count < target:
+                self._pool.append(self._create_object())
+                created += 1
+            self._cond.notify_all()
+        
+        self._logger.info(f"Pool prewarmed: {created} objects created, {len(self._pool)} idle")
+        return created
+    
+    def set_max_size(self, max_size: int) -> int:
+        """
+        Mengubah kapasitas pool saat runtime.
+        
+        Objek idle yang melebihi kapasitas baru langsung dibuang; objek yang
+        sedang dipakai dibuang saat dikembalikan.
+        
+        Args:
+            max_size: Kapasitas baru (minimal 1)
+            
+        Returns:
+            Jumlah objek idle yang dibuang
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        
+        with self._cond:
+            old_size = self._max_size
+            self._max_size = max_size
+            
+            dropped = 0
+            while self._pool and len(self._pool) + self._in_use_count > max_size:
+                self._pool.pop()
+                dropped += 1
+            
+            # Bangunkan thread yang menunggu jika kapasitas bertambah
+            self._cond.notify_all()
+        
+        self._logger.info(f"Pool max_size changed {old_size} -> {max_size}, {dropped} idle objects dropped")
+        return dropped
+    
+    def get_max_size(self) -> int:
+        with self._lock:
+            return self._max_size
+    
     def size(self) -> int:
         with self._lock:
             return len(self._pool)
@@ -128,6 +315,21 @@ class ObjectPool(Generic[T]):
         with self._lock:
             return self._in_use_count
     
+    def get_priority_stats(self) -> Dict[str, Any]:
+        """
+        Waiters and grants per priority (only meaningful with a priority policy).
+        
+        Returns:
+            Dictionary with policy, waiting and granted counts keyed by priority name
+        """
+        with self._lock:
+            return {
+                'policy': self._priority_policy,
+                'waiting': {TaskPriority(level).name: len(t) for level, t in self._waiters.items() if t},
+                'granted': {TaskPriority(level).name: count for level, count in self._grants.items()},
+                'slot_limits': {priority.name: self._slot_limit(priority.value) for priority in TaskPriority}
+            }
+    
     def clear(self) -> None:
         with self._lock:
             self._pool.clear()
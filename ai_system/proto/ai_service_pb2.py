@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10\x61i_service.proto\x12\nai_service\"\x07\n\x05\x45mpty\"S\n\x0c\x46rameRequest\x12\x12\n\nframe_data\x18\x01 \x01(\x0c\x12\r\n\x05width\x18\x02 \x01(\x05\x12\x0e\n\x06height\x18\x03 \x01(\x05\x12\x10\n\x08\x63hannels\x18\x04 \x01(\x05\"B\n\x04\x42\x42ox\x12\r\n\x05x_min\x18\x01 \x01(\x02\x12\r\n\x05y_min\x18\x02 \x01(\x02\x12\r\n\x05x_max\x18\x03 \x01(\x02\x12\r\n\x05y_max\x18\x04 \x01(\x02\"S\n\tDetection\x12\x12\n\nclass_name\x18\x01 \x01(\t\x12\x12\n\nconfidence\x18\x02 \x01(\x02\x12\x1e\n\x04\x62\x62ox\x18\x03 \x01(\x0b\x32\x10.ai_service.BBox\"6\n\tAIResults\x12)\n\ndetections\x18\x01 \x03(\x0b\x32\x15.ai_service.Detection\"\x9d\x01\n\rFrameResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x10\n\x08\x66rame_id\x18\x03 \x01(\t\x12\x11\n\ttimestamp\x18\x04 \x01(\t\x12\x1a\n\x12processing_time_ms\x18\x05 \x01(\x02\x12)\n\nai_results\x18\x06 \x01(\x0b\x32\x15.ai_service.AIResults\"=\n\x11\x42\x61tchFrameRequest\x12(\n\x06\x66rames\x18\x01 \x03(\x0b\x32\x18.ai_service.FrameRequest\"\x83\x01\n\x12\x42\x61tchFrameResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12,\n\tresponses\x18\x03 \x03(\x0b\x32\x19.ai_service.FrameResponse\x12\x1d\n\x15total_processing_time\x18\x04 \x01(\x02\"\xa3\x02\n\x11ModelInfoResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\nmodel_path\x18\x02 \x01(\t\x12@\n\ninput_info\x18\x03 \x03(\x0b\x32,.ai_service.ModelInfoResponse.InputInfoEntry\x12\x42\n\x0boutput_info\x18\x04 \x03(\x0b\x32-.ai_service.ModelInfoResponse.OutputInfoEntry\x1a\x30\n\x0eInputInfoEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x31\n\x0fOutputInfoEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"Y\n\x13ServerStatsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tpool_size\x18\x02 \x01(\x05\x12\x0e\n\x06in_use\x18\x03 \x01(\x05\x12\x0e\n\x06status\x18\x04 \x01(\t2\xad\x02\n\tAIService\x12\x43\n\x0cProcessFrame\x12\x18.ai_service.FrameRequest\x1a\x19.ai_service.FrameResponse\x12S\n\x12ProcessBatchFrames\x12\x1d.ai_service.BatchFrameRequest\x1a\x1e.ai_service.BatchFrameResponse\x12@\n\x0cGetModelInfo\x12\x11.ai_service.Empty\x1a\x1d.ai_service.ModelInfoResponse\x12\x44\n\x0eGetServerStats\x12\x11.ai_service.Empty\x1a\x1f.ai_service.ServerStatsResponseB\x11Z\x0fgo_server/protob\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10\x61i_service.proto\x12\nai_service\"\x07\n\x05\x45mpty\"\xac\x01\n\x0c\x46rameRequest\x12\x12\n\nframe_data\x18\x01 \x01(\x0c\x12\r\n\x05width\x18\x02 \x01(\x05\x12\x0e\n\x06height\x18\x03 \x01(\x05\x12\x10\n\x08\x63hannels\x18\x04 \x01(\x05\x12\x0e\n\x06\x66ormat\x18\x05 \x01(\t\x12\x10\n\x08\x63olumnar\x18\x06 \x01(\x08\x12\x10\n\x08shm_slot\x18\x07 \x01(\r\x12\x12\n\nshm_length\x18\x08 \x01(\r\x12\x0f\n\x07shm_seq\x18\t \x01(\x04\"B\n\x04\x42\x42ox\x12\r\n\x05x_min\x18\x01 \x01(\x02\x12\r\n\x05y_min\x18\x02 \x01(\x02\x12\r\n\x05x_max\x18\x03 \x01(\x02\x12\r\n\x05y_max\x18\x04 \x01(\x02\"S\n\tDetection\x12\x12\n\nclass_name\x18\x01 \x01(\t\x12\x12\n\nconfidence\x18\x02 \x01(\x02\x12\x1e\n\x04\x62\x62ox\x18\x03 \x01(\x0b\x32\x10.ai_service.BBox\"`\n\x10\x44\x65tectionColumns\x12\r\n\x05\x62oxes\x18\x01 \x03(\x02\x12\x13\n\x0b\x63onfidences\x18\x02 \x03(\x02\x12\x13\n\x0b\x63lass_index\x18\x03 \x03(\x05\x12\x13\n\x0b\x63lass_names\x18\x04 \x03(\t\"e\n\tAIResults\x12)\n\ndetections\x18\x01 \x03(\x0b\x32\x15.ai_service.Detection\x12-\n\x07\x63olumns\x18\x02 \x01(\x0b\x32\x1c.ai_service.DetectionColumns\"\x9d\x01\n\rFrameResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x10\n\x08\x66rame_id\x18\x03 \x01(\t\x12\x11\n\ttimestamp\x18\x04 \x01(\t\x12\x1a\n\x12processing_time_ms\x18\x05 \x01(\x02\x12)\n\nai_results\x18\x06 \x01(\x0b\x32\x15.ai_service.AIResults\"=\n\x11\x42\x61tchFrameRequest\x12(\n\x06\x66rames\x18\x01 \x03(\x0b\x32\x18.ai_service.FrameRequest\"\x83\x01\n\x12\x42\x61tchFrameResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12,\n\tresponses\x18\x03 \x03(\x0b\x32\x19.ai_service.FrameResponse\x12\x1d\n\x15total_processing_time\x18\x04 \x01(\x02\"\xa3\x02\n\x11ModelInfoResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\nmodel_path\x18\x02 \x01(\t\x12@\n\ninput_info\x18\x03 \x03(\x0b\x32,.ai_service.ModelInfoResponse.InputInfoEntry\x12\x42\n\x0boutput_info\x18\x04 \x03(\x0b\x32-.ai_service.ModelInfoResponse.OutputInfoEntry\x1a\x30\n\x0eInputInfoEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x31\n\x0fOutputInfoEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"Y\n\x13ServerStatsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tpool_size\x18\x02 \x01(\x05\x12\x0e\n\x06in_use\x18\x03 \x01(\x05\x12\x0e\n\x06status\x18\x04 \x01(\t2\xad\x02\n\tAIService\x12\x43\n\x0cProcessFrame\x12\x18.ai_service.FrameRequest\x1a\x19.ai_service.FrameResponse\x12S\n\x12ProcessBatchFrames\x12\x1d.ai_service.BatchFrameRequest\x1a\x1e.ai_service.BatchFrameResponse\x12@\n\x0cGetModelInfo\x12\x11.ai_service.Empty\x1a\x1d.ai_service.ModelInfoResponse\x12\x44\n\x0eGetServerStats\x12\x11.ai_service.Empty\x1a\x1f.ai_service.ServerStatsResponseB\x11Z\x0fgo_server/protob\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -38,28 +38,30 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_MODELINFORESPONSE_OUTPUTINFOENTRY']._serialized_options = b'8\001'
   _globals['_EMPTY']._serialized_start=32
   _globals['_EMPTY']._serialized_end=39
-  _globals['_FRAMEREQUEST']._serialized_start=41
-  _globals['_FRAMEREQUEST']._serialized_end=124
-  _globals['_BBOX']._serialized_start=126
-  _globals['_BBOX']._serialized_end=192
-  _globals['_DETECTION']._serialized_start=194
-  _globals['_DETECTION']._serialized_end=277
-  _globals['_AIRESULTS']._serialized_start=279
-  _globals['_AIRESULTS']._serialized_end=333
-  _globals['_FRAMERESPONSE']._serialized_start=336
-  _globals['_FRAMERESPONSE']._serialized_end=493
-  _globals['_BATCHFRAMEREQUEST']._serialized_start=495
-  _globals['_BATCHFRAMEREQUEST']._serialized_end=556
-  _globals['_BATCHFRAMERESPONSE']._serialized_start=559
-  _globals['_BATCHFRAMERESPONSE']._serialized_end=690
-  _globals['_MODELINFORESPONSE']._serialized_start=693
-  _globals['_MODELINFORESPONSE']._serialized_end=984
-  _globals['_MODELINFORESPONSE_INPUTINFOENTRY']._serialized_start=885
-  _globals['_MODELINFORESPONSE_INPUTINFOENTRY']._serialized_end=933
-  _globals['_MODELINFORESPONSE_OUTPUTINFOENTRY']._serialized_start=935
-  _globals['_MODELINFORESPONSE_OUTPUTINFOENTRY']._serialized_end=984
-  _globals['_SERVERSTATSRESPONSE']._serialized_start=986
-  _globals['_SERVERSTATSRESPONSE']._serialized_end=1075
-  _globals['_AISERVICE']._serialized_start=1078
-  _globals['_AISERVICE']._serialized_end=1379
+  _globals['_FRAMEREQUEST']._serialized_start=42
+  _globals['_FRAMEREQUEST']._serialized_end=214
+  _globals['_BBOX']._serialized_start=216
+  _globals['_BBOX']._serialized_end=282
+  _globals['_DETECTION']._serialized_start=284
+  _globals['_DETECTION']._serialized_end=367
+  _globals['_DETECTIONCOLUMNS']._serialized_start=369
+  _globals['_DETECTIONCOLUMNS']._serialized_end=465
+  _globals['_AIRESULTS']._serialized_start=467
+  _globals['_AIRESULTS']._serialized_end=568
+  _globals['_FRAMERESPONSE']._serialized_start=571
+  _globals['_FRAMERESPONSE']._serialized_end=728
+  _globals['_BATCHFRAMEREQUEST']._serialized_start=730
+  _globals['_BATCHFRAMEREQUEST']._serialized_end=791
+  _globals['_BATCHFRAMERESPONSE']._serialized_start=794
+  _globals['_BATCHFRAMERESPONSE']._serialized_end=925
+  _globals['_MODELINFORESPONSE']._serialized_start=928
+  _globals['_MODELINFORESPONSE']._serialized_end=1219
+  _globals['_MODELINFORESPONSE_INPUTINFOENTRY']._serialized_start=1120
+  _globals['_MODELINFORESPONSE_INPUTINFOENTRY']._serialized_end=1168
+  _globals['_MODELINFORESPONSE_OUTPUTINFOENTRY']._serialized_start=1170
+  _globals['_MODELINFORESPONSE_OUTPUTINFOENTRY']._serialized_end=1219
+  _globals['_SERVERSTATSRESPONSE']._serialized_start=1221
+  _globals['_SERVERSTATSRESPONSE']._serialized_end=1310
+  _globals['_AISERVICE']._serialized_start=1313
+  _globals['_AISERVICE']._serialized_end=1614
 # @@protoc_insertion_point(module_scope)
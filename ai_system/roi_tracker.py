@@ -0,0 +1,265 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Dict, Any
+
+import numpy as np
+
+from .metrics import get_registry
+
+# A box this close (normalized) to a cropped edge may continue outside the crop
+_EDGE_EPSILON = 0.01
+
+
+@dataclass
+class RoiWindow:
+    """Data class untuk jendela ROI satu frame (piksel frame penuh, batas kanan/bawah eksklusif)."""
+    session: str
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    frame_w: int
+    frame_h: int
+    
+    @property
+    def cropped(self) -> bool:
+        return (self.x0, self.y0, self.x1, self.y1) != (0, 0, self.frame_w, self.frame_h)
+    
+    @property
+    def width(self) -> int:
+        return self.x1 - self.x0
+    
+    @property
+    def height(self) -> int:
+        return self.y1 - self.y0
+
+
+class _SessionState:
+    __slots__ = ('history', 'frames_since_full', 'force_full', 'last_seen')
+    
+    def __init__(self, history_frames: int):
+        # Union box (normalized x0, y0, x1, y1) per recent frame, None = no detections
+        self.history = deque(maxlen=history_frames)
+        self.frames_since_full = 0
+        self.force_full = True
+        self.last_seen = time.monotonic()
+
+
+class RoiTracker:
+    """
+    Kelas untuk melacak region of interest per session dari deteksi sebelumnya.
+    
+    For tray scanning the objects stay in one part of the frame. The
+    tracker keeps the union of the detection boxes of the last
+    history_frames frames per session and proposes that region, grown by
+    a margin, as the crop for the next frame. The crop is taken at full
+    resolution before the resize to target_size, so small items get more
+    model pixels at the same model cost.
+    
+    A full frame is used instead when the session has no detections yet,
+    every full_frame_every frames (to find objects outside the region),
+    after a cropped frame without detections or with a box touching a
+    cropped edge, and when the crop would cover more than max_area of the
+    frame anyway. With keep_aspect the crop has the frame's aspect ratio,
+    so stretch resizing distorts objects the way the model was trained on.
+    """
+    
+    def __init__(self,
+                 history_frames: int = 8,
+                 margin: float = 0.15,
+                 min_size: float = 0.3,
+                 max_area: float = 0.8,
+                 full_frame_every: int = 15,
+                 keep_aspect: bool = True,
+                 max_sessions: int = 256,
+                 session_ttl: float = 60.0):
+        """
+        Args:
+            history_frames: Frames whose detections make up the region
+            margin: Extra border per side, as a fraction of the region size
+            min_size: Minimum crop width/height as a fraction of the frame
+            max_area: Use the full frame when the crop covers more than this fraction
+            full_frame_every: Force a full frame after this many cropped frames (0 = never)
+            keep_aspect: Grow the crop to the frame's aspect ratio
+            max_sessions: Sessions tracked at most (least recently used dropped first)
+            session_ttl: Seconds without frames before a session is forgotten
+        """
+        if not 0.0 < min_size <= 1.0 or not 0.0 < max_area <= 1.0:
+            raise ValueError("model.roi min_size and max_area must be in (0, 1]")
+        
+        self._logger = logging.getLogger(__name__)
+        self._history_frames = max(1, int(history_frames))
+        self._margin = max(0.0, float(margin))
+        self._min_size = float(min_size)
+        self._max_area = float(max_area)
+        self._full_frame_every = max(0, int(full_frame_every))
+        self._keep_aspect = keep_aspect
+        self._max_sessions = max(1, int(max_sessions))
+        self._session_ttl = float(session_ttl)
+        
+        self._sessions: "OrderedDict[str, _SessionState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'crop_frames': 0, 'full_frames': 0}
+        
+        # Metrics (children cached so the hot path skips label lookups)
+        frames_total = get_registry().counter('ai_roi_frames_total', 'Frames by ROI mode', ['mode'])
+        self._crop_frames = frames_total.labels('crop')
+        self._full_frames = frames_total.labels('full')
+    
+    @classmethod
+    def from_config(cls, roi_config: Dict[str, Any]) -> 'RoiTracker':
+        """
+        Create a tracker from the model.roi config section.
+        
+        Args:
+            roi_config: model.roi config dictionary
+        
+        Returns:
+            RoiTracker
+        """
+        return cls(
+            history_frames=roi_config.get('history_frames', 8),
+            margin=roi_config.get('margin', 0.15),
+            min_size=roi_config.get('min_size', 0.3),
+            max_area=roi_config.get('max_area', 0.8),
+            full_frame_every=roi_config.get('full_frame_every', 15),
+            keep_aspect=roi_config.get('keep_aspect', True),
+            max_sessions=roi_config.get('max_sessions', 256),
+            session_ttl=roi_config.get('session_ttl_seconds', 60.0)
+        )
+    
+    def _session_state(self, session: str) -> _SessionState:
+        """Get or create the state of a session (caller holds self._lock)."""
+        now = time.monotonic()
+        # Oldest first: drop idle sessions from the front
+        while self._sessions:
+            oldest_session, oldest = next(iter(self._sessions.items()))
+            if now - oldest.last_seen <= self._session_ttl or oldest_session == session:
+                break
+            self._sessions.popitem(last=False)
+        
+        state = self._sessions.get(session)
+        if state is None:
+            state = _SessionState(self._history_frames)
+            self._sessions[session] = state
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session)
+        state.last_seen = now
+        return state
+    
+    def _count(self, mode: str) -> None:
+        with self._lock:
+            self._stats[mode] += 1
+        (self._crop_frames if mode == 'crop_frames' else self._full_frames).inc()
+    
+    def window(self, session: str, frame_w: int, frame_h: int) -> RoiWindow:
+        """
+        Region of the next frame of a session to run the model on.
+        
+        Args:
+            session: Session id
+            frame_w: Frame width in pixels
+            frame_h: Frame height in pixels
+        
+        Returns:
+            RoiWindow (the full frame when no crop applies)
+        """
+        full = RoiWindow(session, 0, 0, frame_w, frame_h, frame_w, frame_h)
+        with self._lock:
+            state = self._session_state(session)
+            boxes = [box for box in state.history if box is not None]
+            if (state.force_full or not boxes
+                    or (self._full_frame_every and state.frames_since_full >= self._full_frame_every)):
+                state.frames_since_full = 0
+                state.force_full = False
+                self._stats['full_frames'] += 1
+                self._full_frames.inc()
+                return full
+            state.frames_since_full += 1
+        
+        union = np.array(boxes, dtype=np.float32)
+        x0, y0 = float(union[:, 0].min()), float(union[:, 1].min())
+        x1, y1 = float(union[:, 2].max()), float(union[:, 3].max())
+        
+        # Region plus margin, at least min_size of the frame (normalized)
+        width = max((x1 - x0) * (1.0 + 2.0 * self._margin), self._min_size)
+        height = max((y1 - y0) * (1.0 + 2.0 * self._margin), self._min_size)
+        if self._keep_aspect:
+            # Same aspect ratio as the frame: equal normalized width and height
+            width = height = max(width, height)
+        width, height = min(width, 1.0), min(height, 1.0)
+        if width * height > self._max_area:
+            self._count('full_frames')
+            return full
+        
+        # Centre on the region, shift back inside the frame instead of shrinking
+        left = min(max((x0 + x1 - width) / 2.0, 0.0), 1.0 - width)
+        top = min(max((y0 + y1 - height) / 2.0, 0.0), 1.0 - height)
+        
+        # Even pixel bounds (YUV420 chroma planes are subsampled by 2)
+        px0 = int(left * frame_w) // 2 * 2
+        py0 = int(top * frame_h) // 2 * 2
+        px1 = min(frame_w, (int(np.ceil((left + width) * frame_w)) + 1) // 2 * 2)
+        py1 = min(frame_h, (int(np.ceil((top + height) * frame_h)) + 1) // 2 * 2)
+        if px1 - px0 < 2 or py1 - py0 < 2:
+            self._count('full_frames')
+            return full
+        
+        self._count('crop_frames')
+        return RoiWindow(session, px0, py0, px1, py1, frame_w, frame_h)
+    
+    def update(self, window: RoiWindow, boxes: np.ndarray) -> None:
+        """
+        Record the detections of a frame.
+        
+        Args:
+            window: Window the frame was processed with (from window())
+            boxes: (N, 4) [x_min, y_min, x_max, y_max] normalized to the full frame
+        """
+        union = None
+        if len(boxes):
+            union = (
+                float(boxes[:, 0].min()), float(boxes[:, 1].min()),
+                float(boxes[:, 2].max()), float(boxes[:, 3].max())
+            )
+        
+        force_full = False
+        if window.cropped:
+            if union is None:
+                # Objects moved out of the region (or the tray was swapped)
+                force_full = True
+            else:
+                # A box on a cropped edge may be cut off by the crop
+                edges = (
+                    window.x0 > 0 and union[0] <= window.x0 / window.frame_w + _EDGE_EPSILON,
+                    window.y0 > 0 and union[1] <= window.y0 / window.frame_h + _EDGE_EPSILON,
+                    window.x1 < window.frame_w and union[2] >= window.x1 / window.frame_w - _EDGE_EPSILON,
+                    window.y1 < window.frame_h and union[3] >= window.y1 / window.frame_h - _EDGE_EPSILON,
+                )
+                force_full = any(edges)
+        
+        with self._lock:
+            state = self._sessions.get(window.session)
+            if state is None:
+                return
+            state.history.append(union)
+            if force_full:
+                state.force_full = True
+    
+    def forget(self, session: str) -> None:
+        """Drop the state of a session (e.g. the client disconnected)."""
+        with self._lock:
+            self._sessions.pop(session, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dictionary with tracked sessions and frame counts per mode
+        """
+        with self._lock:
+            return {'sessions': len(self._sessions), **self._stats}
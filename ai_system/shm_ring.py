@@ -0,0 +1,260 @@
+import logging
+import struct
+import threading
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Dict, Any, Optional
+
+MAGIC = b'AIFR'
+VERSION = 1
+
+# Segment header: magic, version, slot count, slot size, data offset
+_HEADER = struct.Struct('<4sIIQQ')
+_HEADER_SIZE = 64
+
+# Per-slot header: sequence number, payload length
+_SLOT_HEADER = struct.Struct('<QI4x')
+
+# Slot data starts page aligned
+_DATA_ALIGN = 4096
+
+
+def _data_offset(slots: int) -> int:
+    end = _HEADER_SIZE + slots * _SLOT_HEADER.size
+    return (end + _DATA_ALIGN - 1) // _DATA_ALIGN * _DATA_ALIGN
+
+
+class SharedFrameRing:
+    """
+    Ring slot frame di shared memory, hanya index slot yang dikirim lewat gRPC.
+    
+    The AI server creates the segment (grpc.shared_memory) and the gateway
+    on the same host attaches to it by name. For each frame the producer
+    takes a free slot, copies the encoded frame into it, writes the slot
+    header (sequence number and length) and sends a FrameRequest with
+    shm_slot/shm_length/shm_seq and empty frame_data. The server decodes
+    straight from the slot (no protobuf copy); the producer reuses the slot
+    once the ProcessFrame response has arrived.
+    
+    Layout (little endian):
+        
+        0      header: magic 'AIFR', version u32, slots u32, slot_bytes u64, data_offset u64
+        64     slot headers: seq u64, length u32, pad u32 (16 bytes each)
+        data_offset + i * slot_bytes   slot i payload
+    
+    Slot allocation is owned by the producer (acquire/release); the
+    sequence number lets the server reject a slot that was overwritten or
+    never written for this request. The header works as a seqlock: write()
+    clears it before touching the payload, and the server checks it again
+    with verify() after decoding. A frame whose slot was reused in between
+    (e.g. the producer gave up on a timed-out request) is then rejected
+    instead of being decoded from a half-overwritten payload.
+    """
+    
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._logger = logging.getLogger(__name__)
+        self._shm = shm
+        self._owner = owner
+        
+        magic, version, slots, slot_bytes, data_offset = _HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Shared memory segment {shm.name} is not a frame ring (v{VERSION})")
+        self._slots = slots
+        self._slot_bytes = slot_bytes
+        self._data_offset = data_offset
+        
+        # Producer side free list
+        self._free = deque(range(slots))
+        self._free_cond = threading.Condition()
+        self._stats = {'writes': 0, 'reads': 0, 'rejected': 0, 'overwritten': 0, 'acquire_waits': 0}
+    
+    @classmethod
+    def create(cls, name: str, slots: int = 8, slot_bytes: int = 4 * 1024 * 1024) -> 'SharedFrameRing':
+        """
+        Create the segment (server side), replacing a stale one with the same name.
+        
+        Args:
+            name: Shared memory name (/dev/shm/<name> on Linux)
+            slots: Number of frame slots (max frames in flight through shared memory)
+            slot_bytes: Max encoded frame size per slot
+        
+        Returns:
+            SharedFrameRing that owns (and unlinks) the segment
+        """
+        slot_bytes = (int(slot_bytes) + _DATA_ALIGN - 1) // _DATA_ALIGN * _DATA_ALIGN
+        data_offset = _data_offset(slots)
+        size = data_offset + slots * slot_bytes
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a crashed server
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        
+        _HEADER.pack_into(shm.buf, 0, MAGIC, VERSION, slots, slot_bytes, data_offset)
+        for slot in range(slots):
+            _SLOT_HEADER.pack_into(shm.buf, _HEADER_SIZE + slot * _SLOT_HEADER.size, 0, 0)
+        return cls(shm, owner=True)
+    
+    @classmethod
+    def attach(cls, name: str) -> 'SharedFrameRing':
+        """
+        Attach to an existing segment (producer side).
+        
+        Args:
+            name: Shared memory name used by the server
+        
+        Returns:
+            SharedFrameRing that does not unlink the segment
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            # Python < 3.13 registers attached segments too and would unlink
+            # the server's segment when this process exits
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+        return cls(shm, owner=False)
+    
+    @property
+    def name(self) -> str:
+        return self._shm.name
+    
+    @property
+    def slots(self) -> int:
+        return self._slots
+    
+    @property
+    def slot_bytes(self) -> int:
+        return self._slot_bytes
+    
+    def _slot_header_offset(self, slot: int) -> int:
+        return _HEADER_SIZE + slot * _SLOT_HEADER.size
+    
+    def _slot_data_offset(self, slot: int) -> int:
+        return self._data_offset + slot * self._slot_bytes
+    
+    def acquire(self, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Take a free slot (producer side).
+        
+        Args:
+            timeout: Max seconds to wait (None = wait forever)
+        
+        Returns:
+            Slot index, or None on timeout
+        """
+        with self._free_cond:
+            if not self._free:
+                self._stats['acquire_waits'] += 1
+                if not self._free_cond.wait_for(lambda: self._free, timeout):
+                    return None
+            return self._free.popleft()
+    
+    def release(self, slot: int) -> None:
+        """Return a slot after its ProcessFrame response arrived."""
+        with self._free_cond:
+            self._free.append(slot)
+            self._free_cond.notify()
+    
+    def write(self, slot: int, data: bytes, seq: int) -> int:
+        """
+        Copy a frame into a slot (producer side).
+        
+        Args:
+            slot: Slot from acquire()
+            data: Encoded frame bytes
+            seq: Sequence number sent along in FrameRequest.shm_seq
+        
+        Returns:
+            Number of bytes written (FrameRequest.shm_length)
+        """
+        length = len(data)
+        if length > self._slot_bytes:
+            raise ValueError(f"Frame of {length} bytes does not fit a {self._slot_bytes} byte slot")
+        # Invalidate first: a reader still decoding the previous frame sees the change
+        _SLOT_HEADER.pack_into(self._shm.buf, self._slot_header_offset(slot), 0, 0)
+        start = self._slot_data_offset(slot)
+        self._shm.buf[start:start + length] = data
+        # Header last: the slot is only valid for seq once the payload is in place
+        _SLOT_HEADER.pack_into(self._shm.buf, self._slot_header_offset(slot), seq, length)
+        self._stats['writes'] += 1
+        return length
+    
+    def read(self, slot: int, length: int, seq: int) -> memoryview:
+        """
+        Get a frame from a slot without copying (server side).
+        
+        The view is only valid until the response is sent; the producer
+        may overwrite the slot afterwards.
+        
+        Args:
+            slot: FrameRequest.shm_slot
+            length: FrameRequest.shm_length
+            seq: FrameRequest.shm_seq
+        
+        Returns:
+            Read-only memoryview of the frame bytes
+        """
+        if not 0 <= slot < self._slots:
+            self._stats['rejected'] += 1
+            raise ValueError(f"Invalid shared memory slot {slot} (ring has {self._slots})")
+        header_seq, header_length = _SLOT_HEADER.unpack_from(self._shm.buf, self._slot_header_offset(slot))
+        if header_seq != seq or header_length != length:
+            self._stats['rejected'] += 1
+            raise ValueError(
+                f"Shared memory slot {slot} holds seq {header_seq} ({header_length} bytes), "
+                f"request expects seq {seq} ({length} bytes)"
+            )
+        start = self._slot_data_offset(slot)
+        self._stats['reads'] += 1
+        return self._shm.buf[start:start + length].toreadonly()
+    
+    def verify(self, slot: int, length: int, seq: int) -> None:
+        """
+        Check that a slot still holds the frame returned by read() (server side).
+        
+        Call after the payload has been decoded/copied out of the view.
+        
+        Args:
+            slot: FrameRequest.shm_slot
+            length: FrameRequest.shm_length
+            seq: FrameRequest.shm_seq
+        
+        Raises:
+            ValueError: The producer started rewriting the slot in the meantime
+        """
+        header_seq, header_length = _SLOT_HEADER.unpack_from(self._shm.buf, self._slot_header_offset(slot))
+        if header_seq != seq or header_length != length:
+            self._stats['overwritten'] += 1
+            raise ValueError(
+                f"Shared memory slot {slot} was overwritten while frame seq {seq} was being decoded"
+            )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._free_cond:
+            free = len(self._free)
+        return {
+            'name': self.name,
+            'slots': self._slots,
+            'slot_bytes': self._slot_bytes,
+            'owner': self._owner,
+            'free_slots': free if not self._owner else None,
+            **self._stats
+        }
+    
+    def close(self) -> None:
+        """Detach; the owner also removes the segment."""
+        try:
+            self._shm.close()
+        except BufferError:
+            # A memoryview from read() is still alive; the mapping goes with the process
+            self._logger.warning(f"Shared memory {self.name} still referenced at close")
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
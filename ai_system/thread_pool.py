@@ -1,12 +1,21 @@
+import heapq
+import itertools
 import logging
+import queue
 import threading
 import time
-import queue
-from typing import Callable, Any, Dict, List, Optional, Union
+from typing import Callable, Any, Dict, List, Optional, Set, Tuple
 from enum import Enum
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, Future
-import uuid
+from concurrent.futures import Future
+
+from .metrics import get_registry
+
+
+OVERFLOW_POLICIES = ('block', 'reject', 'drop_oldest')
+
+# Queue wait buckets (seconds)
+QUEUE_TIME_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
 
 
 class TaskPriority(Enum):
@@ -17,131 +26,265 @@ class TaskPriority(Enum):
     CRITICAL = 3
 
 
-@dataclass
+@dataclass(eq=False)
 class Task:
     """Data class untuk merepresentasikan tugas."""
-    id: str
+    id: int
     func: Callable
     args: tuple
     kwargs: dict
     priority: TaskPriority
     future: Future
     created_at: float
+    deadline: Optional[float] = None
     
     def __lt__(self, other):
         """Membandingkan prioritas tugas untuk priority queue."""
         if self.priority.value == other.priority.value:
             # Jika prioritas sama, gunakan urutan kedatangan (FIFO)
-            return self.created_at < other.created_at
+            return self.id < other.id
         return self.priority.value > other.priority.value
 
 
 class ThreadPool:
     """
     Thread Pool untuk mengelola eksekusi tugas-tugas secara paralel dengan dukungan prioritas.
+    
+    Worker threads take tasks straight from a priority heap guarded by one
+    condition variable: no dispatcher thread, no polling and no second
+    executor queue. A worker finishing a task updates the statistics and
+    takes the next task in the same critical section.
+    
+    The queue is bounded (task_queue_size). When it is full, submit()
+    follows overflow_policy:
+        block:       wait for space (up to submit_timeout, then queue.Full)
+        reject:      raise queue.Full right away
+        drop_oldest: fail the oldest task of the lowest queued priority with
+                     queue.Full to make room; a new task below every queued
+                     priority is rejected instead
+    
+    Tasks may carry a deadline (time.monotonic()); a task still queued
+    when its deadline passes fails with TimeoutError instead of running.
     """
     
-    def __init__(self, 
-                 max_workers: int = 10, 
+    def __init__(self,
+                 max_workers: int = 10,
                  task_queue_size: int = 100,
-                 graceful_shutdown_timeout: float = 5.0):
+                 graceful_shutdown_timeout: float = 5.0,
+                 name: str = "default",
+                 overflow_policy: str = "block",
+                 submit_timeout: Optional[float] = None,
+                 task_timeout: Optional[float] = None):
         """
         Inisialisasi ThreadPool.
         
         Args:
             max_workers: Jumlah maksimum worker threads
-            task_queue_size: Queue unlimited
+            task_queue_size: Kapasitas antrian tugas (0 = unlimited)
             graceful_shutdown_timeout: Timeout shutdown (detik)
+            name: Nama pool (label metrics dan nama thread)
+            overflow_policy: 'block', 'reject' atau 'drop_oldest' saat antrian penuh
+            submit_timeout: Waktu tunggu maksimum submit() untuk policy 'block' (None = tanpa batas)
+            task_timeout: Deadline default tugas (detik sejak submit, None = tanpa deadline)
         """
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        if task_queue_size < 0:
+            raise ValueError("task_queue_size must be >= 0")
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy} (expected one of {OVERFLOW_POLICIES})")
+        
+        self._max_queue_size = task_queue_size
+        self._overflow_policy = overflow_policy
+        self._submit_timeout = submit_timeout
+        self._task_timeout = task_timeout
+        
         self._max_workers = max_workers
         self._graceful_shutdown_timeout = graceful_shutdown_timeout
+        self._name = name
         self._logger = logging.getLogger(__name__)
         
         # Flag untuk mengontrol thread pool
         self._shutdown = False
-        self._shutdown_lock = threading.Lock()
         
-        # Antrian tugas dengan prioritas (UNLIMITED - no maxsize)
-        self._task_queue = queue.PriorityQueue()
+        # Heap tugas dengan prioritas + condition untuk worker dan submit yang menunggu
+        # Entries are (-priority, id, task) so heap comparisons stay in C
+        self._heap: List[Tuple[int, int, Task]] = []
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._task_ids = itertools.count(1)
         
-        # Thread pool executor untuk eksekusi tugas
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Worker threads (started lazily up to max_workers)
+        self._workers: Set[threading.Thread] = set()
+        self._idle_workers = 0
+        self._worker_names = itertools.count(1)
         
-        # Thread untuk memproses antrian tugas
-        self._dispatcher_thread = threading.Thread(target=self._dispatch_tasks, daemon=True)
-        self._dispatcher_thread.start()
-        
-        # Statistik thread pool
+        # Statistik thread pool (diperbarui di bawah self._cond)
         self._stats = {
             'total_tasks': 0,
             'completed_tasks': 0,
             'failed_tasks': 0,
+            'cancelled_tasks': 0,
+            'expired_tasks': 0,
+            'rejected_tasks': 0,
+            'dropped_tasks': 0,
             'active_tasks': 0
         }
-        self._stats_lock = threading.Lock()
         
-        self._logger.info(f"ThreadPool initialized with {max_workers} workers")
+        # Metrics (children cached so the hot path skips label lookups)
+        registry = get_registry()
+        tasks_total = registry.counter(
+            'ai_thread_pool_tasks_total', 'Tasks finished by ThreadPool', ['pool', 'status']
+        )
+        self._completed_counter = tasks_total.labels(name, 'completed')
+        self._failed_counter = tasks_total.labels(name, 'failed')
+        self._expired_counter = tasks_total.labels(name, 'expired')
+        self._rejected_counter = tasks_total.labels(name, 'rejected')
+        self._dropped_counter = tasks_total.labels(name, 'dropped')
+        self._queue_seconds = registry.histogram(
+            'ai_thread_pool_queue_seconds', 'Time tasks wait in the ThreadPool queue', ['pool'],
+            buckets=QUEUE_TIME_BUCKETS
+        ).labels(name)
+        
+        queue_info = task_queue_size or 'unlimited'
+        self._logger.info(
+            f"ThreadPool '{name}' initialized with {max_workers} workers, "
+            f"queue {queue_info} ({overflow_policy})"
+        )
+    
+    def _start_worker(self) -> None:
+        """Start one worker thread (caller holds self._cond)."""
+        thread = threading.Thread(
+            target=self._worker_loop,
+            name=f"{self._name}-worker-{next(self._worker_names)}",
+            daemon=True
+        )
+        self._workers.add(thread)
+        thread.start()
     
-    def _dispatch_tasks(self):
-        """Thread dispatcher untuk mengambil tugas dari antrian dan mengeksekusinya."""
-        while not self._is_shutdown():
-            try:
-                # Ambil tugas dari antrian dengan timeout untuk memeriksa shutdown
-                task = self._task_queue.get(timeout=0.1)
+    def _worker_loop(self):
+        """Worker: ambil tugas prioritas tertinggi dari heap dan eksekusi."""
+        cond = self._cond
+        heap = self._heap
+        stats = self._stats
+        outcome = None
+        
+        while True:
+            with cond:
+                # Record the previous task and take the next one under one lock
+                if outcome is not None:
+                    stats['active_tasks'] -= 1
+                    stats[outcome] += 1
+                    outcome = None
                 
-                # Increment active tasks count BEFORE submitting to executor
-                # This ensures active_tasks = (currently running + waiting in executor queue)
-                with self._stats_lock:
-                    self._stats['active_tasks'] += 1
+                while not heap:
+                    if self._shutdown or len(self._workers) > self._max_workers:
+                        self._workers.discard(threading.current_thread())
+                        cond.notify_all()
+                        return
+                    self._idle_workers += 1
+                    cond.wait()
+                    self._idle_workers -= 1
                 
-                # Eksekusi tugas menggunakan executor
-                self._executor.submit(self._execute_task, task)
+                if len(self._workers) > self._max_workers:
+                    # Pool was shrunk (resize): leave the task for the remaining workers
+                    self._workers.discard(threading.current_thread())
+                    cond.notify()
+                    return
                 
-            except queue.Empty:
-                # Antrian kosong, lanjutkan loop
-                continue
-            except Exception as e:
-                self._logger.error(f"[DISPATCH ERROR] Error in task dispatcher: {e}", exc_info=True)
+                task = heapq.heappop(heap)[2]
+                stats['active_tasks'] += 1
+                if self._max_queue_size:
+                    self._not_full.notify()
+            
+            outcome = self._execute_task(task)
     
-    def _execute_task(self, task: Task):
-        """Eksekusi tugas."""
+    def _execute_task(self, task: Task) -> str:
+        """
+        Eksekusi tugas.
+        
+        Returns:
+            Stats key of the outcome ('completed_tasks', 'failed_tasks' or 'cancelled_tasks')
+        """
+        future = task.future
+        if not future.set_running_or_notify_cancel():
+            return 'cancelled_tasks'
+        
+        started = time.monotonic()
+        self._queue_seconds.observe(started - task.created_at)
+        if task.deadline is not None and started > task.deadline:
+            # Stale work: the caller has given up, do not spend CPU on it
+            future.set_exception(TimeoutError(
+                f"Task {task.id} expired after {started - task.created_at:.3f}s in queue"
+            ))
+            self._expired_counter.inc()
+            return 'expired_tasks'
+        
         try:
-            # Eksekusi fungsi tugas
             result = task.func(*task.args, **task.kwargs)
-            
-            # Set result pada future
-            if not task.future.done():
-                task.future.set_result(result)
-            
-            with self._stats_lock:
-                self._stats['completed_tasks'] += 1
-                completed = self._stats['completed_tasks']
-                total = self._stats['total_tasks']
-            self._logger.info(f"[TASK DONE] {completed}/{total}")
-            
-        except Exception as e:
-            # Set exception pada future
-            if not task.future.done():
-                task.future.set_exception(e)
-            
-            with self._stats_lock:
-                self._stats['failed_tasks'] += 1
-                failed = self._stats['failed_tasks']
-            
-            self._logger.error(f"[TASK FAILED] Task {task.id} failed: {e}, Total Failed: {failed}", exc_info=True)
+        except BaseException as e:
+            future.set_exception(e)
+            self._failed_counter.inc()
+            self._logger.error(f"[TASK FAILED] Task {task.id} failed: {e}", exc_info=True)
+            return 'failed_tasks'
+        
+        future.set_result(result)
+        self._completed_counter.inc()
+        return 'completed_tasks'
+    
+    def _remove_queued(self, indexes: List[int]) -> List[Task]:
+        """Remove heap entries by index (caller holds the lock)."""
+        removed = [self._heap[i][2] for i in indexes]
+        for i in sorted(indexes, reverse=True):
+            self._heap[i] = self._heap[-1]
+            self._heap.pop()
+        heapq.heapify(self._heap)
+        return removed
+    
+    def _make_room(self, priority: TaskPriority, now: float) -> Tuple[bool, List[Tuple[Task, BaseException]]]:
+        """
+        Free a queue slot for a new task according to the overflow policy (caller holds the lock).
         
-        finally:
-            # Decrement active tasks count in finally block to ensure it always happens
-            with self._stats_lock:
-                self._stats['active_tasks'] -= 1
-                
-            # Tandai tugas selesai di antrian
-            self._task_queue.task_done()
+        Returns:
+            Tuple (True if a slot is free, queued tasks to fail outside the lock with the given exception)
+        """
+        # Expired tasks never run, drop them first
+        expired = [i for i, entry in enumerate(self._heap) if entry[2].deadline is not None and entry[2].deadline < now]
+        failed = [
+            (task, TimeoutError(f"Task {task.id} expired after {now - task.created_at:.3f}s in queue"))
+            for task in self._remove_queued(expired)
+        ] if expired else []
+        self._stats['expired_tasks'] += len(failed)
+        if len(self._heap) < self._max_queue_size:
+            return True, failed
+        
+        if self._overflow_policy == 'drop_oldest':
+            # Lowest priority first (largest -priority), oldest (smallest id) within it
+            victim = max(range(len(self._heap)), key=lambda i: (self._heap[i][0], -self._heap[i][1]))
+            if -self._heap[victim][0] <= priority.value:
+                task = self._remove_queued([victim])[0]
+                self._stats['dropped_tasks'] += 1
+                failed.append((task, queue.Full(f"Task {task.id} dropped from full ThreadPool queue")))
+                return True, failed
+        elif self._overflow_policy == 'block':
+            deadline = None if self._submit_timeout is None else now + self._submit_timeout
+            while len(self._heap) >= self._max_queue_size and not self._shutdown:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._not_full.wait(remaining)
+            if len(self._heap) < self._max_queue_size:
+                return True, failed
+        
+        self._stats['rejected_tasks'] += 1
+        return False, failed
     
-    def submit(self, 
-               func: Callable, 
-               *args, 
-               priority: TaskPriority = TaskPriority.MEDIUM, 
+    def submit(self,
+               func: Callable,
+               *args,
+               priority: TaskPriority = TaskPriority.MEDIUM,
+               deadline: Optional[float] = None,
                **kwargs) -> Future:
         """
         Submit tugas untuk dieksekusi.
@@ -150,25 +293,55 @@ class ThreadPool:
             func: Fungsi yang akan dieksekusi
             *args: Argumen posisi untuk fungsi
             priority: Prioritas tugas (default: MEDIUM)
+            deadline: Batas waktu mulai tugas (time.monotonic(); default: sekarang + task_timeout)
             **kwargs: Argumen kata kunci untuk fungsi
-            
+        
         Returns:
             Future object untuk tracking hasil eksekusi
-            
+        
         Raises:
             RuntimeError: Jika thread pool sudah shutdown
-            queue.Full: Jika antrian tugas penuh
+            queue.Full: Jika antrian tugas penuh (policy 'reject', 'drop_oldest', atau timeout 'block')
         """
-        if self._is_shutdown():
-            raise RuntimeError("ThreadPool is shutdown")
-        
-        # Buat ID unik untuk tugas
-        task_id = str(uuid.uuid4())
-        
-        # Buat Future object
         future = Future()
+        has_room, failed = True, None
         
-        # Buat objek Task
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("ThreadPool is shutdown")
+            
+            now = time.monotonic()
+            if self._max_queue_size and len(self._heap) >= self._max_queue_size:
+                has_room, failed = self._make_room(priority, now)
+            
+            # A blocked submit may wake up to a pool that was shut down meanwhile
+            if has_room and self._shutdown:
+                has_room = False
+            if has_room:
+                self._enqueue(future, func, args, kwargs, priority, now, deadline)
+        
+        # Fail expired/dropped tasks outside the lock (future callbacks may submit again)
+        if failed:
+            for dropped, error in failed:
+                if isinstance(error, TimeoutError):
+                    self._expired_counter.inc()
+                else:
+                    self._dropped_counter.inc()
+                dropped.future.set_exception(error)
+        
+        if not has_room:
+            if self._is_shutdown():
+                raise RuntimeError("ThreadPool is shutdown")
+            self._rejected_counter.inc()
+            raise queue.Full(f"ThreadPool queue is full ({self._max_queue_size} tasks)")
+        return future
+    
+    def _enqueue(self, future: Future, func: Callable, args: tuple, kwargs: dict,
+                 priority: TaskPriority, now: float, deadline: Optional[float]) -> None:
+        """Push a task and wake or start a worker (caller holds the lock)."""
+        if deadline is None and self._task_timeout is not None:
+            deadline = now + self._task_timeout
+        task_id = next(self._task_ids)
         task = Task(
             id=task_id,
             func=func,
@@ -176,18 +349,19 @@ class ThreadPool:
             kwargs=kwargs,
             priority=priority,
             future=future,
-            created_at=time.time()
+            created_at=now,
+            deadline=deadline
         )
-        
-        # Tambahkan ke antrian (blocking, unlimited)
-        self._task_queue.put(task)
-        
-        with self._stats_lock:
-            self._stats['total_tasks'] += 1
-        
-        return future
+        heapq.heappush(self._heap, (-priority.value, task_id, task))
+        self._stats['total_tasks'] += 1
+        
+        # Wake an idle worker if one is left for this task, else start one while below max_workers
+        if self._idle_workers < len(self._heap) and len(self._workers) < self._max_workers:
+            self._start_worker()
+        else:
+            self._cond.notify()
     
-    def submit_batch(self, 
+    def submit_batch(self,
                      tasks: List[Dict[str, Any]]) -> List[Future]:
         """
         Submit multiple tasks at once.
@@ -198,13 +372,14 @@ class ThreadPool:
                 - 'args': Positional arguments (optional)
                 - 'kwargs': Keyword arguments (optional)
                 - 'priority': Task priority (optional, default: MEDIUM)
-                
+                - 'deadline': time.monotonic() deadline (optional)
+        
         Returns:
             List of Future objects for tracking execution results
-            
+        
         Raises:
             RuntimeError: If thread pool is shutdown
-            queue.Full: If task queue is full
+            queue.Full: If the task queue is full (see overflow_policy)
         """
         if self._is_shutdown():
             raise RuntimeError("ThreadPool is shutdown")
@@ -216,8 +391,9 @@ class ThreadPool:
             args = task_dict.get('args', ())
             kwargs = task_dict.get('kwargs', {})
             priority = task_dict.get('priority', TaskPriority.MEDIUM)
+            deadline = task_dict.get('deadline')
             
-            future = self.submit(func, *args, priority=priority, **kwargs)
+            future = self.submit(func, *args, priority=priority, deadline=deadline, **kwargs)
             futures.append(future)
         
         return futures
@@ -226,39 +402,41 @@ class ThreadPool:
         """
         Shutdown thread pool dengan graceful.
         
+        Tugas yang sudah di antrian tetap dijalankan; gunakan purge_queue()
+        sebelumnya untuk membatalkannya.
+        
         Args:
             wait: Jika True, tunggu semua tugas selesai
             timeout: Maximum time to wait for tasks to complete (None for no timeout)
         """
-        if self._is_shutdown():
-            return
-        
-        # Set shutdown flag
-        with self._shutdown_lock:
+        with self._cond:
+            if self._shutdown:
+                return
             self._shutdown = True
+            workers = list(self._workers)
+            self._cond.notify_all()
+            self._not_full.notify_all()
         
-        self._logger.info("ThreadPool shutting down...")
+        self._logger.info(f"ThreadPool '{self._name}' shutting down...")
         
-        # Shutdown executor
         if timeout is None:
             timeout = self._graceful_shutdown_timeout
-            
-        # ThreadPoolExecutor.shutdown() doesn't accept timeout parameter in some Python versions
-        try:
-            self._executor.shutdown(wait=wait, timeout=timeout)
-        except TypeError:
-            # Fallback for Python versions that don't support timeout parameter
-            self._executor.shutdown(wait=wait)
         
-        # Tunggu dispatcher thread selesai
         if wait:
-            self._dispatcher_thread.join(timeout=timeout)
+            deadline = time.monotonic() + timeout
+            for thread in workers:
+                thread.join(timeout=max(0.0, deadline - time.monotonic()))
+            
+            with self._cond:
+                pending = len(self._heap)
+            if pending:
+                self._logger.warning(f"ThreadPool shutdown timed out with {pending} tasks still queued")
         
-        self._logger.info("ThreadPool shutdown complete")
+        self._logger.info(f"ThreadPool '{self._name}' shutdown complete")
     
     def _is_shutdown(self) -> bool:
         """Check if thread pool is shutdown."""
-        with self._shutdown_lock:
+        with self._cond:
             return self._shutdown
     
     def get_stats(self) -> Dict[str, Any]:
@@ -268,14 +446,18 @@ class ThreadPool:
         Returns:
             Dictionary containing thread pool statistics
         """
-        with self._stats_lock:
+        with self._cond:
             stats = self._stats.copy()
-        
-        stats.update({
-            'queue_size': self._task_queue.qsize(),
-            'max_workers': self._max_workers,
-            'is_shutdown': self._is_shutdown()
-        })
+            stats.update({
+                'name': self._name,
+                'queue_size': len(self._heap),
+                'max_queue_size': self._max_queue_size,
+                'overflow_policy': self._overflow_policy,
+                'max_workers': self._max_workers,
+                'workers': len(self._workers),
+                'idle_workers': self._idle_workers,
+                'is_shutdown': self._shutdown
+            })
         
         return stats
     
@@ -285,31 +467,30 @@ class ThreadPool:
         
         Args:
             new_max_workers: New maximum number of workers
-            
+        
         Note:
-            This will create a new ThreadPoolExecutor with the new size.
-            Existing tasks will continue to run on the old executor.
+            Growing starts workers for queued tasks right away. Shrinking
+            lets surplus workers exit after their current task; running
+            tasks are never interrupted.
         """
         if new_max_workers <= 0:
             raise ValueError("max_workers must be positive")
         
-        if self._is_shutdown():
-            raise RuntimeError("Cannot resize shutdown ThreadPool")
-        
-        self._logger.info(f"Resizing ThreadPool from {self._max_workers} to {new_max_workers} workers")
-        
-        # Shutdown old executor
-        self._executor.shutdown(wait=False)
-        
-        # Create new executor with new size
-        self._max_workers = new_max_workers
-        self._executor = ThreadPoolExecutor(max_workers=new_max_workers)
-        
-        # Start new dispatcher thread
-        self._dispatcher_thread = threading.Thread(target=self._dispatch_tasks, daemon=True)
-        self._dispatcher_thread.start()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Cannot resize shutdown ThreadPool")
+            
+            old_max_workers = self._max_workers
+            self._max_workers = new_max_workers
+            
+            # Start workers for tasks that are already waiting
+            while len(self._workers) < min(new_max_workers, len(self._heap)):
+                self._start_worker()
+            
+            # Idle surplus workers exit when woken
+            self._cond.notify_all()
         
-        self._logger.info(f"ThreadPool resized to {new_max_workers} workers")
+        self._logger.info(f"ThreadPool '{self._name}' resized from {old_max_workers} to {new_max_workers} workers")
     
     def purge_queue(self):
         """
@@ -317,16 +498,18 @@ class ThreadPool:
         
         Note:
             This only removes pending tasks, not currently executing tasks.
+            Their futures are cancelled.
         """
-        if self._is_shutdown():
-            return
+        with self._cond:
+            pending = [entry[2] for entry in self._heap]
+            self._heap.clear()
+            self._stats['cancelled_tasks'] += len(pending)
+            self._not_full.notify_all()
         
-        # Clear the queue
-        with self._task_queue.mutex:
-            self._task_queue.queue.clear()
-            self._task_queue.not_full.notify()
+        for task in pending:
+            task.future.cancel()
         
-        self._logger.info("Task queue purged")
+        self._logger.info(f"Task queue purged ({len(pending)} tasks cancelled)")
     
     def __enter__(self):
         """Context manager entry."""
@@ -334,4 +517,4 @@ class ThreadPool:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit with graceful shutdown."""
-        self.shutdown(wait=True)
\ No newline at end of file
+        self.shutdown(wait=True)
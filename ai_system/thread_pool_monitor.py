@@ -58,6 +58,9 @@ class ThreadPoolMonitor:
                 f"Queue={stats['queue_size']}/{stats['max_queue_size']}, "
                 f"Completed={stats['completed_tasks']}, "
                 f"Failed={stats['failed_tasks']}, "
+                f"Expired={stats['expired_tasks']}, "
+                f"Rejected={stats['rejected_tasks']}, "
+                f"Dropped={stats['dropped_tasks']}, "
                 f"Workers={stats['max_workers']}, "
                 f"Shutdown={stats['is_shutdown']}"
             )
@@ -65,8 +68,8 @@ class ThreadPoolMonitor:
             # Log dengan level INFO
             self._logger.info(log_message)
             
-            # Log warning jika queue hampir penuh
-            if stats['queue_size'] > stats['max_queue_size'] * 0.8:
+            # Log warning jika queue hampir penuh (max_queue_size 0 = unlimited)
+            if stats['max_queue_size'] and stats['queue_size'] > stats['max_queue_size'] * 0.8:
                 self._logger.warning(
                     f"ThreadPool queue is almost full: {stats['queue_size']}/{stats['max_queue_size']}"
                 )
@@ -0,0 +1,214 @@
+import threading
+import time
+import numpy as np
+from typing import Dict, Any, Optional, List, Union
+
+
+class TimeSeriesBuffer:
+    """
+    Fixed-size ring buffer untuk time-series monitoring.
+    
+    Samples are stored column-wise in preallocated numpy arrays next to a
+    float64 timestamp column, so appending is O(1) with no per-sample dict
+    and the buffer never grows past its capacity. Columns declared with
+    dtype ``object`` can hold arbitrary Python values (e.g. allocation
+    tracebacks) for the few places that need them.
+    """
+    
+    def __init__(self, capacity: int, columns: Dict[str, Any]):
+        """
+        Initialize TimeSeriesBuffer.
+        
+        Args:
+            capacity: Maximum number of samples kept (oldest are overwritten)
+            columns: Mapping of column name to numpy dtype
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if 'timestamp' in columns:
+            raise ValueError("'timestamp' is a reserved column name")
+        
+        self._capacity = int(capacity)
+        self._timestamps = np.zeros(self._capacity, dtype=np.float64)
+        self._columns: Dict[str, np.ndarray] = {}
+        for name, dtype in columns.items():
+            if np.dtype(dtype) == np.dtype(object):
+                self._columns[name] = np.empty(self._capacity, dtype=object)
+            else:
+                self._columns[name] = np.zeros(self._capacity, dtype=dtype)
+        
+        self._head = 0  # Next write position
+        self._count = 0
+        # Re-entrant: GC callbacks may append while the same thread is reading
+        self._lock = threading.RLock()
+    
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+    
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the numeric columns in bytes."""
+        return self._timestamps.nbytes + sum(
+            column.nbytes for column in self._columns.values()
+        )
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def append(self, timestamp: Optional[float] = None, **values: Any) -> None:
+        """
+        Append a sample, overwriting the oldest one when full.
+        
+        Args:
+            timestamp: Sample time (default: now)
+            **values: Column values; missing columns are stored as zero/None
+        """
+        with self._lock:
+            index = self._head
+            self._timestamps[index] = time.time() if timestamp is None else timestamp
+            for name, column in self._columns.items():
+                value = values.get(name)
+                if value is None and column.dtype != object:
+                    value = 0
+                column[index] = value
+            
+            self._head = (index + 1) % self._capacity
+            if self._count < self._capacity:
+                self._count += 1
+    
+    def _indices(self, max_items: Optional[int] = None) -> np.ndarray:
+        """Return buffer indices of the newest samples in chronological order."""
+        count = self._count if max_items is None else max(0, min(max_items, self._count))
+        start = (self._head - count) % self._capacity
+        return (start + np.arange(count)) % self._capacity
+    
+    def _select(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        result = {'timestamp': self._timestamps[indices]}
+        for name, column in self._columns.items():
+            result[name] = column[indices]
+        return result
+    
+    def latest(self, max_items: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Get the newest samples as column arrays (oldest first).
+        
+        Args:
+            max_items: Maximum number of samples (None for all)
+        
+        Returns:
+            Dictionary of column name to array, including 'timestamp'
+        """
+        with self._lock:
+            return self._select(self._indices(max_items))
+    
+    def since(self, start_time: float) -> Dict[str, np.ndarray]:
+        """
+        Get samples with timestamp >= start_time as column arrays.
+        
+        Args:
+            start_time: Unix timestamp
+        
+        Returns:
+            Dictionary of column name to array, including 'timestamp'
+        """
+        with self._lock:
+            indices = self._indices()
+            indices = indices[self._timestamps[indices] >= start_time]
+            return self._select(indices)
+    
+    def window(self, seconds: float, now: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Get samples from the last ``seconds`` seconds as column arrays.
+        
+        Args:
+            seconds: Window length in seconds
+            now: Reference time (default: now)
+        
+        Returns:
+            Dictionary of column name to array, including 'timestamp'
+        """
+        reference = time.time() if now is None else now
+        return self.since(reference - seconds)
+    
+    def _column_values(self, column: str, window: Optional[float]) -> np.ndarray:
+        if column != 'timestamp' and column not in self._columns:
+            raise KeyError(f"Unknown column: {column}")
+        data = self.latest() if window is None else self.window(window)
+        return data[column]
+    
+    def percentile(self,
+                   column: str,
+                   q: Union[float, List[float]],
+                   window: Optional[float] = None) -> Union[float, np.ndarray, None]:
+        """
+        Compute percentile(s) of a numeric column.
+        
+        Args:
+            column: Column name
+            q: Percentile or list of percentiles (0-100)
+            window: Only use samples from the last N seconds (None for all)
+        
+        Returns:
+            Percentile value(s), or None if there are no samples
+        """
+        values = self._column_values(column, window)
+        if values.size == 0:
+            return None
+        result = np.percentile(values, q)
+        return float(result) if np.ndim(result) == 0 else result
+    
+    def summary(self, column: str, window: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Summarize a numeric column.
+        
+        Args:
+            column: Column name
+            window: Only use samples from the last N seconds (None for all)
+        
+        Returns:
+            Dictionary with count, min, max, mean, p50, p95 and p99
+        """
+        values = self._column_values(column, window)
+        if values.size == 0:
+            return {'count': 0}
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            'count': int(values.size),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'mean': float(values.mean()),
+            'p50': float(p50),
+            'p95': float(p95),
+            'p99': float(p99)
+        }
+    
+    def records(self, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the newest samples as a list of dicts (oldest first).
+        
+        Only meant for infrequent consumers such as reports and exports.
+        
+        Args:
+            max_items: Maximum number of samples (None for all)
+        
+        Returns:
+            List of sample dictionaries with native Python values
+        """
+        data = self.latest(max_items)
+        names = list(data)
+        columns = [data[name].tolist() for name in names]
+        return [dict(zip(names, row)) for row in zip(*columns)]
+    
+    def clear(self) -> None:
+        """Remove all samples."""
+        with self._lock:
+            self._head = 0
+            self._count = 0
+            for column in self._columns.values():
+                if column.dtype == object:
+                    column.fill(None)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Compare stretch vs letterbox preprocessing: cost and accuracy.
+
+For every model.target_size and model.resize_mode combination this
+measures preprocess / inference / postprocess latency on a synthetic frame
+and two geometric accuracy proxies on random ground-truth boxes:
+
+- roundtrip_iou: boxes mapped into model input pixels (rounded to whole
+  pixels, the model's localization grid), then back through
+  FrameProcessor.postprocess_output; mean IoU against the original box.
+- aspect_distortion: how much the mode squashes objects (1.0 = none).
+- small_objects_pct: share of boxes whose short side falls below
+  --min-object-px in model input pixels (likely missed by the detector).
+
+With --dataset (images plus YOLO-format .txt labels) and a real --model
+it also reports precision/recall at IoU 0.5 on real detections.
+
+Usage:
+    python benchmarks/bench_letterbox.py
+    python benchmarks/bench_letterbox.py --target-sizes 320 256 --resolution 1080p
+    python benchmarks/bench_letterbox.py --model Model_train/best.onnx --dataset data/val
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import RESOLUTIONS, make_frame, make_config, measure, write_results, print_table
+from ai_system.frame_processor import FrameProcessor, RESIZE_MODES, letterbox_geometry
+from ai_system.detection_batch import DetectionBatch
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+
+
+def random_boxes(count: int, frame_w: int, frame_h: int, seed: int = 0) -> np.ndarray:
+    """
+    Random ground-truth boxes (x1, y1, x2, y2) in frame pixels, 2-40% of the frame.
+    """
+    rng = np.random.default_rng(seed)
+    w = rng.uniform(0.02, 0.4, count) * frame_w
+    h = rng.uniform(0.02, 0.4, count) * frame_h
+    x1 = rng.uniform(0, frame_w - w)
+    y1 = rng.uniform(0, frame_h - h)
+    return np.stack([x1, y1, x1 + w, y1 + h], axis=1)
+
+
+def to_model_space(boxes: np.ndarray, mode: str, frame_w: int, frame_h: int,
+                   target_w: int, target_h: int) -> Tuple[np.ndarray, float, float]:
+    """
+    Map frame boxes into model input pixels the way preprocessing does.
+
+    Returns:
+        (boxes in model pixels, x scale, y scale)
+    """
+    if mode == "letterbox":
+        new_w, new_h, pad_x, pad_y = letterbox_geometry(frame_w, frame_h, target_w, target_h)
+        sx, sy = new_w / frame_w, new_h / frame_h
+        offset = np.array([pad_x, pad_y, pad_x, pad_y], dtype=np.float64)
+    else:
+        sx, sy = target_w / frame_w, target_h / frame_h
+        offset = np.zeros(4)
+    return boxes * np.array([sx, sy, sx, sy]) + offset, sx, sy
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (N, 4) and (M, 4) x1y1x2y2 boxes."""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def detections_to_boxes(detections: DetectionBatch, frame_w: int, frame_h: int) -> np.ndarray:
+    """Convert postprocess_output detections (normalized corners) to frame pixel boxes."""
+    return detections.boxes.astype(np.float64) * np.array([frame_w, frame_h, frame_w, frame_h])
+
+
+def geometric_accuracy(processor: FrameProcessor, mode: str, frame_w: int, frame_h: int,
+                       num_boxes: int, min_object_px: float) -> Dict[str, float]:
+    """Round-trip IoU, aspect distortion and small-object share for one configuration."""
+    target_w, target_h = processor._target_size
+    gt = random_boxes(num_boxes, frame_w, frame_h)
+    model_boxes, sx, sy = to_model_space(gt, mode, frame_w, frame_h, target_w, target_h)
+
+    ious = []
+    for start in range(0, num_boxes, 300):
+        chunk = np.round(model_boxes[start:start + 300])
+        output = np.zeros((1, 300, 6), dtype=np.float32)
+        output[0, :len(chunk), :4] = chunk
+        output[0, :len(chunk), 4] = 0.99
+        result = processor.postprocess_output([output], original_shape=(frame_h, frame_w, 3))
+        predicted = detections_to_boxes(result["detections"], frame_w, frame_h)
+        ious.append(np.diag(box_iou(gt[start:start + len(predicted)], predicted)))
+
+    short_side = np.minimum(model_boxes[:, 2] - model_boxes[:, 0], model_boxes[:, 3] - model_boxes[:, 1])
+    return {
+        "roundtrip_iou": float(np.concatenate(ious).mean()),
+        "aspect_distortion": float(max(sx, sy) / min(sx, sy)),
+        "small_objects_pct": float((short_side < min_object_px).mean() * 100.0),
+    }
+
+
+def load_dataset(dataset: Path, limit: int) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Load images with YOLO labels ("class cx cy w h", normalized) from a directory.
+
+    Labels are looked up next to the image or in a sibling labels/ directory.
+
+    Returns:
+        List of (BGR image, class ids, boxes in pixels)
+    """
+    samples = []
+    for image_path in sorted(p for p in dataset.rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES):
+        candidates = [
+            image_path.with_suffix(".txt"),
+            Path(str(image_path.with_suffix(".txt")).replace("/images/", "/labels/")),
+        ]
+        label_path = next((p for p in candidates if p.exists()), None)
+        image = cv2.imread(str(image_path))
+        if label_path is None or image is None:
+            continue
+        labels = np.loadtxt(label_path, ndmin=2) if label_path.stat().st_size else np.zeros((0, 5))
+        h, w = image.shape[:2]
+        cx, cy, bw, bh = labels[:, 1] * w, labels[:, 2] * h, labels[:, 3] * w, labels[:, 4] * h
+        boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+        samples.append((image, labels[:, 0].astype(int), boxes))
+        if len(samples) >= limit:
+            break
+    return samples
+
+
+def dataset_accuracy(processor: FrameProcessor, samples, class_names: List[str]) -> Dict[str, float]:
+    """Precision/recall/F1 at IoU 0.5 (greedy matching per class) on real detections."""
+    tp = fp = fn = 0
+    for image, classes, gt in samples:
+        h, w = image.shape[:2]
+        detections = processor.process_frame(image)["detections"]
+        predicted = detections_to_boxes(detections, w, h)
+        predicted_classes = np.array([
+            class_names.index(name) if name in class_names else int(name)
+            for name in detections.names()
+        ], dtype=int)
+        matched = np.zeros(len(gt), dtype=bool)
+        for i in np.argsort(-detections.confidences):
+            if len(gt) == 0:
+                fp += 1
+                continue
+            ious = box_iou(predicted[i:i + 1], gt)[0]
+            ious[(classes != predicted_classes[i]) | matched] = 0.0
+            best = int(np.argmax(ious))
+            if ious[best] >= 0.5:
+                matched[best] = True
+                tp += 1
+            else:
+                fp += 1
+        fn += int((~matched).sum())
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+
+def run(args) -> List[Dict[str, Any]]:
+    frame_w, frame_h = RESOLUTIONS[args.resolution]
+    frame = make_frame(frame_w, frame_h)
+    samples = load_dataset(Path(args.dataset), args.dataset_limit) if args.dataset else []
+    if args.dataset:
+        print(f"Loaded {len(samples)} labelled images from {args.dataset}")
+
+    results = []
+    for size in args.target_sizes:
+        for mode in args.modes:
+            config_manager = make_config(
+                model_path=Path(args.model) if args.model else None,
+                overrides={
+                    "model.target_size": f"{size},{size}",
+                    "model.resize_mode": mode,
+                    "model.rotate_bbox_clockwise": False,
+                    "model.pool_size": 1,
+                },
+                model_options={"target_size": (size, size), "depth": args.model_depth,
+                               "width": args.model_width}
+            )
+            processor = FrameProcessor(Path(config_manager.get("model.path")), config_manager)
+            row: Dict[str, Any] = {"target_size": size, "mode": mode, "resolution": args.resolution}
+
+            preprocess = measure(lambda: processor.preprocess_frame(frame),
+                                 iterations=args.iterations, warmup=args.warmup)
+            row["preprocess_p50_ms"] = preprocess["p50_ms"]
+            total = measure(lambda: processor.process_frame(frame),
+                            iterations=args.iterations, warmup=args.warmup)
+            row.update(total)
+            row.update(geometric_accuracy(processor, mode, frame_w, frame_h,
+                                          args.boxes, args.min_object_px))
+            if samples:
+                row.update(dataset_accuracy(processor, samples, config_manager.get("model.class_names", [])))
+            results.append(row)
+            processor._model_pool.clear()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark stretch vs letterbox preprocessing")
+    parser.add_argument("--model", help="ONNX model (default: synthetic model per target size)")
+    parser.add_argument("--model-depth", type=int, default=4, help="Synthetic model conv layers")
+    parser.add_argument("--model-width", type=int, default=32, help="Synthetic model channels per layer")
+    parser.add_argument("--target-sizes", nargs="+", type=int, default=[320, 256, 224])
+    parser.add_argument("--modes", nargs="+", default=list(RESIZE_MODES), choices=list(RESIZE_MODES))
+    parser.add_argument("--resolution", default="720p", choices=list(RESOLUTIONS))
+    parser.add_argument("--boxes", type=int, default=1000, help="Random boxes for the geometric proxies")
+    parser.add_argument("--min-object-px", type=float, default=8.0,
+                        help="Short side (model pixels) below which an object counts as small")
+    parser.add_argument("--dataset", help="Directory with images and YOLO .txt labels (needs a real --model)")
+    parser.add_argument("--dataset-limit", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--output", help="Result JSON path (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run(args)
+    columns = ["target_size", "mode", "preprocess_p50_ms", "roundtrip_iou", "aspect_distortion",
+               "small_objects_pct"]
+    if args.dataset:
+        columns += ["precision", "recall", "f1"]
+    print_table(results, columns)
+    path = write_results(
+        "letterbox", results,
+        output=Path(args.output) if args.output else None,
+        extra={"parameters": vars(args)}
+    )
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark the frame pipeline stage by stage and end to end.
+
+Stages: decode (AIService._bytes_to_numpy per format), preprocess
+(FrameProcessor.preprocess_frame), preprocess_yuv (YUV420 planes straight
+to model input), inference (ModelInference.predict), postprocess
+(FrameProcessor.postprocess_output), response (postprocess plus building
+and serializing AIResults, per-detection messages vs the columnar
+encoding) and the full AIService.ProcessFrame,
+on synthetic JPEG/YUV420/NV21/RGB frames at 360p,
+720p and 1080p. Runs CPU-only against a model from make_synthetic_model.py
+unless --model is given.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --resolutions 720p --formats jpeg --iterations 500
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import (
+    RESOLUTIONS, FORMATS, make_frame, encode_frame, make_config,
+    measure, write_results, print_table,
+)
+from ai_system.grpc_server import AIService, FrameRequest, FrameResponse
+
+
+def synthetic_output(num_detections: int, conf_threshold: float,
+                     target_size, num_classes: int, seed: int = 0) -> list:
+    """
+    Build a raw (1, 300, 6) model output with num_detections rows above threshold.
+
+    Args:
+        num_detections: Rows that pass the confidence threshold
+        conf_threshold: Confidence threshold from config
+        target_size: Model input size (width, height)
+        num_classes: Number of classes
+        seed: Random seed
+
+    Returns:
+        List with one output tensor, as returned by ModelInference.predict
+    """
+    rng = np.random.default_rng(seed)
+    width, height = target_size
+    output = np.zeros((1, 300, 6), dtype=np.float32)
+    x1 = rng.uniform(0, width * 0.8, 300)
+    y1 = rng.uniform(0, height * 0.8, 300)
+    output[0, :, 0] = x1
+    output[0, :, 1] = y1
+    output[0, :, 2] = x1 + rng.uniform(10, width * 0.2, 300)
+    output[0, :, 3] = y1 + rng.uniform(10, height * 0.2, 300)
+    output[0, :, 4] = rng.uniform(0, conf_threshold * 0.9, 300)
+    output[0, :num_detections, 4] = rng.uniform(conf_threshold + 0.01, 1.0, num_detections)
+    output[0, :, 5] = rng.integers(0, max(1, num_classes), 300)
+    return [output]
+
+
+def run(args) -> list:
+    config_manager = make_config(
+        model_path=Path(args.model) if args.model else None,
+        overrides={"model.pool_size": args.pool_size},
+        model_options={"depth": args.model_depth, "width": args.model_width,
+                       "num_detections": args.model_detections}
+    )
+    service = AIService(config_manager)
+    processor = service._frame_processor
+    if args.decode_scale != 1:
+        service.set_decode_scale(args.decode_scale)
+
+    results = []
+
+    def record(stage, resolution="", fmt="", **params):
+        row = {"stage": stage, "resolution": resolution, "format": fmt}
+        row.update(params)
+        return row
+
+    def bench(func, items_per_call=1):
+        return measure(func, iterations=args.iterations, warmup=args.warmup, items_per_call=items_per_call)
+
+    for resolution in args.resolutions:
+        width, height = RESOLUTIONS[resolution]
+        frame = make_frame(width, height)
+
+        # Decode per format
+        payloads = {fmt: encode_frame(frame, fmt) for fmt in args.formats}
+        for fmt, payload in payloads.items():
+            stats = bench(lambda: service._bytes_to_numpy(payload, width, height, 3, fmt))
+            results.append({**record("decode", resolution, fmt, payload_bytes=len(payload)), **stats})
+
+        # Preprocess (input is the decoded BGR frame)
+        stats = bench(lambda: processor.preprocess_frame(frame))
+        results.append({**record("preprocess", resolution), **stats})
+
+        # YUV420 straight to model input (no full-size BGR frame)
+        for fmt in ("yuv420", "nv21"):
+            if fmt in payloads:
+                layout = service._frame_decoder.direct_yuv_layout(fmt)
+                payload = payloads[fmt]
+                stats = bench(lambda: processor.preprocess_yuv420(payload, width, height, layout))
+                results.append({**record("preprocess_yuv", resolution, fmt), **stats})
+
+        # Full ProcessFrame with the format field set, as sent by the Go gateway
+        for fmt, payload in payloads.items():
+            request = FrameRequest(frame_data=payload, width=width, height=height, channels=3, format=fmt)
+            stats = bench(lambda: service.ProcessFrame(request, None))
+            results.append({**record("process_frame", resolution, fmt, payload_bytes=len(payload)), **stats})
+
+    # Inference does not depend on the client resolution
+    model = processor._model_pool.acquire()
+    try:
+        tensor = processor.preprocess_frame(make_frame(*RESOLUTIONS[args.resolutions[0]]))
+        stats = bench(lambda: model.predict(tensor))
+        results.append({**record("inference"), **stats})
+    finally:
+        processor._model_pool.release(model)
+
+    # Postprocess with varying numbers of detections
+    conf_threshold = config_manager.get("model.conf_threshold", 0.25)
+    num_classes = len(config_manager.get("model.class_names", [])) or 1
+    original_shape = (RESOLUTIONS["720p"][1], RESOLUTIONS["720p"][0], 3)
+    for num_detections in args.detections:
+        output = synthetic_output(num_detections, conf_threshold, processor._target_size, num_classes)
+        stats = bench(lambda: processor.postprocess_output(output, original_shape=original_shape))
+        results.append({**record("postprocess", detections=num_detections), **stats})
+
+        # Postprocess + protobuf response, per-detection messages vs packed arrays
+        for encoding, columnar in (("detections", False), ("columnar", True)):
+            def build_response():
+                response = FrameResponse()
+                result = processor.postprocess_output(output, original_shape=original_shape)
+                service._fill_ai_results(response.ai_results, result, columnar)
+                return response.SerializeToString()
+            stats = bench(build_response)
+            results.append({**record("response", fmt=encoding, detections=num_detections,
+                                     response_bytes=len(build_response())), **stats})
+
+    service.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the frame processing pipeline")
+    parser.add_argument("--model", help="ONNX model to use (default: generated synthetic model)")
+    parser.add_argument("--model-depth", type=int, default=4, help="Synthetic model conv layers")
+    parser.add_argument("--model-width", type=int, default=32, help="Synthetic model channels per layer")
+    parser.add_argument("--model-detections", type=int, default=5, help="Synthetic model detections per frame")
+    parser.add_argument("--resolutions", nargs="+", default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument("--detections", nargs="+", type=int, default=[0, 10, 100],
+                        help="Detections above threshold for the postprocess benchmark")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--decode-scale", type=int, default=1, choices=[1, 2, 4, 8])
+    parser.add_argument("--output", help="Result JSON path (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run(args)
+    print_table(results, ["stage", "resolution", "format", "detections"])
+    path = write_results(
+        "pipeline", results,
+        output=Path(args.output) if args.output else None,
+        extra={"parameters": vars(args)}
+    )
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Per-task overhead of ai_system.ThreadPool.
+
+Scenarios (tasks do no work, so only scheduling cost is measured):
+
+- roundtrip: submit one task and wait for its result (submit-to-result latency)
+- burst: submit --burst tasks at once and wait for all (throughput)
+
+Usage:
+    python benchmarks/bench_thread_pool.py
+    python benchmarks/bench_thread_pool.py --workers 1 4 16 --burst 5000
+    python benchmarks/bench_thread_pool.py --queue-size 100   # bounded queue, blocking submit
+"""
+
+import argparse
+import logging
+import sys
+from concurrent.futures import wait
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import measure, write_results, print_table
+from ai_system.thread_pool import ThreadPool, TaskPriority
+
+PRIORITIES = list(TaskPriority)
+
+
+def _noop(value):
+    return value
+
+
+def bench_roundtrip(pool: ThreadPool, iterations: int):
+    return measure(lambda: pool.submit(_noop, 1).result(), iterations=iterations, warmup=iterations // 10)
+
+
+def bench_burst(pool: ThreadPool, burst: int, iterations: int):
+    def run():
+        futures = [
+            pool.submit(_noop, i, priority=PRIORITIES[i % len(PRIORITIES)])
+            for i in range(burst)
+        ]
+        wait(futures)
+    return measure(run, iterations=iterations, warmup=2, items_per_call=burst)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--burst", type=int, default=2000, help="Tasks per burst")
+    parser.add_argument("--iterations", type=int, default=2000, help="Roundtrip iterations")
+    parser.add_argument("--burst-iterations", type=int, default=10)
+    parser.add_argument("--queue-size", type=int, default=0, help="task_queue_size (0 = unlimited)")
+    parser.add_argument("--overflow-policy", default="block", choices=["block", "reject", "drop_oldest"])
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = []
+    for workers in args.workers:
+        with ThreadPool(max_workers=workers, task_queue_size=args.queue_size,
+                        overflow_policy=args.overflow_policy, name=f"bench{workers}") as pool:
+            row = {"scenario": "roundtrip", "workers": workers}
+            row.update(bench_roundtrip(pool, args.iterations))
+            results.append(row)
+
+            row = {"scenario": f"burst_{args.burst}", "workers": workers}
+            row.update(bench_burst(pool, args.burst, args.burst_iterations))
+            results.append(row)
+
+    print_table(results, ["scenario", "workers"])
+    path = write_results("thread_pool", results, args.output,
+                         extra={"burst": args.burst, "queue_size": args.queue_size,
+                                "overflow_policy": args.overflow_policy})
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Shared helpers for the benchmark suite: synthetic frames, synthetic model,
+benchmark configuration, timing and result files.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from ai_system.config_manager import ConfigurationManager
+from make_synthetic_model import build_synthetic_model
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "360p": (640, 360),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+}
+
+FORMATS = ("jpeg", "yuv420", "nv21", "rgb")
+
+
+def make_frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """
+    Build a synthetic BGR frame that compresses like a camera image.
+
+    Smooth gradients plus blocks and mild noise keep JPEG sizes in a
+    realistic range (pure noise or flat color would not).
+
+    Args:
+        width: Frame width
+        height: Frame height
+        seed: Random seed
+
+    Returns:
+        uint8 BGR frame (height, width, 3)
+    """
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)
+    frame = np.empty((height, width, 3), dtype=np.float32)
+    frame[..., 0] = x[None, :]
+    frame[..., 1] = y[:, None]
+    frame[..., 2] = (x[None, :] + y[:, None]) / 2
+
+    for _ in range(12):
+        w = int(rng.integers(width // 16, width // 4))
+        h = int(rng.integers(height // 16, height // 4))
+        x0 = int(rng.integers(0, width - w))
+        y0 = int(rng.integers(0, height - h))
+        frame[y0:y0 + h, x0:x0 + w] = rng.integers(0, 256, 3)
+
+    frame += rng.normal(0, 6, frame.shape).astype(np.float32)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def encode_frame(frame: np.ndarray, fmt: str, quality: int = 85) -> bytes:
+    """
+    Encode a BGR frame the way clients send it.
+
+    Args:
+        frame: uint8 BGR frame
+        fmt: "jpeg", "png", "yuv420" (I420), "nv12", "nv21" or "rgb"
+        quality: JPEG quality
+
+    Returns:
+        Encoded frame bytes
+    """
+    if fmt == "jpeg":
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise RuntimeError("JPEG encode failed")
+        return buffer.tobytes()
+    if fmt == "png":
+        ok, buffer = cv2.imencode(".png", frame)
+        if not ok:
+            raise RuntimeError("PNG encode failed")
+        return buffer.tobytes()
+    if fmt == "yuv420":
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420).tobytes()
+    if fmt in ("nv12", "nv21"):
+        height, width = frame.shape[:2]
+        i420 = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420).ravel()
+        y_size, chroma_size = width * height, width * height // 4
+        u = i420[y_size:y_size + chroma_size]
+        v = i420[y_size + chroma_size:]
+        uv = np.empty(chroma_size * 2, dtype=np.uint8)
+        uv[0::2], uv[1::2] = (u, v) if fmt == "nv12" else (v, u)
+        return np.concatenate([i420[:y_size], uv]).tobytes()
+    if fmt == "rgb":
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB).tobytes()
+    raise ValueError(f"Unknown frame format: {fmt}")
+
+
+def make_config(model_path: Optional[Path] = None,
+                overrides: Optional[Dict[str, Any]] = None,
+                model_options: Optional[Dict[str, Any]] = None) -> ConfigurationManager:
+    """
+    Build a ConfigurationManager from config.json for benchmarking.
+
+    The model path points at the given ONNX model (or a synthetic one from
+    make_synthetic_model.py), the TensorRT engine is disabled, and background monitors
+    and the metrics endpoint are turned off so they do not skew timings.
+
+    Args:
+        model_path: ONNX model to use (default: generate a synthetic model)
+        overrides: Extra dotted-key overrides, e.g. {"model.pool_size": 2}
+        model_options: Extra build_synthetic_model arguments, e.g. {"depth": 8}
+
+    Returns:
+        ConfigurationManager without hot reload
+    """
+    with open(REPO_ROOT / "config.json", "r") as f:
+        config = json.load(f)
+
+    if model_path is None:
+        model_config = config["model"]
+        options = {
+            "target_size": tuple(int(v) for v in model_config["target_size"].split(",")),
+            "num_classes": len(model_config.get("class_names", [])) or 1,
+            "min_confidence": model_config.get("conf_threshold", 0.25),
+        }
+        options.update(model_options or {})
+        name = "synthetic_d{}_w{}_n{}_{}x{}.onnx".format(
+            options.get("depth", 4), options.get("width", 32), options.get("num_detections", 5),
+            *options["target_size"]
+        )
+        model_path = Path(tempfile.gettempdir()) / "ai_system_bench" / name
+        build_synthetic_model(model_path, **options)
+
+    config_manager = ConfigurationManager(default_config=config, enable_hot_reload=False)
+    settings = {
+        "model.path": str(model_path),
+        "model.tensorrt_engine_path": None,
+        "memory.enable_monitoring": False,
+        "memory.gc_tuning.freeze_after_warmup": False,
+        "metrics.enabled": False,
+        "model.optimization_cache.dir": str(Path(tempfile.gettempdir()) / "ai_system_bench" / "cache"),
+    }
+    settings.update(overrides or {})
+    for key, value in settings.items():
+        config_manager.set(key, value)
+    return config_manager
+
+
+def measure(func: Callable[[], Any],
+            iterations: int = 200,
+            warmup: int = 20,
+            items_per_call: int = 1) -> Dict[str, Any]:
+    """
+    Time repeated calls of func and summarize the latency distribution.
+
+    Args:
+        func: Zero-argument callable to benchmark
+        iterations: Number of timed calls
+        warmup: Untimed calls before measuring
+        items_per_call: Items processed per call (for throughput)
+
+    Returns:
+        Dictionary with latency percentiles in ms and throughput per second
+    """
+    for _ in range(warmup):
+        func()
+
+    latencies = np.empty(iterations, dtype=np.float64)
+    wall_start = time.perf_counter()
+    for i in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies[i] = time.perf_counter() - start
+    wall = time.perf_counter() - wall_start
+
+    latencies_ms = latencies * 1000.0
+    p50, p90, p99 = np.percentile(latencies_ms, [50, 90, 99])
+    return {
+        "iterations": iterations,
+        "mean_ms": float(latencies_ms.mean()),
+        "std_ms": float(latencies_ms.std()),
+        "min_ms": float(latencies_ms.min()),
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "max_ms": float(latencies_ms.max()),
+        "throughput_per_s": float(iterations * items_per_call / wall) if wall > 0 else 0.0,
+    }
+
+
+def environment_info() -> Dict[str, Any]:
+    """Collect the environment details needed to compare result files."""
+    import onnxruntime as ort
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        commit = ""
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "onnxruntime": ort.__version__,
+    }
+
+
+def write_results(name: str, results: List[Dict[str, Any]],
+                  output: Optional[Path] = None,
+                  extra: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    Write benchmark results as JSON.
+
+    Args:
+        name: Benchmark name (used in the default file name)
+        results: List of result rows
+        output: Output file (default: benchmarks/results/<name>_<timestamp>.json)
+        extra: Additional top-level fields (e.g. parameters)
+
+    Returns:
+        Path of the written file
+    """
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    document = {"benchmark": name, "environment": environment_info(), "results": results}
+    document.update(extra or {})
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    return output
+
+
+def print_table(results: List[Dict[str, Any]], columns: List[str]) -> None:
+    """Print result rows as an aligned text table."""
+    if not results:
+        return
+    headers = columns + ["p50_ms", "p90_ms", "p99_ms", "throughput_per_s"]
+    rows = []
+    for row in results:
+        cells = []
+        for header in headers:
+            value = row.get(header, "")
+            cells.append(f"{value:.2f}" if isinstance(value, float) else str(value))
+        rows.append(cells)
+    widths = [max(len(header), *(len(r[i]) for r in rows)) for i, header in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    for cells in rows:
+        print("  ".join(c.ljust(w) for c, w in zip(cells, widths)))
@@ -0,0 +1,717 @@
+#!/usr/bin/env python3
+"""
+gRPC load generator and soak-test harness for AIService.
+
+Drives ProcessFrame over a real gRPC channel with either a closed loop
+(N workers sending back to back) or an open loop (fixed arrival rate,
+independent of how fast the server answers). Open-loop latencies are
+measured from the *intended* send time, so queueing delay caused by a slow
+server is not hidden (coordinated omission correction); the plain service
+time is reported next to it.
+
+Every report interval it prints and records throughput, error rate,
+latency percentiles, GetServerStats (model pool usage) and the server RSS,
+so a soak run of several hours shows leaks and throughput decay.
+
+Usage:
+    # Start a server with a synthetic model and run 60s at 50 frames/s
+    python benchmarks/grpc_load.py --spawn --rate 50 --duration 60
+
+    # Soak an already running server for 4 hours, sampling its RSS
+    python benchmarks/grpc_load.py --target localhost:50051 --server-pid 1234 \\
+        --rate 30 --duration 4h --mix jpeg_720p:0.7,yuv420_360p:0.3 --sessions 8
+
+    # Same-host transports: Unix domain socket, plus frames via shared memory
+    python benchmarks/grpc_load.py --spawn --unix-socket /tmp/ai_load.sock --shm ai_load_frames
+"""
+
+import argparse
+import itertools
+import logging
+import math
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import grpc
+import numpy as np
+import psutil
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import REPO_ROOT, RESOLUTIONS, make_frame, encode_frame, make_config, write_results
+
+sys.path.insert(0, str(REPO_ROOT / "ai_system" / "proto"))
+import ai_service_pb2
+import ai_service_pb2_grpc
+from ai_system.shm_ring import SharedFrameRing
+
+
+# ---------------------------------------------------------------------------
+# Latency histogram
+# ---------------------------------------------------------------------------
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram with bounded memory.
+
+    Buckets grow by 2% from 10us to 10min, so percentiles are accurate to
+    about 1% no matter how long a soak runs.
+    """
+
+    MIN_S = 1e-5
+    MAX_S = 600.0
+    GROWTH = 1.02
+
+    def __init__(self):
+        self._num_buckets = int(math.ceil(math.log(self.MAX_S / self.MIN_S, self.GROWTH))) + 2
+        self._counts = np.zeros(self._num_buckets, dtype=np.int64)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, seconds: float) -> int:
+        if seconds <= self.MIN_S:
+            return 0
+        return min(self._num_buckets - 1, int(math.log(seconds / self.MIN_S, self.GROWTH)) + 1)
+
+    def record(self, seconds: float) -> None:
+        index = self._bucket(seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        with self._lock:
+            self._counts += other._counts
+            self.count += other.count
+            self.total += other.total
+            self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Return the q-th percentile (0-100) in seconds (bucket upper bound)."""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = max(1, int(math.ceil(q / 100.0 * self.count)))
+            index = int(np.searchsorted(np.cumsum(self._counts), rank))
+        return min(self.MIN_S * self.GROWTH ** index, self.max)
+
+    def summary(self) -> Dict[str, float]:
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000.0,
+            "p50_ms": self.percentile(50) * 1000.0,
+            "p90_ms": self.percentile(90) * 1000.0,
+            "p99_ms": self.percentile(99) * 1000.0,
+            "p999_ms": self.percentile(99.9) * 1000.0,
+            "max_ms": self.max * 1000.0,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+@dataclass
+class FrameVariant:
+    """One entry of the frame mix, e.g. jpeg_720p."""
+    name: str
+    weight: float
+    requests: List[Any] = field(default_factory=list)
+
+
+def parse_duration(value: str) -> float:
+    """Parse durations such as 90, 90s, 15m, 4h into seconds."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid duration: {value}")
+    number, unit = float(match.group(1)), match.group(2)
+    return number * {"": 1, "s": 1, "m": 60, "h": 3600}[unit]
+
+
+def build_mix(spec: str, distinct_frames: int = 4, columnar: bool = False) -> List[FrameVariant]:
+    """
+    Build the frame mix from a spec like "jpeg_720p:0.7,yuv420_360p:0.3".
+
+    Each variant pre-encodes a few distinct frames so the server does not
+    see byte-identical payloads.
+
+    Args:
+        spec: Comma separated <format>_<resolution>:<weight> entries
+        distinct_frames: Number of different frames per variant
+        columnar: Ask for the columnar detections encoding
+
+    Returns:
+        List of FrameVariant
+    """
+    variants = []
+    for entry in spec.split(","):
+        name, _, weight = entry.strip().partition(":")
+        fmt, _, resolution = name.partition("_")
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution in mix entry '{entry}'")
+        width, height = RESOLUTIONS[resolution]
+        variant = FrameVariant(name=name, weight=float(weight or 1.0))
+        for seed in range(distinct_frames):
+            payload = encode_frame(make_frame(width, height, seed=seed), fmt)
+            variant.requests.append(ai_service_pb2.FrameRequest(
+                frame_data=payload, width=width, height=height, channels=3, format=fmt, columnar=columnar
+            ))
+        variants.append(variant)
+    return variants
+
+
+class ArrivalSchedule:
+    """
+    Intended send times for the open-loop generator.
+
+    Patterns:
+        constant: evenly spaced at the target rate
+        poisson:  exponential inter-arrival times (random phone timing)
+        burst:    rate x burst_factor for burst_seconds, then idle, repeating
+                  so the average rate matches the target
+    """
+
+    def __init__(self, rate: float, pattern: str = "constant",
+                 burst_factor: float = 4.0, burst_seconds: float = 2.0, seed: int = 0):
+        self._rate = rate
+        self._pattern = pattern
+        self._burst_factor = burst_factor
+        self._burst_seconds = burst_seconds
+        self._random = random.Random(seed)
+
+    def offsets(self):
+        """Yield send times in seconds relative to the start of the run."""
+        t = 0.0
+        if self._pattern == "burst":
+            period = self._burst_seconds * self._burst_factor
+            burst_interval = 1.0 / (self._rate * self._burst_factor)
+            cycle = 0
+            while True:
+                start = cycle * period
+                t = start
+                while t < start + self._burst_seconds:
+                    yield t
+                    t += burst_interval
+                cycle += 1
+        while True:
+            yield t
+            if self._pattern == "poisson":
+                t += self._random.expovariate(self._rate)
+            else:
+                t += 1.0 / self._rate
+
+
+# ---------------------------------------------------------------------------
+# Load generator
+# ---------------------------------------------------------------------------
+
+class IntervalStats:
+    """Counters and histograms for one report interval."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.ok = 0
+        self.failed = 0  # success=False responses
+        self.errors: Dict[str, int] = {}  # gRPC status code -> count
+        self.latency = LatencyHistogram()  # from intended send time
+        self.service_time = LatencyHistogram()  # from actual send time
+        self.server_ms = LatencyHistogram()  # processing_time_ms reported by server
+
+
+class LoadGenerator:
+    """Sends ProcessFrame requests and aggregates per-interval statistics."""
+
+    def __init__(self, target: str, variants: List[FrameVariant], args):
+        self._logger = logging.getLogger(__name__)
+        self._target = target
+        self._variants = variants
+        self._weights = [v.weight for v in variants]
+        self._args = args
+        self._random = random.Random(args.seed)
+        self._random_lock = threading.Lock()
+
+        self._channel = grpc.insecure_channel(target, options=[
+            ("grpc.max_send_message_length", 64 * 1024 * 1024),
+            ("grpc.max_receive_message_length", 64 * 1024 * 1024),
+        ])
+        self._stub = ai_service_pb2_grpc.AIServiceStub(self._channel)
+
+        self._interval = IntervalStats()
+        self._interval_lock = threading.Lock()
+        self._total_latency = LatencyHistogram()
+        self._total_service = LatencyHistogram()
+        self._totals = {"sent": 0, "ok": 0, "failed": 0, "errors": {}, "late_sends": 0}
+        self._totals_lock = threading.Lock()
+        self._inflight = 0
+        self._inflight_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sequence = 0
+        self._ring: Optional[SharedFrameRing] = None
+        self._shm_seq = itertools.count(1)
+
+    def wait_ready(self, timeout: float) -> None:
+        grpc.channel_ready_future(self._channel).result(timeout=timeout)
+
+    def attach_ring(self, name: str) -> None:
+        """Send frames through the server's shared memory ring instead of inline."""
+        self._ring = SharedFrameRing.attach(name)
+
+    def _shm_request(self, request) -> Tuple[Any, Optional[int]]:
+        """Copy the frame into a ring slot; the request only carries the slot index."""
+        slot = self._ring.acquire(timeout=self._args.timeout)
+        if slot is None:
+            raise TimeoutError("no free shared memory slot")
+        seq = next(self._shm_seq)
+        length = self._ring.write(slot, request.frame_data, seq)
+        return ai_service_pb2.FrameRequest(
+            width=request.width, height=request.height, channels=request.channels,
+            format=request.format, columnar=request.columnar,
+            shm_slot=slot, shm_length=length, shm_seq=seq
+        ), slot
+
+    def _next_request(self) -> Tuple[str, Any, str]:
+        with self._random_lock:
+            variant = self._random.choices(self._variants, weights=self._weights)[0]
+            request = self._random.choice(variant.requests)
+            self._sequence += 1
+            session = f"load-{self._sequence % self._args.sessions}"
+        return variant.name, request, session
+
+    def _metadata(self, session: str) -> tuple:
+        metadata = (("x-session-id", session),)
+        if self._args.model_variant:
+            metadata += (("x-model-variant", self._args.model_variant),)
+        if self._args.request_class:
+            metadata += (("x-request-class", self._args.request_class),)
+        return metadata
+
+    def _send(self, intended: float) -> None:
+        _, request, session = self._next_request()
+        interval = self._interval
+        with self._inflight_lock:
+            self._inflight += 1
+        sent = time.perf_counter()
+        slot = None
+        try:
+            if self._ring is not None:
+                request, slot = self._shm_request(request)
+            response = self._stub.ProcessFrame(
+                request,
+                timeout=self._args.timeout,
+                metadata=self._metadata(session)
+            )
+            done = time.perf_counter()
+            outcome = "ok" if response.success else "failed"
+            interval.server_ms.record(response.processing_time_ms / 1000.0)
+        except grpc.RpcError as e:
+            done = time.perf_counter()
+            outcome = e.code().name if e.code() else "UNKNOWN"
+        except TimeoutError:
+            done = time.perf_counter()
+            outcome = "SHM_SLOT_TIMEOUT"
+        finally:
+            if slot is not None:
+                self._ring.release(slot)
+            with self._inflight_lock:
+                self._inflight -= 1
+
+        # Totals are recorded directly so requests straddling a report
+        # boundary are never lost from the final summary
+        with interval.lock:
+            interval.sent += 1
+            if outcome == "ok":
+                interval.ok += 1
+            elif outcome == "failed":
+                interval.failed += 1
+            else:
+                interval.errors[outcome] = interval.errors.get(outcome, 0) + 1
+        with self._totals_lock:
+            totals = self._totals
+            totals["sent"] += 1
+            if outcome in ("ok", "failed"):
+                totals[outcome] += 1
+            else:
+                totals["errors"][outcome] = totals["errors"].get(outcome, 0) + 1
+
+        interval.latency.record(done - intended)
+        interval.service_time.record(done - sent)
+        self._total_latency.record(done - intended)
+        self._total_service.record(done - sent)
+
+    def _closed_loop_worker(self) -> None:
+        while not self._stop.is_set():
+            self._send(time.perf_counter())
+
+    def _open_loop(self, start: float, executor: ThreadPoolExecutor) -> None:
+        schedule = ArrivalSchedule(self._args.rate, self._args.pattern,
+                                   self._args.burst_factor, self._args.burst_seconds, self._args.seed)
+        for offset in schedule.offsets():
+            if self._stop.is_set():
+                return
+            intended = start + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                if self._stop.wait(delay):
+                    return
+            elif delay < -0.001:
+                self._totals["late_sends"] += 1
+            executor.submit(self._send, intended)
+
+    def _take_interval(self) -> IntervalStats:
+        with self._interval_lock:
+            interval, self._interval = self._interval, IntervalStats()
+        return interval
+
+    def server_stats(self) -> Dict[str, Any]:
+        try:
+            response = self._stub.GetServerStats(ai_service_pb2.Empty(), timeout=2.0)
+            return {"pool_size": response.pool_size, "pool_in_use": response.in_use}
+        except grpc.RpcError as e:
+            return {"stats_error": e.code().name if e.code() else "UNKNOWN"}
+
+    def run(self, duration: float, report_interval: float,
+            rss_sampler: Optional["RssSampler"]) -> List[Dict[str, Any]]:
+        """
+        Run the load for duration seconds.
+
+        Returns:
+            List of per-interval report rows
+        """
+        args = self._args
+        workers = args.concurrency
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="load")
+        start = time.perf_counter()
+        wall_start = time.time()
+
+        if args.rate > 0:
+            scheduler = threading.Thread(target=self._open_loop, args=(start, executor), daemon=True)
+            scheduler.start()
+        else:
+            for _ in range(workers):
+                executor.submit(self._closed_loop_worker)
+
+        timeline = []
+        next_report = start + report_interval
+        try:
+            while True:
+                now = time.perf_counter()
+                end = start + duration
+                if now >= end:
+                    break
+                time.sleep(max(0.0, min(next_report, end) - now))
+                interval_start = next_report - report_interval
+                interval = self._take_interval()
+                elapsed = time.perf_counter() - interval_start
+                next_report += report_interval
+                row = self._report_row(interval, time.perf_counter() - start, elapsed, rss_sampler)
+                timeline.append(row)
+                self._print_row(row)
+        except KeyboardInterrupt:
+            print("Interrupted, finishing up...")
+        finally:
+            self._stop.set()
+            executor.shutdown(wait=True)
+
+        self._wall_duration = time.time() - wall_start
+        return timeline
+
+    def _report_row(self, interval: IntervalStats, elapsed_total: float, elapsed: float,
+                    rss_sampler: Optional["RssSampler"]) -> Dict[str, Any]:
+        errors = sum(interval.errors.values())
+        row = {
+            "elapsed_s": round(elapsed_total, 1),
+            "sent": interval.sent,
+            "ok": interval.ok,
+            "failed": interval.failed,
+            "errors": dict(interval.errors),
+            "throughput_per_s": interval.ok / elapsed if elapsed > 0 else 0.0,
+            "error_rate": (interval.failed + errors) / interval.sent if interval.sent else 0.0,
+            "inflight": self._inflight,
+            "latency": interval.latency.summary(),
+            "service_time": interval.service_time.summary(),
+            "server_processing": interval.server_ms.summary(),
+        }
+        row.update(self.server_stats())
+        if rss_sampler:
+            row["server_rss_mb"] = rss_sampler.sample()
+        return row
+
+    @staticmethod
+    def _print_row(row: Dict[str, Any]) -> None:
+        latency = row["latency"]
+        print(
+            f"[{row['elapsed_s']:>8.1f}s] ok={row['ok']:<6} tput={row['throughput_per_s']:7.1f}/s "
+            f"err={row['error_rate'] * 100:5.2f}% "
+            f"p50={latency.get('p50_ms', 0):7.1f}ms p99={latency.get('p99_ms', 0):7.1f}ms "
+            f"inflight={row['inflight']:<3} pool={row.get('pool_in_use', '-')}/{row.get('pool_size', '-')} "
+            f"rss={row.get('server_rss_mb', float('nan')):.1f}MB",
+            flush=True
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        totals = self._totals
+        errors = sum(totals["errors"].values())
+        duration = getattr(self, "_wall_duration", 0.0)
+        return {
+            "sent": totals["sent"],
+            "ok": totals["ok"],
+            "failed": totals["failed"],
+            "errors": totals["errors"],
+            "late_sends": totals["late_sends"],
+            "error_rate": (totals["failed"] + errors) / totals["sent"] if totals["sent"] else 0.0,
+            "throughput_per_s": totals["ok"] / duration if duration > 0 else 0.0,
+            "latency": self._total_latency.summary(),
+            "service_time": self._total_service.summary(),
+        }
+
+    def close(self) -> None:
+        self._channel.close()
+        if self._ring is not None:
+            self._ring.close()
+
+
+# ---------------------------------------------------------------------------
+# Server side sampling
+# ---------------------------------------------------------------------------
+
+class RssSampler:
+    """Reads the server RSS from its pid or from the /metrics endpoint."""
+
+    def __init__(self, pid: Optional[int] = None, metrics_url: Optional[str] = None):
+        self._process = psutil.Process(pid) if pid else None
+        self._metrics_url = metrics_url
+
+    def sample(self) -> float:
+        """Return the server RSS in MB (NaN if unavailable)."""
+        try:
+            if self._process is not None:
+                return self._process.memory_info().rss / (1024 * 1024)
+            if self._metrics_url:
+                import urllib.request
+                with urllib.request.urlopen(self._metrics_url, timeout=2.0) as response:
+                    for line in response.read().decode("utf-8").splitlines():
+                        if line.startswith("ai_process_resident_memory_bytes "):
+                            return float(line.split()[1]) / (1024 * 1024)
+        except Exception:
+            pass
+        return float("nan")
+
+
+def trend_analysis(timeline: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fit RSS growth and compare early vs late throughput for soak runs.
+
+    Returns:
+        Dictionary with rss_slope_mb_per_hour and throughput_change_percent
+    """
+    analysis: Dict[str, Any] = {}
+    points = [(row["elapsed_s"], row["server_rss_mb"]) for row in timeline
+              if not math.isnan(row.get("server_rss_mb", float("nan")))]
+    if len(points) >= 3:
+        # Skip the first 10% so warmup allocations are not reported as a leak
+        points = points[len(points) // 10:]
+        t, rss = np.array(points).T
+        slope, _ = np.polyfit(t, rss, 1)
+        analysis["rss_start_mb"] = float(rss[0])
+        analysis["rss_end_mb"] = float(rss[-1])
+        analysis["rss_slope_mb_per_hour"] = float(slope * 3600)
+
+    if len(timeline) >= 10:
+        window = max(1, len(timeline) // 10)
+        early = np.mean([row["throughput_per_s"] for row in timeline[:window]])
+        late = np.mean([row["throughput_per_s"] for row in timeline[-window:]])
+        analysis["throughput_early_per_s"] = float(early)
+        analysis["throughput_late_per_s"] = float(late)
+        analysis["throughput_change_percent"] = float((late - early) / early * 100) if early > 0 else 0.0
+    return analysis
+
+
+# ---------------------------------------------------------------------------
+# Synthetic-model server
+# ---------------------------------------------------------------------------
+
+def serve_synthetic(args) -> None:
+    """Run the real gRPC server with a synthetic model (blocks)."""
+    from ai_system.grpc_server import serve
+
+    config_manager = make_config(
+        overrides={
+            "grpc.host": "127.0.0.1",
+            "grpc.port": args.port,
+            "grpc.max_workers": args.server_workers,
+            "grpc.unix_socket": args.unix_socket or "",
+            "grpc.shared_memory": {"enabled": bool(args.shm), "name": args.shm or "ai_system_frames"},
+            "grpc.server_options": {"preset": args.server_preset},
+            "model.pool_size": args.pool_size,
+            "model.inference_cores": args.inference_cores or [],
+            "cpu_executor": {"enabled": args.cpu_executor is not None,
+                             "cores": "" if args.cpu_executor in (None, "auto") else args.cpu_executor},
+            "pipeline.enabled": args.pipeline,
+            "model.roi.enabled": args.roi,
+            "grpc.priority.enabled": args.priority_lanes,
+        },
+        model_options={"depth": args.model_depth, "width": args.model_width,
+                       "num_detections": args.model_detections}
+    )
+    serve(config_manager)
+
+
+def spawn_server(args) -> subprocess.Popen:
+    command = [
+        sys.executable, str(Path(__file__).resolve()), "--serve-only",
+        "--port", str(args.port), "--pool-size", str(args.pool_size),
+        "--server-workers", str(args.server_workers),
+        "--model-depth", str(args.model_depth), "--model-width", str(args.model_width),
+        "--model-detections", str(args.model_detections),
+        "--server-preset", args.server_preset,
+    ]
+    if args.unix_socket:
+        command += ["--unix-socket", args.unix_socket]
+    if args.shm:
+        command += ["--shm", args.shm]
+    if args.cpu_executor is not None:
+        command += ["--cpu-executor", args.cpu_executor]
+    if args.inference_cores:
+        command += ["--inference-cores", args.inference_cores]
+    if args.pipeline:
+        command.append("--pipeline")
+    if args.roi:
+        command.append("--roi")
+    if args.priority_lanes:
+        command.append("--priority-lanes")
+    return subprocess.Popen(command, cwd=str(REPO_ROOT))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gRPC load generator and soak harness for AIService")
+    target = parser.add_argument_group("target")
+    target.add_argument("--target", default="localhost:50051", help="host:port of a running server")
+    target.add_argument("--spawn", action="store_true", help="Start a server with a synthetic model")
+    target.add_argument("--port", type=int, default=50151, help="Port for --spawn")
+    target.add_argument("--pool-size", type=int, default=2, help="Model pool size for --spawn")
+    target.add_argument("--server-workers", type=int, default=10, help="gRPC workers for --spawn")
+    target.add_argument("--model-depth", type=int, default=4, help="Synthetic model conv layers for --spawn")
+    target.add_argument("--model-width", type=int, default=32, help="Synthetic model channels for --spawn")
+    target.add_argument("--model-detections", type=int, default=5, help="Synthetic detections for --spawn")
+    target.add_argument("--unix-socket", help="Connect over this Unix domain socket (served with --spawn)")
+    target.add_argument("--shm", help="Send frames through the server's shared memory ring with this name")
+    target.add_argument("--server-preset", default="lan_gateway",
+                        help="grpc.server_options preset for --spawn (default, lan_gateway, large_batch)")
+    target.add_argument("--cpu-executor", nargs="?", const="auto",
+                        help="Decode/preprocess on the pinned CPU executor for --spawn (cores like 0-3, default: "
+                             "all cores not in --inference-cores)")
+    target.add_argument("--inference-cores", help="model.inference_cores for --spawn, e.g. 4-7")
+    target.add_argument("--pipeline", action="store_true",
+                        help="Staged decode/infer/postprocess pipeline for --spawn (pipeline.enabled)")
+    target.add_argument("--roi", action="store_true",
+                        help="Crop to each session's detection region for --spawn (model.roi.enabled)")
+    target.add_argument("--priority-lanes", action="store_true",
+                        help="Priority lanes by x-request-class for --spawn (grpc.priority.enabled)")
+    target.add_argument("--server-pid", type=int, help="Sample RSS of this server process")
+    target.add_argument("--metrics-url", help="Sample RSS from this /metrics URL instead of a pid")
+    target.add_argument("--serve-only", action="store_true", help=argparse.SUPPRESS)
+
+    load = parser.add_argument_group("load")
+    load.add_argument("--duration", type=parse_duration, default=60.0, help="e.g. 60, 15m, 4h")
+    load.add_argument("--rate", type=float, default=0.0,
+                      help="Open-loop arrival rate in frames/s (0 = closed loop)")
+    load.add_argument("--pattern", choices=["constant", "poisson", "burst"], default="poisson")
+    load.add_argument("--burst-factor", type=float, default=4.0)
+    load.add_argument("--burst-seconds", type=float, default=2.0)
+    load.add_argument("--concurrency", type=int, default=8,
+                      help="Closed-loop workers, or max outstanding requests in open loop")
+    load.add_argument("--mix", default="jpeg_720p:0.6,jpeg_360p:0.2,yuv420_360p:0.2",
+                      help="Frame mix as <format>_<resolution>:<weight>,...")
+    load.add_argument("--sessions", type=int, default=4, help="Simulated client sessions (x-session-id)")
+    load.add_argument("--model-variant", help="Request a model registry variant (x-model-variant)")
+    load.add_argument("--request-class", help="Request class for priority lanes (x-request-class)")
+    load.add_argument("--columnar", action="store_true", help="Request the columnar detections encoding")
+    load.add_argument("--timeout", type=float, default=5.0, help="Per-request deadline in seconds")
+    load.add_argument("--seed", type=int, default=0)
+
+    report = parser.add_argument_group("report")
+    report.add_argument("--report-interval", type=float, default=10.0)
+    report.add_argument("--output", help="Result JSON path (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    if args.serve_only:
+        serve_synthetic(args)
+        return
+
+    logging.basicConfig(level=logging.WARNING)
+
+    server = None
+    target_address = args.target
+    server_pid = args.server_pid
+    if args.spawn:
+        server = spawn_server(args)
+        target_address = f"127.0.0.1:{args.port}"
+        server_pid = server.pid
+    if args.unix_socket:
+        target_address = f"unix:{args.unix_socket}"
+
+    generator = None
+    try:
+        # Inside try: a bad --mix must not leave the spawned server running
+        rss_sampler = RssSampler(server_pid, args.metrics_url) if (server_pid or args.metrics_url) else None
+        variants = build_mix(args.mix, columnar=args.columnar)
+        generator = LoadGenerator(target_address, variants, args)
+
+        generator.wait_ready(timeout=60.0 if args.spawn else 10.0)
+        if args.shm:
+            generator.attach_ring(args.shm)
+        mode = f"open loop {args.rate:.1f}/s ({args.pattern})" if args.rate > 0 else f"closed loop x{args.concurrency}"
+        print(f"Target {target_address}, {mode}, duration {args.duration:.0f}s, mix {args.mix}")
+
+        timeline = generator.run(args.duration, args.report_interval, rss_sampler)
+        summary = generator.summary()
+        summary["trend"] = trend_analysis(timeline)
+
+        latency = summary["latency"]
+        print(
+            f"\nTotal: {summary['ok']} ok / {summary['sent']} sent, "
+            f"{summary['throughput_per_s']:.1f}/s, error rate {summary['error_rate'] * 100:.2f}%"
+        )
+        if latency.get("count"):
+            print(
+                f"Latency (corrected): p50 {latency['p50_ms']:.1f}ms, p99 {latency['p99_ms']:.1f}ms, "
+                f"p99.9 {latency['p999_ms']:.1f}ms, max {latency['max_ms']:.1f}ms"
+            )
+        if summary["trend"]:
+            print(f"Trend: {summary['trend']}")
+
+        path = write_results(
+            "grpc_load", timeline,
+            output=Path(args.output) if args.output else None,
+            extra={"parameters": vars(args), "summary": summary}
+        )
+        print(f"Results written to {path}")
+    finally:
+        if generator is not None:
+            generator.close()
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,8 @@ from pathlib import Path
 from datetime import datetime
 from enum import Enum
 
+from ai_system.time_series import TimeSeriesBuffer
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -142,7 +144,10 @@ class ErrorHandler:
         """
         self.config_path = config_path
         self.config = self._load_config()
-        self.error_history = []
+        self.error_history = TimeSeriesBuffer(
+            self.config["logging"]["max_history"],
+            {"record": object}
+        )
         self.error_stats = {
             "total_errors": 0,
             "by_level": {},
@@ -361,13 +366,8 @@ class ErrorHandler:
             "stack_trace": error.stack_trace
         }
         
-        # Add to history
-        self.error_history.append(error_record)
-        
-        # Limit history size
-        max_history = self.config["logging"]["max_history"]
-        if len(self.error_history) > max_history:
-            self.error_history = self.error_history[-max_history:]
+        # Add to history (ring buffer, oldest entries are overwritten)
+        self.error_history.append(timestamp=error.timestamp.timestamp(), record=error_record)
     
     def _send_notification(self, error: SystemError):
         """
@@ -515,10 +515,7 @@ class ErrorHandler:
         Returns:
             List history error
         """
-        if limit is None:
-            return self.error_history.copy()
-        else:
-            return self.error_history[-limit:]
+        return self.error_history.latest(limit)["record"].tolist()
     
     def export_error_report(self, file_path: str) -> bool:
         """
@@ -534,7 +531,7 @@ class ErrorHandler:
             report = {
                 "timestamp": datetime.now().isoformat(),
                 "stats": self.error_stats,
-                "history": self.error_history
+                "history": self.get_error_history()
             }
             
             with open(file_path, 'w') as f:
@@ -65,6 +65,10 @@ func main() {
 	// Initialize gRPC client pool with retry logic
 	// Using pool for multi-user concurrent support (10 users)
 	grpcAddr := cfg.GRPC.Host + ":" + cfg.GRPC.Port
+	if cfg.GRPC.UnixSocket != "" {
+		// AI server on the same host: Unix domain socket instead of TCP loopback
+		grpcAddr = "unix:" + cfg.GRPC.UnixSocket
+	}
 	const grpcPoolSize = 3 // 3 connections for load balancing with 10 users
 	logger.WithFields(map[string]interface{}{
 		"grpc_address": grpcAddr,
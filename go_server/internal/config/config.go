@@ -29,8 +29,9 @@ type Config struct {
 	} `json:"connection"`
 	
 	GRPC struct {
-		Host string `json:"host"`
-		Port string `json:"port"`
+		Host       string `json:"host"`
+		Port       string `json:"port"`
+		UnixSocket string `json:"unix_socket"`
 	} `json:"grpc"`
 	
 	Logging struct {
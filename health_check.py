@@ -102,6 +102,14 @@ class HealthCheck:
                     "port": 50051,
                     "critical": True
                 },
+                "python_ai_metrics": {
+                    "enabled": True,
+                    "type": "metrics",
+                    "host": "localhost",
+                    "port": 9100,
+                    "endpoint": "/metrics",
+                    "critical": False
+                },
                 "go_server": {
                     "enabled": True,
                     "type": "http",
@@ -220,6 +228,67 @@ class HealthCheck:
         
         return status
     
+    def check_python_ai_metrics(self) -> Dict[str, Any]:
+        """
+        Memeriksa Python AI Server via endpoint Prometheus /metrics
+        
+        Lebih ringan dari check gRPC: satu HTTP GET tanpa membuka channel.
+        
+        Returns:
+            Dictionary status health check
+        """
+        status = {
+            "component": "python_ai_metrics",
+            "status": "unknown",
+            "response_time": 0,
+            "error": None,
+            "details": {}
+        }
+        
+        try:
+            host = self.config["components"]["python_ai_metrics"]["host"]
+            port = self.config["components"]["python_ai_metrics"]["port"]
+            endpoint = self.config["components"]["python_ai_metrics"].get("endpoint", "/metrics")
+            
+            url = f"http://{host}:{port}{endpoint}"
+            
+            start_time = time.time()
+            response = requests.get(url, timeout=self.config["timeout"])
+            response_time = time.time() - start_time
+            
+            if response.status_code != 200:
+                status["status"] = "unhealthy"
+                status["error"] = f"HTTP {response.status_code}"
+                return status
+            
+            # Parse unlabeled samples and sum labeled ones per metric name
+            samples: Dict[str, float] = {}
+            for line in response.text.splitlines():
+                if not line or line.startswith("#"):
+                    continue
+                name_part, _, value = line.rpartition(" ")
+                name = name_part.split("{", 1)[0]
+                try:
+                    samples[name] = samples.get(name, 0.0) + float(value)
+                except ValueError:
+                    continue
+            
+            status["status"] = "healthy"
+            status["response_time"] = response_time
+            status["details"] = {
+                "frames_total": samples.get("ai_frames_total", 0.0),
+                "inflight_frames": samples.get("ai_inflight_frames", 0.0),
+                "pool_size": samples.get("ai_model_pool_size", 0.0),
+                "pool_in_use": samples.get("ai_model_pool_in_use", 0.0),
+                "resident_memory_mb": samples.get("ai_process_resident_memory_bytes", 0.0) / (1024 * 1024)
+            }
+            
+        except Exception as e:
+            status["status"] = "unhealthy"
+            status["error"] = str(e)
+        
+        return status
+    
     def check_go_server_http(self) -> Dict[str, Any]:
         """
         Memeriksa kesehatan Go Server via HTTP
@@ -389,6 +458,9 @@ class HealthCheck:
         if components["python_ai"]["enabled"]:
             results["components"]["python_ai"] = self.check_python_ai_grpc()
         
+        if components.get("python_ai_metrics", {}).get("enabled"):
+            results["components"]["python_ai_metrics"] = self.check_python_ai_metrics()
+        
         if components["go_server"]["enabled"]:
             results["components"]["go_server"] = self.check_go_server_http()
         
@@ -1,13 +1,40 @@
 #!/usr/bin/env python3
 """
 Script untuk inspect ONNX model secara detail
+
+With --profile the model is run N times with ONNX Runtime profiling
+enabled and the trace is aggregated into a ranked per-node and per-op-type
+report (time, memory, thread use). Reports saved with --output can be
+compared with --compare, e.g. fp32 vs int8 or two SessionOptions profiles.
+
+Usage:
+    python inspect_model.py [model]
+    python inspect_model.py Model_train/best.onnx --profile --images data/scans --output fp32.json
+    python inspect_model.py Model_train/best_int8.onnx --profile --compare fp32.json
+    python inspect_model.py --profile --opt-level extended --intra-op-threads 2 --label ext-2t
 """
 
+import argparse
+import json
+import os
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
 import onnx
 import onnxruntime as ort
 import numpy as np
 from onnx import numpy_helper
 
+OPT_LEVELS = {
+    'disable': ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    'basic': ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    'extended': ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    'all': ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
 def inspect_onnx_model(model_path):
     """Inspect ONNX model structure"""
     print(f"{'='*80}")
@@ -161,14 +188,267 @@ def check_model_opset(model_path):
         print(f"Domain: {opset.domain if opset.domain else 'ai.onnx'}")
         print(f"Version: {opset.version}")
 
+def _profile_inputs(session, args) -> List[np.ndarray]:
+    """Representative inputs: preprocessed frames from --images, else random tensors."""
+    input_meta = session.get_inputs()[0]
+    if args.images:
+        import cv2
+        from ai_system.config_manager import ConfigurationManager
+        from ai_system.frame_processor import FrameProcessor
+
+        config_manager = ConfigurationManager(config_path=args.config, enable_hot_reload=False)
+        processor = FrameProcessor(Path(args.model), config_manager, pool_size=1)
+        suffixes = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+        paths = sorted(p for p in Path(args.images).rglob('*') if p.suffix.lower() in suffixes)
+        inputs = []
+        for path in paths[:args.num_images]:
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                inputs.append(processor.preprocess_frame(frame).astype(np.float32))
+        if inputs:
+            return inputs
+        print(f"No readable images in {args.images}, using random inputs")
+
+    # Dynamic dims fall back to batch 1 and the config target size
+    width, height = 640, 640
+    if os.path.exists(args.config):
+        with open(args.config) as f:
+            target_size = json.load(f).get('model', {}).get('target_size')
+        if target_size:
+            width, height = map(int, target_size.split(','))
+    defaults = [1, 3, height, width]
+    shape = [dim if isinstance(dim, int) else defaults[i] for i, dim in enumerate(input_meta.shape)]
+    rng = np.random.default_rng(0)
+    return [rng.random(shape, dtype=np.float32) for _ in range(4)]
+
+
+def _percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def summarize_profile(events: List[Dict[str, Any]], warmup: int) -> Dict[str, Any]:
+    """
+    Aggregate an ONNX Runtime profiling trace.
+
+    Args:
+        events: Parsed profile JSON (chrome trace events)
+        warmup: Number of leading model_run events to exclude
+
+    Returns:
+        Dictionary with run latency, ranked nodes, ranked op types, memory and thread stats
+    """
+    runs = sorted((e for e in events if e.get('cat') == 'Session' and e.get('name') == 'model_run'),
+                  key=lambda e: e['ts'])
+    measured = runs[warmup:]
+    start_ts = measured[0]['ts'] if measured else 0
+    first_run_ts = runs[0]['ts'] if runs else float('inf')
+    session_init = {e['name']: e['dur'] / 1000.0 for e in events
+                    if e.get('cat') == 'Session' and e['ts'] < first_run_ts}
+
+    nodes: Dict[str, Dict[str, Any]] = {}
+    peak_memory = 0
+    for event in events:
+        if event.get('cat') != 'Node' or event['ts'] < start_ts or not event['name'].endswith('_kernel_time'):
+            continue
+        event_args = event.get('args', {})
+        name = event['name'][:-len('_kernel_time')]
+        node = nodes.get(name)
+        if node is None:
+            node = nodes[name] = {
+                'name': name,
+                'op_type': event_args.get('op_name', '?'),
+                'provider': event_args.get('provider', ''),
+                'calls': 0,
+                'total_us': 0,
+                'output_bytes': int(event_args.get('output_size', 0)),
+                'parameter_bytes': int(event_args.get('parameter_size', 0)),
+                'activation_bytes': int(event_args.get('activation_size', 0)),
+                'threads_total': 0,
+                'main_run_us': 0,
+                'output_shape': event_args.get('output_type_shape'),
+            }
+        node['calls'] += 1
+        node['total_us'] += event['dur']
+        peak_memory = max(peak_memory, int(event_args.get('mem_in_use_peak', 0)))
+
+        # Intra-op parallelism: main thread plus the pool threads that picked up work
+        scheduling = event_args.get('thread_scheduling_stats') or {}
+        node['threads_total'] += 1 + len(scheduling.get('sub_threads', {}))
+        node['main_run_us'] += scheduling.get('main_thread', {}).get('Run', event['dur'])
+
+    total_us = sum(node['total_us'] for node in nodes.values()) or 1
+    op_types: Dict[str, Dict[str, Any]] = defaultdict(lambda: {'nodes': 0, 'total_us': 0, 'output_bytes': 0,
+                                                               'parameter_bytes': 0})
+    for node in nodes.values():
+        calls = node['calls']
+        node['mean_us'] = node['total_us'] / calls
+        node['pct'] = 100.0 * node['total_us'] / total_us
+        node['avg_threads'] = node.pop('threads_total') / calls
+        # Share of the node's wall time the calling thread spent computing (rest: sync/wait)
+        node['main_thread_busy_pct'] = 100.0 * node.pop('main_run_us') / max(node['total_us'], 1)
+        op_type = op_types[node['op_type']]
+        op_type['nodes'] += 1
+        op_type['total_us'] += node['total_us']
+        op_type['output_bytes'] += node['output_bytes']
+        op_type['parameter_bytes'] += node['parameter_bytes']
+
+    iterations = max(len(measured), 1)
+    ranked_types = []
+    for name, op_type in op_types.items():
+        op_type.update({
+            'op_type': name,
+            'per_run_us': op_type['total_us'] / iterations,
+            'pct': 100.0 * op_type['total_us'] / total_us,
+        })
+        ranked_types.append(op_type)
+
+    run_ms = [e['dur'] / 1000.0 for e in measured]
+    return {
+        'iterations': len(measured),
+        'session_ms': session_init,
+        'run_ms': {
+            'mean': float(np.mean(run_ms)) if run_ms else 0.0,
+            'p50': _percentile(run_ms, 50),
+            'p95': _percentile(run_ms, 95),
+        },
+        'node_time_per_run_ms': total_us / iterations / 1000.0,
+        'peak_memory_bytes': peak_memory,
+        'parameter_bytes': sum(node['parameter_bytes'] for node in nodes.values()),
+        'op_types': sorted(ranked_types, key=lambda t: t['total_us'], reverse=True),
+        'nodes': sorted(nodes.values(), key=lambda n: n['total_us'], reverse=True),
+    }
+
+
+def profile_model(args) -> Dict[str, Any]:
+    """Run the model with ONNX Runtime profiling and return the aggregated report."""
+    options = ort.SessionOptions()
+    options.graph_optimization_level = OPT_LEVELS[args.opt_level]
+    options.intra_op_num_threads = args.intra_op_threads
+    options.inter_op_num_threads = args.inter_op_threads
+    if args.execution_mode == 'parallel':
+        options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+    options.enable_profiling = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        options.profile_file_prefix = os.path.join(tmp, 'profile')
+        session = ort.InferenceSession(args.model, options, providers=['CPUExecutionProvider'])
+        input_name = session.get_inputs()[0].name
+        inputs = _profile_inputs(session, args)
+        for i in range(args.warmup + args.iterations):
+            session.run(None, {input_name: inputs[i % len(inputs)]})
+        with open(session.end_profiling()) as f:
+            events = json.load(f)
+
+    report = summarize_profile(events, args.warmup)
+    report.update({
+        'label': args.label or f"{Path(args.model).name}:{args.opt_level}:{args.intra_op_threads}t",
+        'model': args.model,
+        'model_bytes': os.path.getsize(args.model),
+        'ort_version': ort.__version__,
+        'inputs': 'images' if args.images else 'random',
+        'session_options': {
+            'opt_level': args.opt_level,
+            'intra_op_threads': args.intra_op_threads,
+            'inter_op_threads': args.inter_op_threads,
+            'execution_mode': args.execution_mode,
+        },
+    })
+    return report
+
+
+def print_profile(report: Dict[str, Any], top: int):
+    """Print the ranked profile report."""
+    print("=" * 80)
+    print(f"PROFILE: {report['label']} (ORT {report['ort_version']}, {report['iterations']} runs, "
+          f"{report['inputs']} inputs)")
+    print("=" * 80)
+    run = report['run_ms']
+    print(f"Run: mean {run['mean']:.2f}ms, p50 {run['p50']:.2f}ms, p95 {run['p95']:.2f}ms "
+          f"(node time {report['node_time_per_run_ms']:.2f}ms/run)")
+    print("Session init: " + ", ".join(f"{k} {v:.1f}ms" for k, v in report['session_ms'].items()))
+    print(f"Peak arena memory: {report['peak_memory_bytes'] / 1e6:.1f}MB, "
+          f"parameters: {report['parameter_bytes'] / 1e6:.1f}MB")
+
+    print(f"\n{'Op type':<24}{'Nodes':>6}{'ms/run':>10}{'%':>7}{'Out MB':>9}{'Param MB':>10}")
+    for op_type in report['op_types']:
+        print(f"{op_type['op_type']:<24}{op_type['nodes']:>6}{op_type['per_run_us'] / 1000:>10.3f}"
+              f"{op_type['pct']:>7.1f}{op_type['output_bytes'] / 1e6:>9.2f}{op_type['parameter_bytes'] / 1e6:>10.2f}")
+
+    print(f"\nTop {top} nodes")
+    print(f"{'Node':<36}{'Op':<14}{'mean ms':>9}{'%':>7}{'Out MB':>8}{'Threads':>8}{'Busy%':>7}")
+    for node in report['nodes'][:top]:
+        print(f"{node['name'][:35]:<36}{node['op_type'][:13]:<14}{node['mean_us'] / 1000:>9.3f}{node['pct']:>7.1f}"
+              f"{node['output_bytes'] / 1e6:>8.2f}{node['avg_threads']:>8.1f}{node['main_thread_busy_pct']:>7.0f}")
+
+
+def compare_profiles(report: Dict[str, Any], baseline: Dict[str, Any], top: int):
+    """Print per-op-type and per-node differences against a saved baseline report."""
+    print("\n" + "=" * 80)
+    print(f"COMPARE: {report['label']} vs {baseline['label']}")
+    print("=" * 80)
+    print(f"Run mean: {baseline['run_ms']['mean']:.2f}ms -> {report['run_ms']['mean']:.2f}ms "
+          f"({baseline['run_ms']['mean'] / max(report['run_ms']['mean'], 1e-9):.2f}x)")
+    print(f"Peak memory: {baseline['peak_memory_bytes'] / 1e6:.1f}MB -> {report['peak_memory_bytes'] / 1e6:.1f}MB")
+
+    before = {t['op_type']: t['per_run_us'] for t in baseline['op_types']}
+    after = {t['op_type']: t['per_run_us'] for t in report['op_types']}
+    print(f"\n{'Op type':<24}{'base ms':>10}{'ms':>10}{'delta ms':>10}")
+    for name in sorted(set(before) | set(after), key=lambda n: -max(before.get(n, 0), after.get(n, 0))):
+        b, a = before.get(name, 0.0) / 1000, after.get(name, 0.0) / 1000
+        print(f"{name:<24}{b:>10.3f}{a:>10.3f}{a - b:>+10.3f}")
+
+    # Node names only line up when both runs use the same graph optimizations
+    base_nodes = {n['name']: n['mean_us'] for n in baseline['nodes']}
+    shared = [n for n in report['nodes'] if n['name'] in base_nodes]
+    if shared:
+        shared.sort(key=lambda n: abs(n['mean_us'] - base_nodes[n['name']]), reverse=True)
+        print(f"\nLargest node changes ({len(shared)} nodes in both)")
+        for node in shared[:top]:
+            b = base_nodes[node['name']] / 1000
+            print(f"{node['name'][:35]:<36}{b:>10.3f}{node['mean_us'] / 1000:>10.3f}{node['mean_us'] / 1000 - b:>+10.3f}")
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or profile an ONNX model")
+    parser.add_argument("model", nargs="?", default="Model_train/best.onnx")
+    parser.add_argument("--profile", action="store_true", help="Per-operator latency profile instead of inspection")
+    parser.add_argument("--config", default="config.json", help="Server config (preprocessing, target size)")
+    parser.add_argument("--images", help="Directory with representative frames (default: random inputs)")
+    parser.add_argument("--num-images", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5, help="Runs excluded from the report")
+    parser.add_argument("--opt-level", choices=list(OPT_LEVELS), default="all")
+    parser.add_argument("--intra-op-threads", type=int, default=0, help="0 = ORT default")
+    parser.add_argument("--inter-op-threads", type=int, default=0, help="0 = ORT default")
+    parser.add_argument("--execution-mode", choices=["sequential", "parallel"], default="sequential")
+    parser.add_argument("--label", help="Name of this profile in reports and comparisons")
+    parser.add_argument("--top", type=int, default=15, help="Nodes to list")
+    parser.add_argument("--output", help="Write the profile report as JSON")
+    parser.add_argument("--compare", help="Baseline profile JSON to compare against")
+    args = parser.parse_args(argv)
+
+    if not args.profile:
+        # Inspect model structure
+        inspect_onnx_model(args.model)
+
+        # Check opset
+        check_model_opset(args.model)
+
+        # Test with dummy inputs
+        test_model_with_dummy_input(args.model)
+        return 0
+
+    report = profile_model(args)
+    print_profile(report, args.top)
+    if args.compare:
+        with open(args.compare) as f:
+            compare_profiles(report, json.load(f), args.top)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
 if __name__ == "__main__":
-    model_path = "Model_train/best.onnx"
-    
-    # Inspect model structure
-    inspect_onnx_model(model_path)
-    
-    # Check opset
-    check_model_opset(model_path)
-    
-    # Test with dummy inputs
-    test_model_with_dummy_input(model_path)
+    sys.exit(main())
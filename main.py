@@ -11,7 +11,7 @@ from pathlib import Path
 # Add the ai_system package to the path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from ai_system.logging_config import setup_logging
+from ai_system.logging_config import setup_logging, shutdown_logging
 from ai_system.grpc_server import serve
 from ai_system.config_manager import ConfigurationManager
 
@@ -37,13 +37,22 @@ def main():
     # Set up logging
     log_level = getattr(logging, config_manager.get('logging.level', 'INFO'))
     log_dir = config_manager.get('logging.directory', 'logs')
-    setup_logging(log_level=log_level, log_dir=log_dir)
+    setup_logging(
+        log_level=log_level,
+        log_dir=log_dir,
+        log_format=config_manager.get('logging.format', 'text'),
+        async_logging=config_manager.get('logging.async', True),
+        queue_size=config_manager.get('logging.queue_size', 10000),
+        sampling=config_manager.get('logging.sampling', {})
+    )
     logger = logging.getLogger(__name__)
     
     # Check if model exists
     model_path = Path(config_manager.get('model.path', 'Model_train/best.onnx'))
     if not model_path.exists():
         logger.error(f"Model file not found: {model_path}")
+        logger.error("For performance testing without the real model, generate one with: "
+                     f"python make_synthetic_model.py --output {model_path}")
         sys.exit(1)
     
     # Log startup information
@@ -64,6 +73,9 @@ def main():
     finally:
         # Shutdown configuration manager
         config_manager.shutdown()
+        
+        # Flush queued log records
+        shutdown_logging()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
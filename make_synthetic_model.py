@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Generator model ONNX sintetis untuk performance testing tanpa model asli.
+
+The generated model has the exact production contract:
+
+    images (1, 3, H, W) float32 -> output0 (1, 300, 6) float32
+
+with rows [x1, y1, x2, y2, confidence, class_id] in model input
+coordinates. A stack of convolutions (tunable depth and width) provides
+the compute cost, and the detections are deterministic: the first
+--detections rows carry fixed boxes with confidences above the config
+threshold, the rest are zero. The conv features are added with a tiny
+weight so ONNX Runtime cannot fold the compute away, without changing
+which detections pass the threshold.
+
+Usage:
+    python make_synthetic_model.py                         # Model_train/synthetic.onnx
+    python make_synthetic_model.py --depth 8 --width 64 --detections 20
+    python make_synthetic_model.py --output Model_train/best.onnx --benchmark
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import onnx
+from onnx import helper, numpy_helper, TensorProto
+
+NUM_ROWS = 300
+ROW_SIZE = 6
+
+
+def _detection_rows(num_detections: int,
+                    target_size: Tuple[int, int],
+                    num_classes: int,
+                    min_confidence: float) -> np.ndarray:
+    """
+    Build the constant (1, 300, 6) detection tensor.
+
+    Boxes are laid out on a grid inside the model input so they do not
+    overlap; confidences decrease from 0.95 to just above min_confidence.
+    """
+    width, height = target_size
+    rows = np.zeros((1, NUM_ROWS, ROW_SIZE), dtype=np.float32)
+    if num_detections <= 0:
+        return rows
+
+    num_detections = min(num_detections, NUM_ROWS)
+    grid = int(np.ceil(np.sqrt(num_detections)))
+    cell_w, cell_h = width / grid, height / grid
+    confidences = np.linspace(0.95, min(0.95, min_confidence + 0.05), num_detections)
+
+    for i in range(num_detections):
+        gx, gy = i % grid, i // grid
+        rows[0, i, 0] = gx * cell_w + cell_w * 0.1
+        rows[0, i, 1] = gy * cell_h + cell_h * 0.1
+        rows[0, i, 2] = gx * cell_w + cell_w * 0.9
+        rows[0, i, 3] = gy * cell_h + cell_h * 0.9
+        rows[0, i, 4] = confidences[i]
+        rows[0, i, 5] = i % max(1, num_classes)
+    return rows
+
+
+def build_synthetic_model(output_path: Path,
+                          target_size: Tuple[int, int] = (320, 320),
+                          depth: int = 4,
+                          width: int = 32,
+                          num_detections: int = 5,
+                          num_classes: int = 6,
+                          min_confidence: float = 0.25,
+                          seed: int = 0) -> Dict[str, Any]:
+    """
+    Build and save a synthetic detector ONNX model.
+
+    Args:
+        output_path: Path to write the .onnx file
+        target_size: Model input size (width, height)
+        depth: Number of 3x3 conv layers (compute cost knob)
+        width: Channels per conv layer (compute cost knob)
+        num_detections: Rows with confidence above min_confidence (0-300)
+        num_classes: Number of classes the class ids cycle through
+        min_confidence: Confidence threshold the detections must pass
+        seed: Random seed for the conv weights
+
+    Returns:
+        Dictionary describing the model (path, parameters, estimated MACs)
+    """
+    input_w, input_h = target_size
+    rng = np.random.default_rng(seed)
+    initializers = []
+    nodes = []
+    macs = 0
+
+    current, channels = "images", 3
+    h, w = input_h, input_w
+    for layer in range(depth):
+        # First layer downsamples like a detector stem; the rest keep resolution
+        stride = 2 if layer == 0 else 1
+        weight_name, bias_name, out_name = f"conv{layer}_w", f"conv{layer}_b", f"conv{layer}"
+        fan_in = channels * 9
+        initializers.append(numpy_helper.from_array(
+            rng.normal(0, np.sqrt(2.0 / fan_in), (width, channels, 3, 3)).astype(np.float32), weight_name
+        ))
+        initializers.append(numpy_helper.from_array(np.zeros(width, dtype=np.float32), bias_name))
+        nodes.append(helper.make_node(
+            "Conv", [current, weight_name, bias_name], [out_name],
+            kernel_shape=[3, 3], strides=[stride, stride], pads=[1, 1, 1, 1]
+        ))
+        nodes.append(helper.make_node("Relu", [out_name], [f"{out_name}_relu"]))
+        h, w = (h + 1) // stride, (w + 1) // stride
+        macs += h * w * width * fan_in
+        current, channels = f"{out_name}_relu", width
+
+    # Reduce the features to one scalar and add it with a negligible weight
+    initializers += [
+        numpy_helper.from_array(np.array([1e-6], dtype=np.float32), "feature_scale"),
+        numpy_helper.from_array(
+            _detection_rows(num_detections, target_size, num_classes, min_confidence), "detections"
+        ),
+    ]
+    initializers.append(numpy_helper.from_array(np.array([1], dtype=np.int64), "scalar_shape"))
+    nodes += [
+        helper.make_node("ReduceMean", [current], ["feature"], keepdims=1),
+        helper.make_node("Reshape", ["feature", "scalar_shape"], ["feature_scalar"]),
+        helper.make_node("Mul", ["feature_scalar", "feature_scale"], ["feature_scaled"]),
+        helper.make_node("Add", ["detections", "feature_scaled"], ["output0"]),
+    ]
+
+    graph = helper.make_graph(
+        nodes,
+        "synthetic_detector",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, [1, 3, input_h, input_w])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, [1, NUM_ROWS, ROW_SIZE])],
+        initializers,
+    )
+    model = helper.make_model(graph, producer_name="make_synthetic_model",
+                              opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    model.doc_string = (
+        f"Synthetic detector: depth={depth}, width={width}, "
+        f"detections={num_detections}, classes={num_classes}"
+    )
+    onnx.checker.check_model(model)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    onnx.save(model, str(output_path))
+
+    return {
+        "path": str(output_path),
+        "target_size": list(target_size),
+        "depth": depth,
+        "width": width,
+        "num_detections": min(max(num_detections, 0), NUM_ROWS),
+        "num_classes": num_classes,
+        "estimated_macs": int(macs),
+        "size_bytes": output_path.stat().st_size,
+    }
+
+
+def benchmark_model(model_path: Path, iterations: int = 50) -> Dict[str, float]:
+    """
+    Measure CPU latency of the model with ONNX Runtime.
+
+    Args:
+        model_path: Path to the .onnx file
+        iterations: Number of timed runs
+
+    Returns:
+        Dictionary with mean and p50/p99 latency in ms
+    """
+    import onnxruntime as ort
+
+    session = ort.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
+    input_meta = session.get_inputs()[0]
+    dummy = np.random.rand(*input_meta.shape).astype(np.float32)
+    for _ in range(5):
+        session.run(None, {input_meta.name: dummy})
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        session.run(None, {input_meta.name: dummy})
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {"mean_ms": float(np.mean(latencies)), "p50_ms": float(p50), "p99_ms": float(p99)}
+
+
+def _load_defaults(config_path: Path) -> Dict[str, Any]:
+    """Read target size, class count and threshold from config.json if present."""
+    defaults = {"target_size": (320, 320), "num_classes": 6, "min_confidence": 0.25}
+    try:
+        with open(config_path, "r") as f:
+            model_config = json.load(f).get("model", {})
+        if model_config.get("target_size"):
+            defaults["target_size"] = tuple(int(v) for v in str(model_config["target_size"]).split(","))
+        if model_config.get("class_names"):
+            defaults["num_classes"] = len(model_config["class_names"])
+        if model_config.get("conf_threshold") is not None:
+            defaults["min_confidence"] = float(model_config["conf_threshold"])
+    except (OSError, ValueError):
+        pass
+    return defaults
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic ONNX detector for performance testing")
+    parser.add_argument("--output", default="Model_train/synthetic.onnx", help="Output .onnx path")
+    parser.add_argument("--config", default="config.json", help="Config to read target size/classes from")
+    parser.add_argument("--target-size", help="Model input size as W,H (default: model.target_size)")
+    parser.add_argument("--depth", type=int, default=4, help="Number of conv layers")
+    parser.add_argument("--width", type=int, default=32, help="Channels per conv layer")
+    parser.add_argument("--detections", type=int, default=5, help="Detections above threshold (0-300)")
+    parser.add_argument("--num-classes", type=int, help="Number of classes (default: len(model.class_names))")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--benchmark", action="store_true", help="Measure CPU latency after building")
+    args = parser.parse_args(argv)
+
+    defaults = _load_defaults(Path(args.config))
+    target_size = (
+        tuple(int(v) for v in args.target_size.split(",")) if args.target_size else defaults["target_size"]
+    )
+
+    info = build_synthetic_model(
+        Path(args.output),
+        target_size=target_size,
+        depth=args.depth,
+        width=args.width,
+        num_detections=args.detections,
+        num_classes=args.num_classes or defaults["num_classes"],
+        min_confidence=defaults["min_confidence"],
+        seed=args.seed,
+    )
+    print(f"Synthetic model written to {info['path']}")
+    print(f"  Input: images (1, 3, {target_size[1]}, {target_size[0]}) -> output0 (1, {NUM_ROWS}, {ROW_SIZE})")
+    print(f"  Depth: {info['depth']}, width: {info['width']}, ~{info['estimated_macs'] / 1e6:.1f}M MACs")
+    print(f"  Detections: {info['num_detections']}, classes: {info['num_classes']}")
+
+    if args.benchmark:
+        stats = benchmark_model(Path(info["path"]))
+        print(f"  CPU latency: mean {stats['mean_ms']:.2f}ms, p50 {stats['p50_ms']:.2f}ms, p99 {stats['p99_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Optimasi graph ONNX secara offline dan isi cache model teroptimasi.
+
+ModelInference loads optimized models from model.optimization_cache.dir
+(keyed by model hash, ONNX Runtime version, providers and CPU features)
+and builds a missing entry on first use. Running this script at deploy
+time moves that one-off cost out of server startup, and reports how much
+session creation time the cache saves.
+
+By default it optimizes model.path and every model.registry variant.
+
+Usage:
+    python optimize_model.py                          # models from config.json
+    python optimize_model.py --model Model_train/best_int8.onnx --format ort
+    python optimize_model.py --info
+    python optimize_model.py --clear
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import onnxruntime as ort
+
+from ai_system.config_manager import ConfigurationManager
+from ai_system.model_cache import (
+    OPTIMIZATION_LEVELS, get_optimized_model, session_options_for_cached, clear_cache, get_cache_info
+)
+
+
+def _providers() -> List[str]:
+    """Same provider selection as ModelInference._init_onnx."""
+    providers = ['CPUExecutionProvider']
+    if 'CUDAExecutionProvider' in ort.get_available_providers():
+        providers.insert(0, 'CUDAExecutionProvider')
+    return providers
+
+
+def _load_ms(path: Path, options: Optional[ort.SessionOptions], providers: List[str], repeats: int) -> float:
+    """Best-of-N session creation time in ms."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ort.InferenceSession(str(path), options, providers=providers)
+        best = min(best, (time.perf_counter() - start) * 1000.0)
+    return best
+
+
+def configured_models(config_manager: ConfigurationManager) -> List[Path]:
+    """model.path plus the paths of all model.registry variants that exist."""
+    paths = [Path(config_manager.get('model.path', 'Model_train/best.onnx'))]
+    for spec in config_manager.get('model.registry.variants', []) or []:
+        if spec.get('path'):
+            paths.append(Path(spec['path']))
+    return [p for p in dict.fromkeys(paths) if p.exists()]
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the optimized ONNX model cache")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--model", action="append", help="Model to optimize (repeatable, default: from config)")
+    parser.add_argument("--cache-dir", help="Cache directory (default: model.optimization_cache.dir)")
+    parser.add_argument("--level", choices=list(OPTIMIZATION_LEVELS), help="Default: model.optimization_cache.level")
+    parser.add_argument("--format", choices=["onnx", "ort"], help="Default: model.optimization_cache.format")
+    parser.add_argument("--repeats", type=int, default=3, help="Session loads per timing")
+    parser.add_argument("--info", action="store_true", help="Show cache contents and exit")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached models and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+
+    config_manager = ConfigurationManager(config_path=args.config, enable_hot_reload=False)
+    cache_config = config_manager.get('model.optimization_cache', {}) or {}
+    cache_dir = Path(args.cache_dir or cache_config.get('dir', 'Model_train/.cache'))
+    level = args.level or cache_config.get('level', 'all')
+    model_format = args.format or cache_config.get('format', 'onnx')
+
+    if args.info:
+        info = get_cache_info(cache_dir)
+        print(f"Cache: {info['dir']} (ORT {info['ort_version']}, CPU {info['cpu_signature']})")
+        for name in info['files']:
+            print(f"  {name}")
+        print(f"  {len(info['files'])} files, {info['total_bytes'] / 1e6:.1f}MB")
+        return 0
+    if args.clear:
+        print(f"Removed {clear_cache(cache_dir)} cached models from {cache_dir}")
+        return 0
+
+    models = [Path(m) for m in args.model] if args.model else configured_models(config_manager)
+    if not models:
+        print("No model files found (check model.path or pass --model)")
+        return 2
+    if not cache_config.get('enabled', False):
+        print("Note: model.optimization_cache.enabled is false, the server will not use the cache")
+
+    providers = _providers()
+    for model_path in models:
+        cached_path, built = get_optimized_model(model_path, cache_dir, providers, level, model_format)
+        original = ort.SessionOptions()
+        original.graph_optimization_level = OPTIMIZATION_LEVELS[level]
+        before = _load_ms(model_path, original, providers, args.repeats)
+        after = _load_ms(cached_path, session_options_for_cached(), providers, args.repeats)
+        print(f"{model_path} -> {cached_path} ({'built' if built else 'already cached'})")
+        print(f"  Session creation: {before:.0f}ms -> {after:.0f}ms ({before / max(after, 1e-6):.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Kuantisasi statis INT8 (QDQ) untuk model YOLO ONNX, dengan validasi terhadap fp32.
+
+Steps:
+
+1. Calibration: frames from --calibration (real scan frames) are run
+   through the server's own FrameProcessor.preprocess_frame, so resize
+   mode, target size and normalization match what the model sees in
+   production.
+2. Quantization: onnxruntime quantize_static with QDQ format, int8
+   per-channel weights and uint8 activations. By default only Conv/MatMul
+   are quantized; the box decoding head stays fp32.
+3. Validation on --validation frames (default: the calibration frames not
+   used for calibration):
+   - detection agreement: int8 detections matched to fp32 (same class,
+     IoU >= 0.5), plus the mean confidence difference;
+   - mAP@0.5 for fp32 and int8 when YOLO .txt labels sit next to the images;
+   - CPU latency of both models and the speedup.
+
+The report is written next to the output model (<output>.quant.json). The
+command exits non-zero when agreement is below --min-agreement.
+
+Serve the result side by side with the fp32 model through a
+model.registry variant (see config.json) or by pointing model.path at it.
+
+Usage:
+    python quantize_model.py --calibration data/scans --output Model_train/best_int8.onnx
+    python quantize_model.py --calibration data/calib --validation data/val --method entropy
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+from onnxruntime.quantization import (
+    CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType, quantize_static
+)
+
+from ai_system.config_manager import ConfigurationManager
+from ai_system.frame_processor import FrameProcessor
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+CALIBRATION_METHODS = {
+    "minmax": CalibrationMethod.MinMax,
+    "entropy": CalibrationMethod.Entropy,
+    "percentile": CalibrationMethod.Percentile,
+}
+
+
+def list_images(directory: Path) -> List[Path]:
+    """All images below a directory, sorted for reproducible splits."""
+    return sorted(p for p in Path(directory).rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)
+
+
+def load_labels(image_path: Path) -> Optional[np.ndarray]:
+    """
+    Load YOLO labels ("class cx cy w h", normalized) for an image.
+
+    Returns:
+        (N, 5) array [class, x1, y1, x2, y2] in normalized coordinates, or None if unlabelled
+    """
+    candidates = [
+        image_path.with_suffix(".txt"),
+        Path(str(image_path.with_suffix(".txt")).replace("/images/", "/labels/")),
+    ]
+    label_path = next((p for p in candidates if p.exists()), None)
+    if label_path is None:
+        return None
+    labels = np.loadtxt(label_path, ndmin=2) if label_path.stat().st_size else np.zeros((0, 5))
+    cx, cy, w, h = labels[:, 1], labels[:, 2], labels[:, 3], labels[:, 4]
+    return np.stack([labels[:, 0], cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feeds preprocessed frames to the ONNX Runtime calibrator."""
+
+    def __init__(self, processor: FrameProcessor, images: List[Path], input_name: str):
+        self._processor = processor
+        self._images = iter(images)
+        self._input_name = input_name
+        self.count = 0
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        for image_path in self._images:
+            frame = cv2.imread(str(image_path))
+            if frame is None:
+                continue
+            self.count += 1
+            return {self._input_name: self._processor.preprocess_frame(frame).astype(np.float32)}
+        return None
+
+
+def quantize(model_path: Path, output_path: Path, processor: FrameProcessor,
+             calibration_images: List[Path], method: str = "minmax",
+             per_channel: bool = True, op_types: Optional[List[str]] = None) -> int:
+    """
+    Run static QDQ quantization.
+
+    Args:
+        model_path: fp32 ONNX model
+        output_path: Where to write the int8 model
+        processor: FrameProcessor used for preprocessing calibration frames
+        calibration_images: Calibration frames
+        method: Calibration method (minmax, entropy, percentile)
+        per_channel: Per-channel weight scales (recommended for Conv)
+        op_types: Op types to quantize (None = all supported)
+
+    Returns:
+        Number of calibration frames used
+    """
+    input_name = ort.InferenceSession(str(model_path), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    # Shape inference + graph cleanup improve which nodes can be quantized
+    source = model_path
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            from onnxruntime.quantization.shape_inference import quant_pre_process
+            prepared = Path(tmp) / "prepared.onnx"
+            quant_pre_process(str(model_path), str(prepared), skip_symbolic_shape=True)
+            source = prepared
+        except Exception as e:
+            logging.warning(f"quant_pre_process failed ({e}), quantizing the original graph")
+
+        reader = FrameCalibrationReader(processor, calibration_images, input_name)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        quantize_static(
+            str(source),
+            str(output_path),
+            reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=per_channel,
+            calibrate_method=CALIBRATION_METHODS[method],
+            op_types_to_quantize=op_types,
+        )
+    return reader.count
+
+
+def _session(model_path: Path, threads: int) -> ort.InferenceSession:
+    options = ort.SessionOptions()
+    if threads > 0:
+        options.intra_op_num_threads = threads
+    return ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+
+
+def _detections(processor: FrameProcessor, output: np.ndarray, shape: Tuple[int, ...],
+                class_names: List[str]) -> np.ndarray:
+    """Postprocess raw output to (N, 6) [class, x1, y1, x2, y2, conf] in normalized coordinates."""
+    batch = processor.postprocess_output([output], original_shape=shape)["detections"]
+    class_ids = [class_names.index(name) if name in class_names else int(name) for name in batch.names()]
+    return np.column_stack([class_ids, batch.boxes, batch.confidences]).astype(np.float64).reshape(-1, 6)
+
+
+def _iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / np.maximum(area + areas - inter, 1e-12)
+
+
+def match(predictions: np.ndarray, targets: np.ndarray, iou_threshold: float = 0.5) -> np.ndarray:
+    """
+    Greedy matching by descending confidence (same class, IoU >= threshold).
+
+    Args:
+        predictions: (N, 6) [class, x1, y1, x2, y2, conf]
+        targets: (M, 5+) [class, x1, y1, x2, y2, ...]
+
+    Returns:
+        Boolean array: which predictions matched a target
+    """
+    matched_targets = np.zeros(len(targets), dtype=bool)
+    hits = np.zeros(len(predictions), dtype=bool)
+    for i in np.argsort(-predictions[:, 5]) if len(predictions) else []:
+        if len(targets) == 0:
+            break
+        ious = _iou(predictions[i, 1:5], targets[:, 1:5])
+        ious[(targets[:, 0] != predictions[i, 0]) | matched_targets] = 0.0
+        best = int(np.argmax(ious))
+        if ious[best] >= iou_threshold:
+            matched_targets[best] = True
+            hits[i] = True
+    return hits
+
+
+def mean_average_precision(per_image: List[Tuple[np.ndarray, np.ndarray]], iou_threshold: float = 0.5) -> float:
+    """
+    mAP at one IoU threshold (all-point interpolated AP averaged over classes with labels).
+
+    Args:
+        per_image: List of (predictions (N, 6), labels (M, 5))
+    """
+    classes = sorted({int(c) for _, labels in per_image for c in labels[:, 0]})
+    aps = []
+    for class_id in classes:
+        confidences, hits, num_targets = [], [], 0
+        for predictions, labels in per_image:
+            targets = labels[labels[:, 0] == class_id]
+            preds = predictions[predictions[:, 0] == class_id]
+            num_targets += len(targets)
+            confidences.extend(preds[:, 5])
+            hits.extend(match(preds, targets, iou_threshold))
+        if num_targets == 0:
+            continue
+        order = np.argsort(-np.array(confidences))
+        tp = np.cumsum(np.array(hits, dtype=float)[order])
+        fp = np.cumsum(1.0 - np.array(hits, dtype=float)[order])
+        recall = np.concatenate([[0.0], tp / num_targets, [1.0]])
+        precision = np.concatenate([[1.0], tp / np.maximum(tp + fp, 1e-12), [0.0]])
+        precision = np.maximum.accumulate(precision[::-1])[::-1]
+        aps.append(float(np.sum((recall[1:] - recall[:-1]) * precision[1:])))
+    return float(np.mean(aps)) if aps else float("nan")
+
+
+def latency(session: ort.InferenceSession, tensor: np.ndarray, iterations: int) -> Dict[str, float]:
+    """p50/mean latency in ms and throughput per second for one session."""
+    name = session.get_inputs()[0].name
+    for _ in range(5):
+        session.run(None, {name: tensor})
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        session.run(None, {name: tensor})
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {
+        "p50_ms": float(np.percentile(samples, 50)),
+        "mean_ms": float(np.mean(samples)),
+        "throughput_per_s": 1000.0 / float(np.mean(samples)),
+    }
+
+
+def validate(fp32_path: Path, int8_path: Path, processor: FrameProcessor, images: List[Path],
+             class_names: List[str], threads: int, iterations: int) -> Dict[str, Any]:
+    """
+    Compare the int8 model with fp32 on validation frames.
+
+    Returns:
+        Dictionary with agreement, confidence delta, mAP (when labelled) and latency
+    """
+    fp32, int8 = _session(fp32_path, threads), _session(int8_path, threads)
+    input_name = fp32.get_inputs()[0].name
+
+    agreements, confidence_deltas = [], []
+    fp32_eval, int8_eval = [], []
+    tensor = None
+    for image_path in images:
+        frame = cv2.imread(str(image_path))
+        if frame is None:
+            continue
+        tensor = processor.preprocess_frame(frame).astype(np.float32)
+        reference = _detections(processor, fp32.run(None, {input_name: tensor})[0], frame.shape, class_names)
+        candidate = _detections(processor, int8.run(None, {input_name: tensor})[0], frame.shape, class_names)
+
+        if len(reference) or len(candidate):
+            hits = match(candidate, reference)
+            agreements.append(hits.sum() / max(len(reference), len(candidate)))
+            for i in np.nonzero(hits)[0]:
+                ious = _iou(candidate[i, 1:5], reference[:, 1:5])
+                ious[reference[:, 0] != candidate[i, 0]] = 0.0
+                confidence_deltas.append(abs(candidate[i, 5] - reference[int(np.argmax(ious)), 5]))
+
+        labels = load_labels(image_path)
+        if labels is not None:
+            fp32_eval.append((reference, labels))
+            int8_eval.append((candidate, labels))
+
+    if tensor is None:
+        raise ValueError("No readable validation frames")
+
+    fp32_latency = latency(fp32, tensor, iterations)
+    int8_latency = latency(int8, tensor, iterations)
+    report = {
+        "frames": len(images),
+        "detection_agreement": float(np.mean(agreements)) if agreements else 1.0,
+        "mean_confidence_delta": float(np.mean(confidence_deltas)) if confidence_deltas else 0.0,
+        "fp32_latency": fp32_latency,
+        "int8_latency": int8_latency,
+        "speedup": fp32_latency["mean_ms"] / int8_latency["mean_ms"],
+    }
+    if fp32_eval:
+        report["labelled_frames"] = len(fp32_eval)
+        report["fp32_map50"] = mean_average_precision(fp32_eval)
+        report["int8_map50"] = mean_average_precision(int8_eval)
+    return report
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Static INT8 (QDQ) quantization with fp32 validation")
+    parser.add_argument("--config", default="config.json", help="Server config (preprocessing settings)")
+    parser.add_argument("--model", help="fp32 ONNX model (default: model.path)")
+    parser.add_argument("--output", help="int8 model path (default: <model>_int8.onnx)")
+    parser.add_argument("--calibration", required=True, help="Directory with calibration frames")
+    parser.add_argument("--num-calibration", type=int, default=200, help="Frames used for calibration")
+    parser.add_argument("--validation", help="Directory with validation frames (+ optional YOLO labels)")
+    parser.add_argument("--num-validation", type=int, default=200)
+    parser.add_argument("--method", default="minmax", choices=list(CALIBRATION_METHODS))
+    parser.add_argument("--per-tensor", action="store_true", help="Per-tensor instead of per-channel weights")
+    parser.add_argument("--op-types", default="Conv,MatMul",
+                        help="Op types to quantize, comma separated ('all' = every supported op)")
+    parser.add_argument("--threads", type=int, default=0, help="intra_op threads for latency (0 = ORT default)")
+    parser.add_argument("--iterations", type=int, default=50, help="Latency iterations per model")
+    parser.add_argument("--min-agreement", type=float, default=0.9,
+                        help="Fail if int8/fp32 detection agreement is below this")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+
+    config_manager = ConfigurationManager(config_path=args.config, enable_hot_reload=False)
+    config_manager.set("model.rotate_bbox_clockwise", False)  # compare in image orientation
+    model_path = Path(args.model or config_manager.get("model.path", "Model_train/best.onnx"))
+    output_path = Path(args.output) if args.output else model_path.with_name(f"{model_path.stem}_int8.onnx")
+    class_names = config_manager.get("model.class_names", [])
+    processor = FrameProcessor(model_path, config_manager, pool_size=1)
+
+    images = list_images(Path(args.calibration))
+    if not images:
+        print(f"No images found in {args.calibration}")
+        return 2
+    calibration_images = images[:args.num_calibration]
+    if args.validation:
+        validation_images = list_images(Path(args.validation))[:args.num_validation]
+    else:
+        validation_images = images[args.num_calibration:args.num_calibration + args.num_validation]
+        if not validation_images:
+            print("Warning: no held-out frames left, validating on the calibration frames")
+            validation_images = calibration_images[:args.num_validation]
+
+    op_types = None if args.op_types == "all" else [op.strip() for op in args.op_types.split(",") if op.strip()]
+    start = time.time()
+    used = quantize(model_path, output_path, processor, calibration_images,
+                    method=args.method, per_channel=not args.per_tensor, op_types=op_types)
+    print(f"Quantized {model_path} -> {output_path} ({used} calibration frames, {time.time() - start:.1f}s)")
+
+    report = validate(model_path, output_path, processor, validation_images, class_names,
+                      args.threads, args.iterations)
+    report.update({
+        "model": str(model_path),
+        "output": str(output_path),
+        "calibration_frames": used,
+        "method": args.method,
+        "per_channel": not args.per_tensor,
+        "op_types": op_types or "all",
+        "fp32_size_bytes": model_path.stat().st_size,
+        "int8_size_bytes": output_path.stat().st_size,
+    })
+    report_path = output_path.with_suffix(".quant.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"  Detection agreement: {report['detection_agreement']:.3f} "
+          f"(mean confidence delta {report['mean_confidence_delta']:.4f})")
+    if "fp32_map50" in report:
+        print(f"  mAP@0.5: fp32 {report['fp32_map50']:.4f}, int8 {report['int8_map50']:.4f} "
+              f"({report['labelled_frames']} labelled frames)")
+    print(f"  Latency: fp32 {report['fp32_latency']['mean_ms']:.2f}ms, int8 {report['int8_latency']['mean_ms']:.2f}ms "
+          f"-> {report['speedup']:.2f}x")
+    print(f"  Size: {report['fp32_size_bytes'] / 1e6:.1f}MB -> {report['int8_size_bytes'] / 1e6:.1f}MB")
+    print(f"Report written to {report_path}")
+
+    if report["detection_agreement"] < args.min_agreement:
+        print(f"FAIL: agreement {report['detection_agreement']:.3f} < {args.min_agreement}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from ai_system.cpu_executor import CpuExecutor
+
+
+def test_shutdown_runs_queued_tasks():
+    executor = CpuExecutor([0, 1], pin=False, name="test-drain")
+    gate = threading.Event()
+    started = threading.Semaphore(0)
+
+    def block():
+        started.release()
+        gate.wait(5.0)
+
+    blockers = [executor.submit(block) for _ in range(2)]
+    for _ in range(2):
+        assert started.acquire(timeout=2.0)
+    queued = [executor.submit(lambda i=i: i * i) for i in range(20)]
+    assert executor.get_stats()['queued'] == 20
+
+    shutdown = threading.Thread(target=executor.shutdown, kwargs={'wait': True, 'timeout': 5.0})
+    shutdown.start()
+    gate.set()
+    shutdown.join(5.0)
+
+    assert not shutdown.is_alive()
+    assert [f.result(timeout=0) for f in queued] == [i * i for i in range(20)]
+    for future in blockers:
+        future.result(timeout=0)
+    assert all(not worker['queued'] for worker in executor.get_stats()['workers'])
+
+
+def test_submit_after_shutdown_raises():
+    executor = CpuExecutor([0], pin=False, name="test-closed")
+    executor.shutdown()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+
+
+def test_idle_worker_steals_queued_tasks():
+    executor = CpuExecutor([0, 1], pin=False, name="test-steal")
+    try:
+        gate = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            gate.wait(5.0)
+
+        def submit_local():
+            # Submitted from a worker: the tasks land on the blocked worker's own deque
+            futures = [executor.submit(lambda i=i: i) for i in range(4)]
+            block()
+            return futures
+
+        futures = executor.submit(submit_local)
+        assert started.wait(2.0)
+        assert executor.submit(lambda: 'other').result(timeout=2.0) == 'other'
+        gate.set()
+        assert [f.result(timeout=2.0) for f in futures.result(timeout=2.0)] == [0, 1, 2, 3]
+        assert executor.get_stats()['stolen'] >= 1
+    finally:
+        executor.shutdown()
+
+
+class SlowDeque(deque):
+    """Widens the window between submit()'s shutdown check and the queued task."""
+
+    def append(self, item):
+        time.sleep(0.1)
+        super().append(item)
+
+
+def test_submit_racing_shutdown_never_strands_a_task():
+    executor = CpuExecutor([0], pin=False, name="test-race")
+    executor._workers[0].tasks = SlowDeque()
+    outcome = []
+
+    def submitter():
+        try:
+            outcome.append(executor.submit(lambda: 'done'))
+        except RuntimeError as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=submitter)
+    thread.start()
+    time.sleep(0.02)  # submitter is inside submit()
+    executor.shutdown(wait=True, timeout=2.0)
+    thread.join(2.0)
+
+    # The submit that passed the shutdown check is queued before the stop permits and runs
+    assert outcome[0].result(timeout=2.0) == 'done'
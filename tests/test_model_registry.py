@@ -0,0 +1,116 @@
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from ai_system import model_registry
+from ai_system.config_manager import ConfigurationManager
+from ai_system.metrics import get_registry
+from ai_system.model_registry import ModelRegistry, ModelVariant, DEFAULT_VARIANT
+
+
+class FakeProcessor:
+    def __init__(self, max_size=4, idle=0):
+        self.in_use = 0
+        self.idle = idle
+        self.max_size = max_size
+
+    def get_target_size(self):
+        return (320, 320)
+
+    def get_pool_stats(self):
+        return {'pool_size': self.idle, 'in_use': self.in_use, 'max_size': self.max_size}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with mock.patch.object(model_registry.time, 'monotonic', clock):
+        yield clock
+
+
+class SmallFallbackRegistry(ModelRegistry):
+    """Registers a 'small' variant right after the default, before the fallback check."""
+
+    def register_variant(self, variant):
+        super().register_variant(variant)
+        if variant.name == DEFAULT_VARIANT:
+            super().register_variant(ModelVariant(
+                name='small', processor=FakeProcessor(), path=Path('small.onnx'), target_size=(256, 256)
+            ))
+
+
+def make_registry(half_life=5.0):
+    config = ConfigurationManager(default_config={
+        'model': {
+            'path': 'default.onnx',
+            'registry': {
+                'fallback_variant': 'small',
+                'latency_slo_ms': 100,
+                'ewma_alpha': 0.5,
+                'latency_half_life_s': half_life,
+            }
+        }
+    }, enable_hot_reload=False)
+    return SmallFallbackRegistry(config, FakeProcessor())
+
+
+def test_default_over_slo_falls_back(clock):
+    registry = make_registry()
+    registry.record_latency(DEFAULT_VARIANT, 0.5)
+    assert registry.select().name == 'small'
+
+
+def test_fallback_recovers_after_latency_decays(clock):
+    registry = make_registry(half_life=5.0)
+    registry.record_latency(DEFAULT_VARIANT, 0.4)
+    assert registry.select().name == 'small'
+
+    # Only the fallback is sampled while it serves traffic
+    for _ in range(5):
+        clock.now += 2.0
+        registry.record_latency('small', 0.05)
+
+    # 0.4s halves every 5s: below the 100ms SLO after 10s without samples
+    clock.now += 0.5
+    assert registry.latency(DEFAULT_VARIANT) < 0.1
+    assert registry.select().name == DEFAULT_VARIANT
+
+    # Fresh samples from the default decide again
+    registry.record_latency(DEFAULT_VARIANT, 0.02)
+    assert registry.select().name == DEFAULT_VARIANT
+
+
+def test_no_decay_keeps_fallback(clock):
+    registry = make_registry(half_life=0)
+    registry.record_latency(DEFAULT_VARIANT, 0.4)
+    clock.now += 3600.0
+    assert registry.select().name == 'small'
+
+
+def test_busy_default_pool_falls_back(clock):
+    registry = make_registry()
+    default = registry.get_default()
+    default.processor.in_use = default.processor.max_size
+    assert registry.select().name == 'small'
+
+
+def test_pool_gauges_are_labeled_per_variant(clock):
+    registry = make_registry()
+    registry.get_default().processor.in_use = 3
+    small = registry.get_variant('small').processor
+    small.idle, small.in_use = 1, 1
+
+    exposition = get_registry().render()
+    assert 'ai_model_pool_in_use{variant="default"} 3' in exposition
+    assert 'ai_model_pool_in_use{variant="small"} 1' in exposition
+    # Created instances: idle + in use
+    assert 'ai_model_pool_size{variant="small"} 2' in exposition
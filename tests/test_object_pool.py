@@ -0,0 +1,128 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from ai_system.object_pool import ObjectPool
+from ai_system.thread_pool import TaskPriority
+
+
+def make_pool(max_size=2, reserved=None, block=True, timeout=0.2, policy='strict', weights=None):
+    counter = itertools.count()
+    pool = ObjectPool(create_object=lambda: next(counter), max_size=max_size, block=block, timeout=timeout)
+    pool.set_priority_policy(policy, weights, reserved)
+    return pool
+
+
+def wait_for_waiters(pool, priority, count=1, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while pool.get_priority_stats()['waiting'].get(priority.name, 0) < count:
+        assert time.monotonic() < deadline, "waiter did not queue"
+        time.sleep(0.005)
+
+
+def test_reserved_slot_is_out_of_reach_of_lower_priorities():
+    pool = make_pool(max_size=2, reserved={TaskPriority.HIGH: 1})
+    assert pool.get_priority_stats()['slot_limits']['MEDIUM'] == 1
+
+    pool.acquire(TaskPriority.LOW)
+    with pytest.raises(TimeoutError):
+        pool.acquire(TaskPriority.MEDIUM)
+
+    # The reserved slot is still free for HIGH
+    pool.acquire(TaskPriority.HIGH)
+    assert pool.in_use_count() == 2
+
+
+def test_lower_priority_waiter_does_not_take_released_reserved_slot():
+    pool = make_pool(max_size=2, reserved={TaskPriority.HIGH: 1}, timeout=0.3)
+    pool.acquire(TaskPriority.LOW)
+    high = pool.acquire(TaskPriority.HIGH)
+
+    outcome = []
+
+    def low_waiter():
+        try:
+            outcome.append(pool.acquire(TaskPriority.LOW))
+        except TimeoutError as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=low_waiter)
+    thread.start()
+    wait_for_waiters(pool, TaskPriority.LOW)
+    pool.release(high)
+    thread.join(2.0)
+
+    assert isinstance(outcome[0], TimeoutError)
+    assert pool.in_use_count() == 1
+
+
+def test_strict_policy_serves_higher_priority_waiter_first():
+    pool = make_pool(max_size=1, timeout=2.0)
+    held = pool.acquire(TaskPriority.MEDIUM)
+    served = []
+
+    def waiter(priority):
+        obj = pool.acquire(priority)
+        served.append(priority)
+        pool.release(obj)
+
+    low = threading.Thread(target=waiter, args=(TaskPriority.LOW,))
+    low.start()
+    wait_for_waiters(pool, TaskPriority.LOW)
+    high = threading.Thread(target=waiter, args=(TaskPriority.HIGH,))
+    high.start()
+    wait_for_waiters(pool, TaskPriority.HIGH)
+
+    pool.release(held)
+    low.join(2.0)
+    high.join(2.0)
+    assert served == [TaskPriority.HIGH, TaskPriority.LOW]
+
+
+def test_weighted_policy_shares_freed_objects_by_weight():
+    pool = make_pool(max_size=1, timeout=2.0, policy='weighted',
+                     weights={TaskPriority.HIGH: 3, TaskPriority.LOW: 1})
+    held = pool.acquire(TaskPriority.HIGH)
+    served = []
+
+    def waiter(priority):
+        obj = pool.acquire(priority)
+        served.append(priority)
+        pool.release(obj)
+
+    threads = []
+    for priority in (TaskPriority.LOW, TaskPriority.HIGH):
+        for count in range(1, 5):
+            thread = threading.Thread(target=waiter, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            wait_for_waiters(pool, priority, count)
+
+    pool.release(held)
+    for thread in threads:
+        thread.join(2.0)
+
+    # HIGH gets 3 of every 4 freed objects, LOW is not starved behind it (strict: 4 HIGH first)
+    assert served[:4].count(TaskPriority.HIGH) == 3
+    assert served[:4].count(TaskPriority.LOW) == 1
+    assert pool.get_priority_stats()['granted'] == {'HIGH': 5, 'LOW': 4}
+
+
+def test_without_policy_reserved_slots_do_not_apply():
+    pool = make_pool(max_size=2, reserved={TaskPriority.HIGH: 1}, policy=None)
+    pool.acquire(TaskPriority.MEDIUM)
+    pool.acquire(TaskPriority.MEDIUM)
+    assert pool.in_use_count() == 2
+
+
+def test_non_blocking_pool_bursts_past_slot_limit():
+    pool = make_pool(max_size=2, reserved={TaskPriority.HIGH: 1}, block=False)
+    pool.acquire(TaskPriority.LOW)
+
+    # Burst objects are not tracked, the reserved slot stays free
+    pool.acquire(TaskPriority.LOW)
+    assert pool.in_use_count() == 1
+    pool.acquire(TaskPriority.HIGH)
+    assert pool.in_use_count() == 2
@@ -0,0 +1,201 @@
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from ai_system import roi_tracker
+from ai_system.config_manager import ConfigurationManager
+from ai_system.frame_processor import FrameProcessor
+from ai_system.roi_tracker import RoiTracker, RoiWindow
+
+FRAME_W, FRAME_H = 1280, 720
+# Even-aligned bounds round outward, up to 2px per side
+EVEN_SLACK = 4
+
+
+def boxes(*rows):
+    return np.array(rows, dtype=np.float32).reshape(-1, 4)
+
+
+def track(tracker, box, session='cam'):
+    """Full frame with one detection, then the window it proposes."""
+    window = tracker.window(session, FRAME_W, FRAME_H)
+    tracker.update(window, boxes(box))
+    return tracker.window(session, FRAME_W, FRAME_H)
+
+
+def contains(window, box):
+    x0, y0, x1, y1 = box
+    return (window.x0 <= x0 * FRAME_W and window.y0 <= y0 * FRAME_H
+            and window.x1 >= x1 * FRAME_W and window.y1 >= y1 * FRAME_H)
+
+
+def test_first_frame_of_session_is_full():
+    tracker = RoiTracker()
+    window = tracker.window('cam', FRAME_W, FRAME_H)
+    assert not window.cropped
+    assert (window.x0, window.y0, window.x1, window.y1) == (0, 0, FRAME_W, FRAME_H)
+
+
+def test_small_region_grows_to_min_size_with_frame_aspect():
+    tracker = RoiTracker(margin=0.15, min_size=0.3, keep_aspect=True)
+    window = track(tracker, (0.4, 0.4, 0.5, 0.5))
+
+    assert window.cropped
+    # Centred on the box, 0.3 of the frame per side (same aspect ratio as the frame)
+    assert (window.x0, window.y0) == (384, 216)
+    assert window.width == pytest.approx(0.3 * FRAME_W, abs=EVEN_SLACK)
+    assert window.height == pytest.approx(0.3 * FRAME_H, abs=EVEN_SLACK)
+
+
+def test_margin_grows_region_and_keep_aspect_squares_it():
+    box = (0.3, 0.3, 0.6, 0.5)
+
+    square = track(RoiTracker(margin=0.15, keep_aspect=True), box)
+    # 0.3 x 0.2 of the frame plus 15% per side: 0.39 x 0.26, squared (normalized) to 0.39
+    assert square.width == pytest.approx(0.39 * FRAME_W, abs=EVEN_SLACK)
+    assert square.height == pytest.approx(0.39 * FRAME_H, abs=EVEN_SLACK)
+
+    free = track(RoiTracker(margin=0.15, keep_aspect=False), box)
+    assert free.width == pytest.approx(0.39 * FRAME_W, abs=EVEN_SLACK)
+    assert free.height == pytest.approx(0.3 * FRAME_H, abs=EVEN_SLACK)  # 0.26 raised to min_size
+    assert contains(square, box) and contains(free, box)
+
+
+def test_region_near_frame_edge_shifts_inside_instead_of_shrinking():
+    window = track(RoiTracker(), (0.0, 0.0, 0.1, 0.1))
+    assert (window.x0, window.y0) == (0, 0)
+    assert window.width == pytest.approx(0.3 * FRAME_W, abs=EVEN_SLACK)
+
+    window = track(RoiTracker(), (0.9, 0.9, 1.0, 1.0))
+    assert (window.x1, window.y1) == (FRAME_W, FRAME_H)
+    assert window.width == pytest.approx(0.3 * FRAME_W, abs=EVEN_SLACK)
+
+
+@pytest.mark.parametrize('box', [
+    (0.4, 0.4, 0.5, 0.5),
+    (0.123, 0.271, 0.331, 0.419),
+    (0.55, 0.05, 0.71, 0.33),
+    (0.77, 0.61, 0.97, 0.93),
+])
+def test_window_bounds_are_even_and_contain_the_region(box):
+    window = track(RoiTracker(), box)
+    assert window.cropped
+    assert all(v % 2 == 0 for v in (window.x0, window.y0, window.x1, window.y1))
+    assert 0 <= window.x0 < window.x1 <= FRAME_W and 0 <= window.y0 < window.y1 <= FRAME_H
+    assert contains(window, box)
+
+
+def test_region_over_max_area_uses_full_frame():
+    tracker = RoiTracker(max_area=0.8)
+    assert not track(tracker, (0.1, 0.1, 0.9, 0.9)).cropped
+    assert tracker.get_stats()['crop_frames'] == 0
+
+
+def test_cropped_frame_without_detections_forces_full_frame():
+    tracker = RoiTracker()
+    window = track(tracker, (0.4, 0.4, 0.5, 0.5))
+    tracker.update(window, boxes())
+
+    assert not tracker.window('cam', FRAME_W, FRAME_H).cropped
+    # The history still has the earlier box, the frame after the full one is cropped again
+    assert tracker.window('cam', FRAME_W, FRAME_H).cropped
+
+
+def test_box_on_cropped_edge_forces_full_frame():
+    tracker = RoiTracker()
+    window = track(tracker, (0.4, 0.4, 0.5, 0.5))
+    left_edge = window.x0 / FRAME_W
+    tracker.update(window, boxes((left_edge, 0.4, 0.5, 0.5)))
+    assert not tracker.window('cam', FRAME_W, FRAME_H).cropped
+
+
+def test_box_on_frame_edge_of_crop_keeps_cropping():
+    tracker = RoiTracker()
+    window = track(tracker, (0.0, 0.0, 0.1, 0.1))
+    assert (window.x0, window.y0) == (0, 0)
+    # The crop's left/top edge is the frame edge: nothing can be cut off there
+    tracker.update(window, boxes((0.0, 0.0, 0.1, 0.1)))
+    assert tracker.window('cam', FRAME_W, FRAME_H).cropped
+
+
+def test_full_frame_every_n_cropped_frames():
+    tracker = RoiTracker(full_frame_every=3)
+    window = tracker.window('cam', FRAME_W, FRAME_H)
+    modes = []
+    for _ in range(8):
+        tracker.update(window, boxes((0.4, 0.4, 0.5, 0.5)))
+        window = tracker.window('cam', FRAME_W, FRAME_H)
+        modes.append(window.cropped)
+    assert modes == [True, True, True, False, True, True, True, False]
+
+
+def test_region_is_union_of_recent_frames():
+    tracker = RoiTracker(history_frames=2, full_frame_every=0)
+    window = track(tracker, (0.2, 0.2, 0.3, 0.3))
+    tracker.update(window, boxes((0.4, 0.4, 0.5, 0.5)))
+    window = tracker.window('cam', FRAME_W, FRAME_H)
+    assert contains(window, (0.2, 0.2, 0.5, 0.5))
+
+    # After history_frames more frames the first box no longer counts
+    tracker.update(window, boxes((0.4, 0.4, 0.5, 0.5)))
+    window = tracker.window('cam', FRAME_W, FRAME_H)
+    assert not contains(window, (0.2, 0.2, 0.3, 0.3))
+
+
+def test_least_recently_used_session_is_dropped():
+    tracker = RoiTracker(max_sessions=2)
+    track(tracker, (0.4, 0.4, 0.5, 0.5), session='a')
+    track(tracker, (0.4, 0.4, 0.5, 0.5), session='b')
+    track(tracker, (0.4, 0.4, 0.5, 0.5), session='c')
+
+    assert tracker.get_stats()['sessions'] == 2
+    # 'a' starts over with a full frame
+    assert not tracker.window('a', FRAME_W, FRAME_H).cropped
+
+
+def test_idle_session_expires_after_ttl():
+    now = [1000.0]
+    with mock.patch.object(roi_tracker.time, 'monotonic', lambda: now[0]):
+        tracker = RoiTracker(session_ttl=10.0)
+        track(tracker, (0.4, 0.4, 0.5, 0.5), session='a')
+        now[0] += 5.0
+        track(tracker, (0.4, 0.4, 0.5, 0.5), session='b')
+        now[0] += 6.0
+        tracker.window('b', FRAME_W, FRAME_H)
+
+        assert tracker.get_stats()['sessions'] == 1
+        assert not tracker.window('a', FRAME_W, FRAME_H).cropped
+
+
+@pytest.fixture
+def processor():
+    config = ConfigurationManager(default_config={
+        'model': {
+            'target_size': '320,320',
+            'resize_mode': 'stretch',
+            'conf_threshold': 0.25,
+            'class_names': ['item'],
+            'roi': {'enabled': True},
+        }
+    }, enable_hot_reload=False)
+    return FrameProcessor(Path('unused.onnx'), config, pool_size=1, model_factory=lambda: None)
+
+
+def test_boxes_are_mapped_from_crop_to_full_frame(processor):
+    tracker = processor._roi_tracker
+    tracker.window('cam', FRAME_W, FRAME_H)
+    roi = RoiWindow('cam', 384, 216, 768, 432, FRAME_W, FRAME_H)
+    # Model coordinates of the 384x216 crop resized to 320x320
+    output = [np.array([[[32.0, 64.0, 160.0, 128.0, 0.9, 0.0]]], dtype=np.float32)]
+
+    result = processor.postprocess_output(output, original_shape=(roi.height, roi.width, 3), roi=roi)
+
+    # Crop pixels (38.4, 43.2)-(192, 86.4), shifted by the crop origin, over the full frame
+    expected = [(384 + 38.4) / FRAME_W, (216 + 43.2) / FRAME_H, (384 + 192) / FRAME_W, (216 + 86.4) / FRAME_H]
+    np.testing.assert_allclose(result['detections'].boxes[0], expected, atol=1e-5)
+
+    # The session's next region is built from the full-frame box
+    window = tracker.window('cam', FRAME_W, FRAME_H)
+    assert window.cropped and contains(window, expected)
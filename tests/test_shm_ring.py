@@ -0,0 +1,37 @@
+import uuid
+
+import pytest
+
+from ai_system.shm_ring import SharedFrameRing
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing.create(f"test_ring_{uuid.uuid4().hex[:8]}", slots=2, slot_bytes=4096)
+    yield ring
+    ring.close()
+
+
+def test_read_returns_written_frame(ring):
+    length = ring.write(0, b'frame-one', seq=1)
+    view = ring.read(0, length, seq=1)
+    assert bytes(view) == b'frame-one'
+    ring.verify(0, length, seq=1)
+    del view
+
+
+def test_read_rejects_wrong_sequence(ring):
+    length = ring.write(0, b'frame-one', seq=1)
+    with pytest.raises(ValueError):
+        ring.read(0, length, seq=2)
+
+
+def test_verify_detects_slot_reused_during_decode(ring):
+    length = ring.write(0, b'frame-one', seq=1)
+    view = ring.read(0, length, seq=1)
+    # Producer gave up on the request and reused the slot
+    ring.write(0, b'frame-two', seq=2)
+    with pytest.raises(ValueError, match="overwritten"):
+        ring.verify(0, length, seq=1)
+    assert ring.get_stats()['overwritten'] == 1
+    del view
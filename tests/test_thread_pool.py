@@ -0,0 +1,148 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from ai_system.thread_pool import ThreadPool, TaskPriority
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class Gate:
+    """Occupies a worker until opened, so later tasks stay queued."""
+
+    def __init__(self, pool, priority=TaskPriority.CRITICAL):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.future = pool.submit(self._run, priority=priority)
+        assert self.started.wait(2.0)
+
+    def _run(self):
+        self.started.set()
+        self.release.wait(5.0)
+
+    def open(self):
+        self.release.set()
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        pool = ThreadPool(**kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown(wait=True, timeout=2.0)
+
+
+def test_priority_order_fifo_within_priority(make_pool):
+    pool = make_pool(max_workers=1, task_queue_size=0)
+    gate = Gate(pool)
+    order = []
+    submitted = [
+        ('low', TaskPriority.LOW),
+        ('high-1', TaskPriority.HIGH),
+        ('medium', TaskPriority.MEDIUM),
+        ('high-2', TaskPriority.HIGH),
+    ]
+    futures = [pool.submit(order.append, name, priority=priority) for name, priority in submitted]
+
+    gate.open()
+    for future in futures:
+        future.result(timeout=2.0)
+    assert order == ['high-1', 'high-2', 'medium', 'low']
+
+
+def test_drop_oldest_drops_oldest_of_lowest_priority(make_pool):
+    pool = make_pool(max_workers=1, task_queue_size=3, overflow_policy='drop_oldest')
+    gate = Gate(pool)
+    low_1 = pool.submit(lambda: 'low-1', priority=TaskPriority.LOW)
+    low_2 = pool.submit(lambda: 'low-2', priority=TaskPriority.LOW)
+    medium = pool.submit(lambda: 'medium', priority=TaskPriority.MEDIUM)
+
+    high = pool.submit(lambda: 'high', priority=TaskPriority.HIGH)
+    with pytest.raises(queue.Full):
+        low_1.result(timeout=0)
+
+    gate.open()
+    assert [f.result(timeout=2.0) for f in (low_2, medium, high)] == ['low-2', 'medium', 'high']
+    assert pool.get_stats()['dropped_tasks'] == 1
+
+
+def test_drop_oldest_rejects_task_below_every_queued_priority(make_pool):
+    pool = make_pool(max_workers=1, task_queue_size=2, overflow_policy='drop_oldest')
+    gate = Gate(pool)
+    queued = [pool.submit(lambda: None, priority=TaskPriority.MEDIUM) for _ in range(2)]
+
+    with pytest.raises(queue.Full):
+        pool.submit(lambda: None, priority=TaskPriority.LOW)
+
+    gate.open()
+    for future in queued:
+        future.result(timeout=2.0)
+    stats = pool.get_stats()
+    assert stats['rejected_tasks'] == 1
+    assert stats['dropped_tasks'] == 0
+
+
+def test_task_past_deadline_expires_without_running(make_pool):
+    pool = make_pool(max_workers=1, task_queue_size=0)
+    gate = Gate(pool)
+    ran = threading.Event()
+    future = pool.submit(ran.set, deadline=time.monotonic() + 0.05)
+
+    time.sleep(0.1)
+    gate.open()
+    with pytest.raises(TimeoutError):
+        future.result(timeout=2.0)
+    assert not ran.is_set()
+    assert pool.get_stats()['expired_tasks'] == 1
+
+
+def test_shrink_retires_surplus_workers(make_pool):
+    pool = make_pool(max_workers=4, task_queue_size=0, name="resize-test")
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def busy():
+        started.release()
+        release.wait(5.0)
+
+    futures = [pool.submit(busy) for _ in range(4)]
+    for _ in range(4):
+        assert started.acquire(timeout=2.0)
+    assert pool.get_stats()['workers'] == 4
+
+    pool.resize(1)
+    release.set()
+    for future in futures:
+        future.result(timeout=2.0)
+    assert wait_until(lambda: pool.get_stats()['workers'] == 1)
+    assert wait_until(
+        lambda: sum(t.name.startswith("resize-test-worker") for t in threading.enumerate()) == 1
+    )
+
+    # The remaining worker still runs tasks, growing starts workers again
+    assert pool.submit(lambda: 'ok').result(timeout=2.0) == 'ok'
+    pool.resize(3)
+    started = threading.Semaphore(0)
+    release.clear()
+    futures = [pool.submit(busy) for _ in range(3)]
+    for _ in range(3):
+        assert started.acquire(timeout=2.0)
+    assert pool.get_stats()['workers'] == 3
+    release.set()
+    for future in futures:
+        future.result(timeout=2.0)